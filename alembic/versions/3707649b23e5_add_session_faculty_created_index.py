@@ -0,0 +1,24 @@
+"""add session faculty/created_at index for paginated summaries
+
+Revision ID: 3707649b23e5
+Revises: 82de7078efda
+Create Date: 2026-10-19 11:20:07.533861
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3707649b23e5'
+down_revision = '82de7078efda'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_session_faculty_created', 'session', ['faculty_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_session_faculty_created', table_name='session')
@@ -0,0 +1,68 @@
+"""add attendance rollup tables
+
+Revision ID: 5c0e9a7d31b4
+Revises: dcf917849fdb
+Create Date: 2026-10-19 13:10:27.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e9a7d31b4'
+down_revision = 'dcf917849fdb'
+branch_labels = None
+depends_on = None
+
+
+def _counter_columns():
+    return [
+        sa.Column('marks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('complete', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('qr', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('face', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('proximity', sa.Integer(), nullable=False, server_default='0'),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'course_daily_attendance',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        *_counter_columns(),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('course_code', 'day', name='uq_course_daily_attendance')
+    )
+    op.create_table(
+        'student_monthly_attendance',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('student_id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        *_counter_columns(),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('student_id', 'course_code', 'month', name='uq_student_monthly_attendance')
+    )
+    op.create_table(
+        'rollup_state',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('high_water_mark', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_state')
+    op.drop_table('student_monthly_attendance')
+    op.drop_table('course_daily_attendance')
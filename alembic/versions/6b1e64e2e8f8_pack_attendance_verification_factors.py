@@ -0,0 +1,95 @@
+"""pack attendance verification factors into a bitmask
+
+Revision ID: 6b1e64e2e8f8
+Revises: 024982d06238
+Create Date: 2026-10-19 09:12:31.418204
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1e64e2e8f8'
+down_revision = '024982d06238'
+branch_labels = None
+depends_on = None
+
+# Mirrors app.models.attendance.VerificationFactor at the time of this migration
+FACTOR_BITS = {'qr': 1, 'face': 2, 'proximity': 4}
+
+
+def _load(value):
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value) if value else {}
+    return value
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.add_column(sa.Column('verification_mask', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('verification_metadata', sa.JSON(), nullable=True))
+
+    # Backfill the mask and metadata from the old JSON column
+    bind = op.get_bind()
+    attendance = sa.table(
+        'attendance',
+        sa.column('id', sa.String),
+        sa.column('verification_factors', sa.JSON),
+        sa.column('verification_mask', sa.Integer),
+        sa.column('verification_metadata', sa.JSON),
+    )
+    rows = bind.execute(sa.select(attendance.c.id, attendance.c.verification_factors)).fetchall()
+    for row_id, factors in rows:
+        mask = 0
+        extra = {}
+        for key, value in _load(factors).items():
+            bit = FACTOR_BITS.get(str(key).lower())
+            if bit is not None:
+                if value:
+                    mask |= bit
+            else:
+                extra[key] = value
+        bind.execute(
+            attendance.update()
+            .where(attendance.c.id == row_id)
+            .values(verification_mask=mask, verification_metadata=extra if extra else sa.null())
+        )
+
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.drop_column('verification_factors')
+        batch_op.create_index('ix_attendance_session_verification', ['session_id', 'verification_mask'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.drop_index('ix_attendance_session_verification')
+        batch_op.add_column(sa.Column('verification_factors', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    attendance = sa.table(
+        'attendance',
+        sa.column('id', sa.String),
+        sa.column('verification_factors', sa.JSON),
+        sa.column('verification_mask', sa.Integer),
+        sa.column('verification_metadata', sa.JSON),
+    )
+    rows = bind.execute(
+        sa.select(attendance.c.id, attendance.c.verification_mask, attendance.c.verification_metadata)
+    ).fetchall()
+    for row_id, mask, extra in rows:
+        factors = {name: bool((mask or 0) & bit) for name, bit in FACTOR_BITS.items()}
+        factors.update(_load(extra))
+        bind.execute(
+            attendance.update()
+            .where(attendance.c.id == row_id)
+            .values(verification_factors=factors)
+        )
+
+    with op.batch_alter_table('attendance') as batch_op:
+        batch_op.drop_column('verification_metadata')
+        batch_op.drop_column('verification_mask')
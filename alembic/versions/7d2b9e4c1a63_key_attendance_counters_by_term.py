@@ -0,0 +1,142 @@
+"""key attendance percentage counters by term
+
+Revision ID: 7d2b9e4c1a63
+Revises: c6f1d8a2b937
+Create Date: 2026-10-19 23:18:09.542117
+
+"""
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.timetable import term_for
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2b9e4c1a63'
+down_revision = 'c6f1d8a2b937'
+branch_labels = None
+depends_on = None
+
+session_table = sa.table(
+    'session',
+    sa.column('id'), sa.column('course_code'), sa.column('status'),
+    sa.column('start_time', sa.DateTime), sa.column('created_at', sa.DateTime)
+)
+attendance_table = sa.table('attendance', sa.column('id'), sa.column('session_id'), sa.column('student_id'))
+
+
+def _counts(bind, keys, statuses, join_marks):
+    """Session or mark counts per key and term, grouped by month in SQL"""
+    started = sa.func.coalesce(session_table.c.start_time, session_table.c.created_at)
+    year, month = sa.extract('year', started), sa.extract('month', started)
+    source = session_table
+    if join_marks:
+        source = attendance_table.join(session_table, session_table.c.id == attendance_table.c.session_id)
+    rows = bind.execute(
+        sa.select(*keys, year, month, sa.func.count())
+        .select_from(source)
+        .where(session_table.c.status.in_(statuses))
+        .group_by(*keys, year, month)
+    ).fetchall()
+    counts = Counter()
+    for *key, row_year, row_month, count in rows:
+        when = datetime(int(row_year), int(row_month), 1) if row_year is not None else None
+        counts[(*key, term_for(when))] += count
+    return counts
+
+
+def upgrade() -> None:
+    # The counters are derived data, so rebuild them with the new key
+    op.drop_table('student_course_counter')
+    op.drop_table('course_session_counter')
+    course_counter = op.create_table(
+        'course_session_counter',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('term', sa.String(), nullable=False),
+        sa.Column('held', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('course_code', 'term', name='uq_course_session_counter')
+    )
+    student_counter = op.create_table(
+        'student_course_counter',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('student_id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('term', sa.String(), nullable=False),
+        sa.Column('attended', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('student_id', 'term', 'course_code', name='uq_student_course_counter')
+    )
+
+    bind = op.get_bind()
+    held = _counts(bind, [session_table.c.course_code], ['COMPLETED'], join_marks=False)
+    attended = _counts(
+        bind, [attendance_table.c.student_id, session_table.c.course_code], ['ACTIVE', 'COMPLETED'], join_marks=True
+    )
+    if held:
+        op.bulk_insert(course_counter, [
+            {'id': str(uuid.uuid4()), 'course_code': course_code, 'term': term, 'held': count}
+            for (course_code, term), count in held.items()
+        ])
+    if attended:
+        op.bulk_insert(student_counter, [
+            {'id': str(uuid.uuid4()), 'student_id': student_id, 'course_code': course_code, 'term': term,
+             'attended': count}
+            for (student_id, course_code, term), count in attended.items()
+        ])
+
+
+def downgrade() -> None:
+    # Fold the terms back into one counter per course
+    bind = op.get_bind()
+    held = _counts(bind, [session_table.c.course_code], ['COMPLETED'], join_marks=False)
+    attended = _counts(
+        bind, [attendance_table.c.student_id, session_table.c.course_code], ['ACTIVE', 'COMPLETED'], join_marks=True
+    )
+    held_per_course = Counter()
+    for (course_code, _), count in held.items():
+        held_per_course[course_code] += count
+    attended_per_course = Counter()
+    for (student_id, course_code, _), count in attended.items():
+        attended_per_course[(student_id, course_code)] += count
+
+    op.drop_table('student_course_counter')
+    op.drop_table('course_session_counter')
+    course_counter = op.create_table(
+        'course_session_counter',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('held', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('course_code')
+    )
+    student_counter = op.create_table(
+        'student_course_counter',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('student_id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('attended', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('student_id', 'course_code', name='uq_student_course_counter')
+    )
+    if held_per_course:
+        op.bulk_insert(course_counter, [
+            {'id': str(uuid.uuid4()), 'course_code': course_code, 'held': count}
+            for course_code, count in held_per_course.items()
+        ])
+    if attended_per_course:
+        op.bulk_insert(student_counter, [
+            {'id': str(uuid.uuid4()), 'student_id': student_id, 'course_code': course_code, 'attended': count}
+            for (student_id, course_code), count in attended_per_course.items()
+        ])
@@ -0,0 +1,55 @@
+"""add hot path indexes and one-mark-per-session constraint
+
+Revision ID: 82de7078efda
+Revises: 6b1e64e2e8f8
+Create Date: 2026-10-19 10:04:52.771390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '82de7078efda'
+down_revision = '6b1e64e2e8f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The service already refuses duplicate marks; drop any that slipped in
+    # before the unique index existed, keeping the earliest one. Marks with
+    # no marked_at sort last, so a pair of them still keeps one
+    op.execute(
+        """
+        DELETE FROM attendance
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY session_id, student_id
+                    ORDER BY marked_at IS NULL, marked_at, id
+                ) AS position
+                FROM attendance
+            ) AS ranked
+            WHERE position > 1
+        )
+        """
+    )
+
+    op.create_index('uq_attendance_session_student', 'attendance', ['session_id', 'student_id'], unique=True)
+    op.create_index('ix_attendance_session_marked', 'attendance', ['session_id', 'marked_at'])
+    op.create_index('ix_attendance_student_marked', 'attendance', ['student_id', 'marked_at'])
+    op.create_index('ix_session_faculty_status', 'session', ['faculty_id', 'status'])
+    op.create_index('ix_session_status', 'session', ['status'])
+    op.create_index(op.f('ix_assignments_faculty_id'), 'assignments', ['faculty_id'])
+    op.create_index(op.f('ix_user_role'), 'user', ['role'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_role'), table_name='user')
+    op.drop_index(op.f('ix_assignments_faculty_id'), table_name='assignments')
+    op.drop_index('ix_session_status', table_name='session')
+    op.drop_index('ix_session_faculty_status', table_name='session')
+    op.drop_index('ix_attendance_student_marked', table_name='attendance')
+    op.drop_index('ix_attendance_session_marked', table_name='attendance')
+    op.drop_index('uq_attendance_session_student', table_name='attendance')
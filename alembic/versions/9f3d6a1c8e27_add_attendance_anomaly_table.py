@@ -0,0 +1,48 @@
+"""add attendance anomaly review table
+
+Revision ID: 9f3d6a1c8e27
+Revises: e41b7c2f9a05
+Create Date: 2026-10-19 15:21:08.553914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3d6a1c8e27'
+down_revision = 'e41b7c2f9a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'attendance_anomaly',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('attendance_id', sa.String(length=36), nullable=False),
+        sa.Column('session_id', sa.String(length=36), nullable=False),
+        sa.Column('student_id', sa.String(length=36), nullable=False),
+        sa.Column('reasons', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('status', sa.Enum('OPEN', 'CONFIRMED', 'DISMISSED', name='anomalystatus'), nullable=False),
+        sa.Column('detected_at', sa.DateTime(), nullable=True),
+        sa.Column('reviewed_by', sa.String(length=36), nullable=True),
+        sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['attendance_id'], ['attendance.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['session_id'], ['session.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('attendance_id')
+    )
+    op.create_index('ix_attendance_anomaly_status_score', 'attendance_anomaly', ['status', 'score'])
+    op.create_index('ix_attendance_anomaly_session', 'attendance_anomaly', ['session_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendance_anomaly_session', table_name='attendance_anomaly')
+    op.drop_index('ix_attendance_anomaly_status_score', table_name='attendance_anomaly')
+    op.drop_table('attendance_anomaly')
+    sa.Enum(name='anomalystatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,69 @@
+"""add user directory keyset indexes and name/email/roll number search
+
+Revision ID: a8e3c5d17f62
+Revises: f5c2a7d93b48
+Create Date: 2026-10-19 19:05:12.408716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e3c5d17f62'
+down_revision = 'f5c2a7d93b48'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('full_name', 'email', 'roll_number')
+TRIGGERS = ('user_search_ai', 'user_search_ad', 'user_search_au')
+
+
+def _upgrade_sqlite() -> None:
+    op.execute(
+        "CREATE VIRTUAL TABLE user_search USING fts5("
+        "full_name, email, roll_number, content='user', content_rowid='rowid', tokenize='trigram')"
+    )
+    op.execute("""CREATE TRIGGER user_search_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_search(rowid, full_name, email, roll_number)
+        VALUES (new.rowid, new.full_name, new.email, new.roll_number);
+    END""")
+    op.execute("""CREATE TRIGGER user_search_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, full_name, email, roll_number)
+        VALUES ('delete', old.rowid, old.full_name, old.email, old.roll_number);
+    END""")
+    op.execute("""CREATE TRIGGER user_search_au AFTER UPDATE OF full_name, email, roll_number ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, full_name, email, roll_number)
+        VALUES ('delete', old.rowid, old.full_name, old.email, old.roll_number);
+        INSERT INTO user_search(rowid, full_name, email, roll_number)
+        VALUES (new.rowid, new.full_name, new.email, new.roll_number);
+    END""")
+    # Index the users that already exist
+    op.execute("INSERT INTO user_search(user_search) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_full_name_id', 'user', ['full_name', 'id'])
+    op.create_index('ix_user_role_full_name_id', 'user', ['role', 'full_name', 'id'])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _upgrade_sqlite()
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name in SEARCH_COLUMNS:
+            op.execute(f'CREATE INDEX ix_user_{name}_trgm ON "user" USING gin ({name} gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS user_search")
+    elif dialect == 'postgresql':
+        for name in SEARCH_COLUMNS:
+            op.execute(f"DROP INDEX IF EXISTS ix_user_{name}_trgm")
+
+    op.drop_index('ix_user_role_full_name_id', table_name='user')
+    op.drop_index('ix_user_full_name_id', table_name='user')
@@ -0,0 +1,134 @@
+"""partition attendance by month of marked_at on postgresql
+
+Revision ID: b7e2c94d1f30
+Revises: 9f3d6a1c8e27
+Create Date: 2026-10-19 16:02:41.118305
+
+"""
+from datetime import date, datetime
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c94d1f30'
+down_revision = '9f3d6a1c8e27'
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, session_id, student_id, marked_at, verification_mask, verification_metadata, created_at, updated_at"
+INDEXES = (
+    ('ix_attendance_session_student', ['session_id', 'student_id']),
+    ('ix_attendance_session_marked', ['session_id', 'marked_at']),
+    ('ix_attendance_student_marked', ['student_id', 'marked_at', 'id']),
+    ('ix_attendance_session_verification', ['session_id', 'verification_mask']),
+)
+OLD_INDEXES = (
+    'uq_attendance_session_student',
+    'ix_attendance_session_marked',
+    'ix_attendance_student_marked',
+    'ix_attendance_session_verification',
+)
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(first: date, last: date) -> None:
+    op.execute("CREATE TABLE attendance_default PARTITION OF attendance DEFAULT")
+    month = date(first.year, first.month, 1)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE attendance_p{month.year:04d}_{month.month:02d} PARTITION OF attendance "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+
+def _attendance_columns():
+    return [
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('session_id', sa.String(length=36), sa.ForeignKey('session.id'), nullable=False),
+        sa.Column('student_id', sa.String(length=36), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('marked_at', sa.DateTime(), nullable=False),
+        sa.Column('verification_mask', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('verification_metadata', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    # The partition key cannot be NULL in a primary key
+    op.execute("UPDATE attendance SET marked_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE marked_at IS NULL")
+    if op.get_context().dialect.name != 'postgresql':
+        # SQLite keeps a single table but gets the model's keys. uq_attendance_id
+        # keeps id a valid target for attendance_anomaly's foreign key
+        with op.batch_alter_table('attendance', recreate='always') as batch_op:
+            batch_op.alter_column('marked_at', existing_type=sa.DateTime(), nullable=False)
+            batch_op.create_primary_key('pk_attendance', ['id', 'marked_at'])
+            batch_op.create_index('uq_attendance_id', ['id'], unique=True)
+        return
+
+    op.drop_constraint('attendance_anomaly_attendance_id_fkey', 'attendance_anomaly', type_='foreignkey')
+    for name in OLD_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("ALTER TABLE attendance RENAME TO attendance_unpartitioned")
+    op.execute("ALTER TABLE attendance_unpartitioned RENAME CONSTRAINT attendance_pkey TO attendance_unpartitioned_pkey")
+
+    op.create_table(
+        'attendance',
+        *_attendance_columns(),
+        sa.PrimaryKeyConstraint('id', 'marked_at'),
+        postgresql_partition_by='RANGE (marked_at)'
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, 'attendance', columns)
+
+    this_month = datetime.utcnow().date().replace(day=1)
+    first = this_month
+    if not context.is_offline_mode():
+        oldest = op.get_bind().execute(sa.text("SELECT MIN(marked_at) FROM attendance_unpartitioned")).scalar()
+        if oldest is not None:
+            first = min(first, oldest.date().replace(day=1))
+    _create_partitions(first, _add_months(this_month, MONTHS_AHEAD))
+
+    op.execute(f"INSERT INTO attendance ({COLUMNS}) SELECT {COLUMNS} FROM attendance_unpartitioned")
+    op.drop_table('attendance_unpartitioned')
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        with op.batch_alter_table('attendance', recreate='always') as batch_op:
+            batch_op.drop_index('uq_attendance_id')
+            batch_op.create_primary_key('pk_attendance', ['id'])
+            batch_op.alter_column('marked_at', existing_type=sa.DateTime(), nullable=True)
+        return
+
+    op.execute("ALTER TABLE attendance RENAME TO attendance_partitioned")
+    op.execute("ALTER TABLE attendance_partitioned RENAME CONSTRAINT attendance_pkey TO attendance_partitioned_pkey")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.create_table('attendance', *_attendance_columns(), sa.PrimaryKeyConstraint('id'))
+    # Marks in detached partitions are not copied back. One mark per session was
+    # not enforced while partitioned, so keep the earliest of any duplicates
+    op.execute(
+        f"INSERT INTO attendance ({COLUMNS}) "
+        f"SELECT DISTINCT ON (session_id, student_id) {COLUMNS} FROM attendance_partitioned "
+        f"ORDER BY session_id, student_id, marked_at, id"
+    )
+    op.execute("DROP TABLE attendance_partitioned")
+
+    op.create_index('uq_attendance_session_student', 'attendance', ['session_id', 'student_id'], unique=True)
+    op.create_index('ix_attendance_session_marked', 'attendance', ['session_id', 'marked_at'])
+    op.create_index('ix_attendance_student_marked', 'attendance', ['student_id', 'marked_at', 'id'])
+    op.create_index('ix_attendance_session_verification', 'attendance', ['session_id', 'verification_mask'])
+    op.create_foreign_key(
+        'attendance_anomaly_attendance_id_fkey', 'attendance_anomaly', 'attendance',
+        ['attendance_id'], ['id'], ondelete='CASCADE'
+    )
@@ -0,0 +1,59 @@
+"""add structured assignment slots
+
+Revision ID: c3d81f5a2e64
+Revises: b7e2c94d1f30
+Create Date: 2026-10-19 16:48:12.504817
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.timetable import parse_schedule
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d81f5a2e64'
+down_revision = 'b7e2c94d1f30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    slots = op.create_table(
+        'assignment_slots',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('assignment_id', sa.String(length=36), nullable=False),
+        sa.Column('weekday', sa.Integer(), nullable=False),
+        sa.Column('start_minute', sa.Integer(), nullable=False),
+        sa.Column('end_minute', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_assignment_slots_assignment_id'), 'assignment_slots', ['assignment_id'])
+    op.create_index('ix_assignment_slots_weekday_start', 'assignment_slots', ['weekday', 'start_minute'])
+
+    # Parse the existing free-form schedules; rows that cannot be read stay unscheduled
+    rows = op.get_bind().execute(sa.text("SELECT id, day_of_week, time_slot FROM assignments")).fetchall()
+    parsed = []
+    for assignment_id, day_of_week, time_slot in rows:
+        try:
+            schedule = parse_schedule(day_of_week, time_slot)
+        except ValueError:
+            continue
+        parsed.extend(
+            {'id': str(uuid.uuid4()), 'assignment_id': assignment_id, 'weekday': weekday,
+             'start_minute': start, 'end_minute': end}
+            for weekday, start, end in schedule
+        )
+    if parsed:
+        op.bulk_insert(slots, parsed)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assignment_slots_weekday_start', table_name='assignment_slots')
+    op.drop_index(op.f('ix_assignment_slots_assignment_id'), table_name='assignment_slots')
+    op.drop_table('assignment_slots')
@@ -0,0 +1,33 @@
+"""add shared table versions for cross-worker cache invalidation
+
+Revision ID: c6f1d8a2b937
+Revises: a8e3c5d17f62
+Create Date: 2026-10-19 21:02:47.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1d8a2b937'
+down_revision = 'a8e3c5d17f62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_versions',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
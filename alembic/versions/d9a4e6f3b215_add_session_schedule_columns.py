@@ -0,0 +1,36 @@
+"""link sessions to the assignment slot that scheduled them
+
+Revision ID: d9a4e6f3b215
+Revises: c3d81f5a2e64
+Create Date: 2026-10-19 17:32:45.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a4e6f3b215'
+down_revision = 'c3d81f5a2e64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('session') as batch_op:
+        batch_op.add_column(sa.Column('assignment_id', sa.String(length=36), nullable=True))
+        batch_op.add_column(sa.Column('scheduled_start', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('scheduled_end', sa.DateTime(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_session_assignment_id', 'assignments', ['assignment_id'], ['id'], ondelete='SET NULL'
+        )
+        batch_op.create_index('uq_session_assignment_slot', ['assignment_id', 'scheduled_start'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('session') as batch_op:
+        batch_op.drop_index('uq_session_assignment_slot')
+        batch_op.drop_constraint('fk_session_assignment_id', type_='foreignkey')
+        batch_op.drop_column('scheduled_end')
+        batch_op.drop_column('scheduled_start')
+        batch_op.drop_column('assignment_id')
@@ -0,0 +1,26 @@
+"""extend student history index with id for keyset pagination
+
+Revision ID: dcf917849fdb
+Revises: 3707649b23e5
+Create Date: 2026-10-19 12:02:44.190562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dcf917849fdb'
+down_revision = '3707649b23e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_attendance_student_marked', table_name='attendance')
+    op.create_index('ix_attendance_student_marked', 'attendance', ['student_id', 'marked_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendance_student_marked', table_name='attendance')
+    op.create_index('ix_attendance_student_marked', 'attendance', ['student_id', 'marked_at'])
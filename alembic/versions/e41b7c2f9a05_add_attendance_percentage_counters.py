@@ -0,0 +1,69 @@
+"""add attendance percentage counters
+
+Revision ID: e41b7c2f9a05
+Revises: 5c0e9a7d31b4
+Create Date: 2026-10-19 14:02:51.736420
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41b7c2f9a05'
+down_revision = '5c0e9a7d31b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    course_counter = op.create_table(
+        'course_session_counter',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('held', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('course_code')
+    )
+    student_counter = op.create_table(
+        'student_course_counter',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('student_id', sa.String(length=36), nullable=False),
+        sa.Column('course_code', sa.String(), nullable=False),
+        sa.Column('attended', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('student_id', 'course_code', name='uq_student_course_counter')
+    )
+
+    # Seed the counters from existing sessions and marks
+    bind = op.get_bind()
+    held = bind.execute(sa.text(
+        "SELECT course_code, COUNT(*) FROM session WHERE status = 'COMPLETED' GROUP BY course_code"
+    )).fetchall()
+    attended = bind.execute(sa.text(
+        "SELECT a.student_id, s.course_code, COUNT(*) FROM attendance a "
+        "JOIN session s ON s.id = a.session_id "
+        "WHERE s.status IN ('ACTIVE', 'COMPLETED') "
+        "GROUP BY a.student_id, s.course_code"
+    )).fetchall()
+    if held:
+        op.bulk_insert(course_counter, [
+            {'id': str(uuid.uuid4()), 'course_code': course_code, 'held': count}
+            for course_code, count in held
+        ])
+    if attended:
+        op.bulk_insert(student_counter, [
+            {'id': str(uuid.uuid4()), 'student_id': student_id, 'course_code': course_code, 'attended': count}
+            for student_id, course_code, count in attended
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('student_course_counter')
+    op.drop_table('course_session_counter')
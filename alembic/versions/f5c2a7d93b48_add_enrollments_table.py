@@ -0,0 +1,37 @@
+"""add course enrollments
+
+Revision ID: f5c2a7d93b48
+Revises: d9a4e6f3b215
+Create Date: 2026-10-19 18:20:31.640273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c2a7d93b48'
+down_revision = 'd9a4e6f3b215'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'enrollments',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('course_id', sa.String(length=36), nullable=False),
+        sa.Column('student_id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('course_id', 'student_id', name='uq_enrollment_course_student')
+    )
+    op.create_index(op.f('ix_enrollments_student_id'), 'enrollments', ['student_id'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_enrollments_student_id'), table_name='enrollments')
+    op.drop_table('enrollments')
@@ -1,6 +1,6 @@
 # app/api/api.py
 from fastapi import APIRouter
-from app.api.endpoints import auth, users, sessions, attendance, admin, courses, rooms, assignments
+from app.api.endpoints import auth, users, sessions, attendance, admin, courses, rooms, assignments, reports
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -10,4 +10,5 @@ api_router.include_router(rooms.router, prefix="/rooms", tags=["rooms"])
 api_router.include_router(assignments.router, prefix="/assignments", tags=["assignments"])
 api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
 api_router.include_router(attendance.router, prefix="/attendance", tags=["attendance"])
-api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
\ No newline at end of file
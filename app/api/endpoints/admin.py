@@ -1,16 +1,22 @@
 # app/api/endpoints/admin.py
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
 import os
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_admin
-from app.db.session import get_db
+from app.db.session import get_db, pool_stats
 from app.models.session import Session
 from app.schemas.session import Session
 from app.services.qr_code import QRCodeService
+from app.services.anomaly import AnomalyService
+from app.models.anomaly import AnomalyStatus
+from app.services.overview import OverviewService
+from app.schemas.overview import AdminOverview
+from app.schemas.database import PoolStatsList
+from app.schemas.anomaly import AttendanceAnomaly, AttendanceAnomalyList, AnomalyReview, AnomalyScanResult
 from app.models.user import User as UserModel  # Import the User model and rename it to UserModel
 
 router = APIRouter()
@@ -33,6 +39,19 @@ async def admin_dashboard(
         {"request": request, "user": {"full_name": "Admin User"}}
     )
 
+@router.get("/overview", response_model=AdminOverview)
+def get_admin_overview(
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Counts and the first page of users, courses, rooms and assignments in one response
+    
+    Served from an in-process cache that any write to those tables invalidates.
+    Like the collection endpoints it replaces on the dashboard, it needs no login.
+    """
+    overview_service = OverviewService(db)
+    return Response(content=overview_service.get_overview_json(limit), media_type="application/json")
+
 @router.post("/maintenance/cleanup-qr", response_model=Dict[str, int])
 def cleanup_qr_codes(  # Remove async
     db: Session = Depends(get_db),  # Change from AsyncSession to Session
@@ -41,4 +60,59 @@ def cleanup_qr_codes(  # Remove async
     """Clean up expired QR code files"""
     qr_code_service = QRCodeService()
     count = qr_code_service.cleanup_expired_qr_codes()
-    return {"removed_files": count}
\ No newline at end of file
+    return {"removed_files": count}
+
+
+@router.get("/db/pool", response_model=PoolStatsList)
+def get_db_pool_stats(
+    current_user: UserModel = Depends(get_current_admin)
+) -> Any:
+    """Connection pool usage of the worker that answers; each worker has its own pools"""
+    return {"pools": pool_stats()}
+
+
+@router.get("/anomalies", response_model=AttendanceAnomalyList)
+def list_attendance_anomalies(
+    anomaly_status: Optional[AnomalyStatus] = Query(AnomalyStatus.OPEN, alias="status"),
+    session_id: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_admin)
+) -> Any:
+    """List marks flagged as possible proxy attendance, most suspicious first"""
+    anomaly_service = AnomalyService(db)
+    anomalies = anomaly_service.get_anomalies(status=anomaly_status, session_id=session_id, limit=limit, offset=offset)
+    return {"anomalies": anomalies}
+
+
+@router.post("/anomalies/scan", response_model=AnomalyScanResult)
+def scan_attendance_anomalies(
+    session_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_admin)
+) -> Any:
+    """Scan newly completed sessions now, or re-scan a single session"""
+    anomaly_service = AnomalyService(db)
+    if session_id:
+        return {"sessions": 1, "flagged": anomaly_service.rescan_session(session_id)}
+    result = anomaly_service.scan()
+    return {"sessions": result["sessions"], "flagged": result["flagged"]}
+
+
+@router.post("/anomalies/{anomaly_id}/review", response_model=AttendanceAnomaly)
+def review_attendance_anomaly(
+    anomaly_id: str,
+    review: AnomalyReview,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_admin)
+) -> Any:
+    """Confirm or dismiss a flagged mark"""
+    anomaly_service = AnomalyService(db)
+    anomaly = anomaly_service.review(anomaly_id, review.status, current_user.id)
+    if not anomaly:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anomaly not found"
+        )
+    return anomaly
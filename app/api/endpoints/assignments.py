@@ -1,17 +1,42 @@
 # app/api/endpoints/assignments.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.schemas.assignment import Assignment, AssignmentCreate, AssignmentUpdate, AssignmentList
+from app.api.etag import etag_version
+from app.core.timetable import WEEKDAYS, format_minutes, parse_time, parse_weekday
+from app.schemas.assignment import (
+    Assignment, AssignmentCreate, AssignmentUpdate, AssignmentList, CurrentClass, FreeBusy
+)
 from app.services.assignment import AssignmentService
-from app.models.user import User
-from app.models.course import Course
-from app.models.room import Room
+from app.services.timetable import FACULTY, ROOM, SlotEntry, TimetableService, to_timetable_time
 
 router = APIRouter()
 
+def _slot(entry: Optional[SlotEntry]) -> Optional[Dict[str, Any]]:
+    if entry is None:
+        return None
+    return {
+        "assignment_id": entry.assignment_id,
+        "faculty_id": entry.faculty_id,
+        "course_id": entry.course_id,
+        "course_code": entry.course_code,
+        "course_name": entry.course_name,
+        "room_id": entry.room_id,
+        "room_number": entry.room_number,
+        "start": format_minutes(entry.start),
+        "end": format_minutes(entry.end)
+    }
+
+def _room_or_faculty(room: Optional[str], faculty: Optional[str]) -> None:
+    if (room is None) == (faculty is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass exactly one of room or faculty"
+        )
+
 @router.post("/", response_model=Assignment, status_code=status.HTTP_201_CREATED)
 def create_assignment(
     assignment_in: AssignmentCreate,
@@ -21,20 +46,7 @@ def create_assignment(
     assignment_service = AssignmentService(db)
     try:
         assignment = assignment_service.create_assignment(assignment_in)
-        
-        # Enrich with related data
-        faculty = db.query(User).filter(User.id == assignment.faculty_id).first()
-        course = db.query(Course).filter(Course.id == assignment.course_id).first()
-        room = db.query(Room).filter(Room.id == assignment.room_id).first()
-        
-        # Create response
-        response = assignment.__dict__.copy()
-        response["faculty_name"] = faculty.full_name if faculty else None
-        response["course_code"] = course.course_code if course else None
-        response["course_name"] = course.course_name if course else None
-        response["room_number"] = room.room_number if room else None
-        
-        return response
+        return assignment_service.get_assignment_with_details(assignment.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,31 +54,19 @@ def create_assignment(
         )
 
 # app/api/endpoints/assignments.py
-@router.get("/", response_model=AssignmentList)
+def _assignments_version(db: Session = Depends(get_db)) -> Any:
+    return AssignmentService(db).get_assignments_version()
+
+@router.get("/", response_model=AssignmentList, dependencies=[Depends(etag_version(_assignments_version))])
 def get_all_assignments(
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get all assignments"""
-    assignment_service = AssignmentService(db)
-    assignments = assignment_service.get_all_assignments()
-    
-    # Enrich assignments with related data
-    enriched_assignments = []
-    for assignment in assignments:
-        faculty = db.query(User).filter(User.id == assignment.faculty_id).first()
-        course = db.query(Course).filter(Course.id == assignment.course_id).first()
-        room = db.query(Room).filter(Room.id == assignment.room_id).first()
-        
-        if faculty and course and room:  # Make sure all exist
-            assignment_dict = assignment.__dict__.copy()
-            assignment_dict["faculty_name"] = faculty.full_name
-            assignment_dict["course_code"] = course.course_code
-            assignment_dict["course_name"] = course.course_name
-            assignment_dict["room_number"] = room.room_number
-            
-            enriched_assignments.append(assignment_dict)
+    """Get all assignments
     
-    return {"assignments": enriched_assignments}
+    A matching If-None-Match gets 304 before the assignments are loaded.
+    """
+    assignment_service = AssignmentService(db)
+    return {"assignments": assignment_service.get_assignments_with_details()}
 
 @router.get("/faculty/{faculty_id}", response_model=AssignmentList)
 def get_faculty_assignments(
@@ -75,24 +75,64 @@ def get_faculty_assignments(
 ) -> Any:
     """Get all assignments for a faculty member"""
     assignment_service = AssignmentService(db)
-    assignments = assignment_service.get_faculty_assignments(faculty_id)
+    return {"assignments": assignment_service.get_faculty_assignments_with_details(faculty_id)}
+
+@router.get("/free-busy", response_model=FreeBusy)
+def get_free_busy(
+    day: str,
+    room: Optional[str] = Query(None, description="Room id or room number"),
+    faculty: Optional[str] = Query(None, description="Faculty user id"),
+    start: Optional[str] = Query(None, description="HH:MM; with end, also answer whether the range is free"),
+    end: Optional[str] = None,
+    db: Session = Depends(get_db)
+) -> Any:
+    """Booked slots of a room or faculty member on a weekday, from the in-memory timetable"""
+    _room_or_faculty(room, faculty)
+    try:
+        weekday = parse_weekday(day)
+        window = (parse_time(start), parse_time(end)) if start and end else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    # Enrich assignments with related data
-    enriched_assignments = []
-    for assignment in assignments:
-        faculty = db.query(User).filter(User.id == assignment.faculty_id).first()
-        course = db.query(Course).filter(Course.id == assignment.course_id).first()
-        room = db.query(Room).filter(Room.id == assignment.room_id).first()
-        
-        assignment_dict = assignment.__dict__.copy()
-        assignment_dict["faculty_name"] = faculty.full_name if faculty else None
-        assignment_dict["course_code"] = course.course_code if course else None
-        assignment_dict["course_name"] = course.course_name if course else None
-        assignment_dict["room_number"] = room.room_number if room else None
-        
-        enriched_assignments.append(assignment_dict)
+    index = TimetableService(db).get_index()
+    kind, key = (ROOM, index.resolve_room(room)) if room is not None else (FACULTY, faculty)
+    busy = index.busy(kind, key, weekday)
+    return {
+        "day": WEEKDAYS[weekday],
+        "busy": [_slot(entry) for entry in busy],
+        "free": not index.conflicts(kind, key, weekday, *window) if window else None
+    }
+
+@router.get("/current", response_model=CurrentClass)
+def get_current_class(
+    room: Optional[str] = Query(None, description="Room id or room number"),
+    faculty: Optional[str] = Query(None, description="Faculty user id"),
+    at: Optional[datetime] = Query(None, description="UTC time to look up; defaults to now"),
+    db: Session = Depends(get_db)
+) -> Any:
+    """The class running in a room or taught by a faculty member now, and the next one today
+
+    Answered from the in-memory timetable with a binary search, so it can
+    prefill course and room when a session is created.
+    """
+    _room_or_faculty(room, faculty)
+    if at is not None and at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    local = to_timetable_time(at or datetime.utcnow())
+    minute = local.hour * 60 + local.minute
     
-    return {"assignments": enriched_assignments}
+    index = TimetableService(db).get_index()
+    kind, key = (ROOM, index.resolve_room(room)) if room is not None else (FACULTY, faculty)
+    current, upcoming = index.current(kind, key, local.weekday(), minute)
+    return {
+        "day": WEEKDAYS[local.weekday()],
+        "time": format_minutes(minute),
+        "current": _slot(current),
+        "next": _slot(upcoming)
+    }
 
 @router.get("/{assignment_id}", response_model=Assignment)
 def get_assignment(
@@ -101,25 +141,14 @@ def get_assignment(
 ) -> Any:
     """Get a specific assignment by ID"""
     assignment_service = AssignmentService(db)
-    assignment = assignment_service.get_assignment(assignment_id)
+    assignment = assignment_service.get_assignment_with_details(assignment_id)
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
     
-    # Enrich with related data
-    faculty = db.query(User).filter(User.id == assignment.faculty_id).first()
-    course = db.query(Course).filter(Course.id == assignment.course_id).first()
-    room = db.query(Room).filter(Room.id == assignment.room_id).first()
-    
-    response = assignment.__dict__.copy()
-    response["faculty_name"] = faculty.full_name if faculty else None
-    response["course_code"] = course.course_code if course else None
-    response["course_name"] = course.course_name if course else None
-    response["room_number"] = room.room_number if room else None
-    
-    return response
+    return assignment
 
 @router.put("/{assignment_id}", response_model=Assignment)
 def update_assignment(
@@ -129,25 +158,20 @@ def update_assignment(
 ) -> Any:
     """Update an assignment"""
     assignment_service = AssignmentService(db)
-    assignment = assignment_service.update_assignment(assignment_id, assignment_in)
+    try:
+        assignment = assignment_service.update_assignment(assignment_id, assignment_in)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
     
-    # Enrich with related data
-    faculty = db.query(User).filter(User.id == assignment.faculty_id).first()
-    course = db.query(Course).filter(Course.id == assignment.course_id).first()
-    room = db.query(Room).filter(Room.id == assignment.room_id).first()
-    
-    response = assignment.__dict__.copy()
-    response["faculty_name"] = faculty.full_name if faculty else None
-    response["course_code"] = course.course_code if course else None
-    response["course_name"] = course.course_name if course else None
-    response["room_number"] = room.room_number if room else None
-    
-    return response
+    return assignment_service.get_assignment_with_details(assignment.id)
 
 @router.delete("/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_assignment(
@@ -1,20 +1,47 @@
 # app/api/endpoints/attendance.py
-from typing import Any, Dict, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+import re
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 from app.db.session import get_db
 from app.api.deps import get_current_faculty, get_current_student, get_current_active_user
+from app.api.etag import etag_version
 from app.schemas.session import Session
 from app.models.session import Session
-from app.services.attendance import AttendanceService
+from app.services.archive import ArchiveStore
+from app.services.assignment import AssignmentService
+from app.services.attendance import AttendanceService, decode_history_cursor
+from app.services.attendance_export import (
+    AttendanceExportService, iter_csv, to_parquet_bytes, stream_session_attendance_csv
+)
 from app.services.session import SessionService
-from app.models.user import User  # Import User model
-from app.schemas.attendance import Attendance, AttendanceCreate, AttendanceList, AttendanceMark, AttendanceMarkWithQR
+from app.services.attendance_stats import AttendanceStatsService
+from app.services.enrollment import EnrollmentService
+from app.models.user import User, UserRole  # Import User model
+from app.models.attendance import VerificationFactor
+from app.schemas.attendance import (
+    Attendance, AttendanceCreate, AttendanceList, AttendanceMark, AttendanceMarkWithQR, AttendanceHistoryPage,
+    AttendancePercentageSummary
+)
+from app.schemas.enrollment import SessionAbsentees
 
 router = APIRouter()
 
 
+def _attachment(filename: str) -> Dict[str, str]:
+    """Content-Disposition for a download whose name may hold any characters
+
+    Quotes, semicolons and line breaks cannot break out of the header: the
+    plain filename keeps only safe ASCII, and filename* carries the real
+    name percent-encoded.
+    """
+    fallback = re.sub(r"[^A-Za-z0-9._-]", "_", filename)
+    return {"Content-Disposition": f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"}
+
+
 @router.get("/session/{session_id}", response_model=AttendanceList)
 async def get_session_attendances(
     session_id: uuid.UUID,
@@ -42,23 +69,64 @@ async def get_session_attendances(
     return {"attendances": attendances}
 
 
-@router.get("/student/{student_id}", response_model=AttendanceList)
-async def get_student_attendances(
+def _get_history_page(db: Session, student_id: uuid.UUID, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Load one page of attendance history, mapping a bad cursor to a 400"""
+    attendance_service = AttendanceService(db)
+    try:
+        return attendance_service.get_student_attendance_history_page(student_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/student/{student_id}", response_model=AttendanceHistoryPage)
+def get_student_attendances(
     student_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: Attendance = Depends(get_current_active_user)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    """Get all attendances for a student"""
+    """Get a page of attendance history for a student, newest first"""
     # Verify student ID matches current user if student
-    if current_user.role == "STUDENT" and current_user.id != student_id:
+    if current_user.role == "STUDENT" and str(current_user.id) != str(student_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this student's attendance"
         )
     
-    attendance_service = AttendanceService(db)
-    attendances = await attendance_service.get_student_attendances(student_id)
-    return {"attendances": attendances}
+    return _get_history_page(db, student_id, limit, cursor)
+
+
+@router.get("/student/{student_id}/percentage", response_model=AttendancePercentageSummary)
+def get_student_attendance_percentage(
+    student_id: uuid.UUID,
+    threshold: Optional[float] = Query(None, ge=0, le=100),
+    term: Optional[str] = Query(None, description="e.g. 2025-spring; defaults to the current term"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get a student's attended/held counts and percentage per course for a term"""
+    if current_user.role == "STUDENT" and str(current_user.id) != str(student_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this student's attendance"
+        )
+    
+    return AttendanceStatsService(db).get_student_summary(student_id, threshold=threshold, term=term)
+
+
+@router.get("/percentage", response_model=AttendancePercentageSummary)
+def get_my_attendance_percentage(
+    threshold: Optional[float] = Query(None, ge=0, le=100),
+    term: Optional[str] = Query(None, description="e.g. 2025-spring; defaults to the current term"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_student)
+) -> Any:
+    """Get current student's attended/held counts and percentage per course for a term"""
+    return AttendanceStatsService(db).get_student_summary(current_user.id, threshold=threshold, term=term)
 
 
 @router.get("/my", response_model=AttendanceList)
@@ -124,34 +192,57 @@ def mark_attendance_with_qr(
         "marked_at": result["attendance"].marked_at.isoformat()
     }
     
-@router.get("/history", response_model=List[Dict[str, Any]])
+def _history_version(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_student)
+) -> Any:
+    return current_user.id, AttendanceService(db).get_student_history_version(current_user.id)
+
+@router.get("/history", response_model=AttendanceHistoryPage, dependencies=[Depends(etag_version(_history_version))])
 def get_attendance_history(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_student)
 ) -> Any:
-    """Get attendance history for current student"""
-    attendance_service = AttendanceService(db)
-    history = attendance_service.get_student_attendance_history(current_user.id)
-    return history
+    """Get a page of attendance history for current student, newest first
+
+    Pass the returned next_cursor as `cursor` to fetch the following page.
+    A matching If-None-Match gets 304 before the page is loaded.
+    """
+    return _get_history_page(db, current_user.id, limit, cursor)
 
 @router.get("/faculty/sessions", response_model=List[Dict[str, Any]])
 def get_faculty_sessions_attendance(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_faculty)
 ) -> Any:
-    """Get attendance stats for all sessions created by current faculty"""
+    """Get attendance stats for sessions created by current faculty, newest first
+
+    Pass the `cursor` of the last session received to get the next page
+    """
+    try:
+        after = decode_history_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     attendance_service = AttendanceService(db)
-    sessions = attendance_service.get_faculty_session_attendance(current_user.id)
+    sessions = attendance_service.get_faculty_session_attendance(current_user.id, limit=limit, after=after)
     return sessions
 
-@router.get("/session/{session_id}/full", response_model=List[Dict[str, Any]])
-def get_full_session_attendance(
-    session_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_faculty)
-) -> Any:
-    """Get detailed attendance for a specific session"""
-    # Verify session belongs to this faculty
+def _check_session_owner(faculty_id: Any, current_user: User) -> None:
+    if str(faculty_id) != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this session"
+        )
+
+def _get_owned_session(db: Session, session_id: uuid.UUID, current_user: User):
+    """Load a session and make sure it belongs to the current faculty"""
     session_service = SessionService(db)
     session = session_service.get_session(session_id)
     
@@ -161,18 +252,90 @@ def get_full_session_attendance(
             detail="Session not found"
         )
     
-    if str(session.faculty_id) != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this session"
-        )
+    _check_session_owner(session.faculty_id, current_user)
+    return session
+
+@router.get("/session/{session_id}/absentees", response_model=SessionAbsentees)
+def get_session_absentees(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_faculty)
+) -> Any:
+    """Students enrolled in the session's course who have not marked attendance"""
+    session = _get_owned_session(db, session_id, current_user)
+    enrollment_service = EnrollmentService(db)
+    return enrollment_service.get_session_absentees(session)
+
+@router.get("/session/{session_id}/full", response_model=List[Dict[str, Any]])
+def get_full_session_attendance(
+    session_id: uuid.UUID,
+    failed_factor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_faculty)
+) -> Any:
+    """Get detailed attendance for a specific session
+
+    Pass failed_factor (qr, face or proximity) to only list marks where that factor failed
+    """
+    # Verify session belongs to this faculty
+    _get_owned_session(db, session_id, current_user)
+    
+    factor = None
+    if failed_factor:
+        factor = VerificationFactor.__members__.get(failed_factor.upper())
+        if factor is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown verification factor: {failed_factor}"
+            )
     
     # Get detailed attendance list
     attendance_service = AttendanceService(db)
-    attendances = attendance_service.get_session_attendances_with_details(session_id)
+    attendances = attendance_service.get_session_attendances_with_details(session_id, failed_factor=factor)
     
     return attendances
 
+@router.get("/session/{session_id}/export.csv")
+def export_session_attendance_csv(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_faculty)
+) -> Any:
+    """Stream the attendance of a session as CSV without building it in memory
+
+    Sessions that have been archived are streamed from the Parquet archive
+    """
+    archived_session = None
+    if SessionService(db).get_session(session_id):
+        _get_owned_session(db, session_id, current_user)
+    else:
+        archived_session = ArchiveStore().get_session(str(session_id))
+        if not archived_session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found"
+            )
+        _check_session_owner(archived_session["faculty_id"], current_user)
+    
+    headers = _attachment(f"session_{session_id}_attendance.csv")
+    return StreamingResponse(
+        stream_session_attendance_csv(str(session_id), archived_session=archived_session),
+        media_type="text/csv",
+        headers=headers
+    )
+
+@router.get("/session/{session_id}/verification-summary", response_model=Dict[str, Any])
+def get_session_verification_summary(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_faculty)
+) -> Any:
+    """Get per-factor pass/fail counts for a session"""
+    _get_owned_session(db, session_id, current_user)
+    
+    attendance_service = AttendanceService(db)
+    return attendance_service.get_session_verification_summary(session_id)
+
 @router.post("/mark-with-factors", response_model=Dict[str, Any])
 def mark_attendance_with_factors(
     data: AttendanceMarkWithQR,  # Reuse the same schema
@@ -200,4 +363,49 @@ def mark_attendance_with_factors(
         "session_id": str(result["session"].id),
         "course_code": result["session"].course_code,
         "marked_at": result["attendance"].marked_at.isoformat()
-    }
\ No newline at end of file
+    }
+
+@router.get("/course/{course_code}/matrix")
+def export_course_attendance_matrix(
+    course_code: str,
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    verified_only: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Export a students x sessions attendance matrix for a course as CSV or Parquet
+
+    Admins can export any course, faculty only courses they are assigned to
+    """
+    if current_user.role not in (UserRole.ADMIN, UserRole.FACULTY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    if current_user.role == UserRole.FACULTY and not AssignmentService(db).is_assigned_to_course(current_user.id, course_code):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not assigned to this course"
+        )
+    
+    export_service = AttendanceExportService(db)
+    matrix = export_service.get_course_matrix(course_code, verified_only=verified_only)
+    if matrix is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No sessions found for course {course_code}"
+        )
+    
+    headers = _attachment(f"{course_code}_attendance.{format}")
+    if format == "parquet":
+        try:
+            data = to_parquet_bytes(matrix)
+        except RuntimeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail=str(e)
+            )
+        chunks = (data[i:i + 65536] for i in range(0, len(data), 65536))
+        return StreamingResponse(chunks, media_type="application/vnd.apache.parquet", headers=headers)
+    
+    return StreamingResponse(iter_csv(matrix), media_type="text/csv", headers=headers)
@@ -1,11 +1,16 @@
 # app/api/endpoints/courses.py
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_current_active_user, get_current_admin
+from app.api.etag import conditional_json
+from app.models.user import User, UserRole
 from app.schemas.course import Course, CourseCreate, CourseUpdate, CourseList
+from app.schemas.enrollment import CourseRoster, EnrollmentImport, EnrollmentImportResult
+from app.services.assignment import AssignmentService
 from app.services.course import CourseService
+from app.services.enrollment import EnrollmentService
 
 router = APIRouter()
 
@@ -27,12 +32,16 @@ def create_course(
 
 @router.get("/", response_model=CourseList)
 def get_all_courses(
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get all courses (no authentication required)"""
+    """Get all courses (no authentication required)
+    
+    Served from an in-process cache; a matching If-None-Match gets 304
+    without touching the database.
+    """
     course_service = CourseService(db)
-    courses = course_service.get_all_courses()
-    return CourseList(courses=courses)
+    return conditional_json(request, course_service.get_all_courses_json())
 
 @router.get("/{course_id}", response_model=Course)
 def get_course(
@@ -77,4 +86,76 @@ def delete_course(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
-        )
\ No newline at end of file
+        )
+
+def _get_course_or_404(db: Session, course_id: str):
+    course = CourseService(db).get_course(course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    return course
+
+@router.get("/{course_id}/enrollments", response_model=CourseRoster)
+def get_course_roster(
+    course_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Students enrolled in a course, by roll number
+
+    Admins can read any roster, faculty only those of courses they are assigned to
+    """
+    if current_user.role not in (UserRole.ADMIN, UserRole.FACULTY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    course = _get_course_or_404(db, course_id)
+    if current_user.role == UserRole.FACULTY and not AssignmentService(db).is_assigned_to_course(current_user.id, course.course_code):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not assigned to this course"
+        )
+    enrollment_service = EnrollmentService(db)
+    students = enrollment_service.get_roster(course.course_code)
+    return {"course_code": course.course_code, "students": [student._asdict() for student in students]}
+
+@router.post("/{course_id}/enrollments", response_model=EnrollmentImportResult)
+def import_enrollments(
+    course_id: str,
+    enrollment_in: EnrollmentImport,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+) -> Any:
+    """Bulk-enroll students by id, roll number or email; already enrolled students are skipped (admin only)"""
+    _get_course_or_404(db, course_id)
+    enrollment_service = EnrollmentService(db)
+    try:
+        return enrollment_service.enroll_students(
+            course_id,
+            student_ids=enrollment_in.student_ids,
+            roll_numbers=enrollment_in.roll_numbers,
+            emails=enrollment_in.emails
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.delete("/{course_id}/enrollments/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_enrollment(
+    course_id: str,
+    student_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+) -> None:
+    """Remove a student from a course roster (admin only)"""
+    enrollment_service = EnrollmentService(db)
+    if not enrollment_service.unenroll_student(course_id, student_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Enrollment not found"
+        )
@@ -0,0 +1,50 @@
+# app/api/endpoints/reports.py
+from typing import Any, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+import uuid
+from app.db.session import get_db
+from app.api.deps import get_current_active_user
+from app.models.user import User, UserRole
+from app.schemas.report import CourseDailyRollupList, StudentMonthlyRollupList
+from app.services.rollup import RollupService
+
+router = APIRouter()
+
+
+@router.get("/course/{course_code}/daily", response_model=CourseDailyRollupList)
+def get_course_daily_rollups(
+    course_code: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get per-day attendance counts for a course from the rollup tables"""
+    if current_user.role not in (UserRole.ADMIN, UserRole.FACULTY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    rollup_service = RollupService(db)
+    return {"days": rollup_service.get_course_daily(course_code, start=start, end=end)}
+
+
+@router.get("/student/{student_id}/monthly", response_model=StudentMonthlyRollupList)
+def get_student_monthly_rollups(
+    student_id: uuid.UUID,
+    course_code: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """Get per-month attendance counts for a student from the rollup tables"""
+    if current_user.role == UserRole.STUDENT and str(current_user.id) != str(student_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this student's attendance"
+        )
+    
+    rollup_service = RollupService(db)
+    return {"months": rollup_service.get_student_monthly(str(student_id), course_code=course_code)}
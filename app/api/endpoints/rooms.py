@@ -1,9 +1,10 @@
 # app/api/endpoints/rooms.py
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.api.etag import conditional_json
 from app.schemas.room import Room, RoomCreate, RoomUpdate, RoomList
 from app.services.room import RoomService
 
@@ -27,12 +28,16 @@ def create_room(
 
 @router.get("/", response_model=RoomList)
 def get_all_rooms(
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get all rooms (no authentication required)"""
+    """Get all rooms (no authentication required)
+    
+    Served from an in-process cache; a matching If-None-Match gets 304
+    without touching the database.
+    """
     room_service = RoomService(db)
-    rooms = room_service.get_all_rooms()
-    return RoomList(rooms=rooms)
+    return conditional_json(request, room_service.get_all_rooms_json())
 
 @router.get("/{room_id}", response_model=Room)
 def get_room(
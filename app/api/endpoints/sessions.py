@@ -7,14 +7,17 @@ import uuid
 import secrets
 from app.db.session import get_db
 from app.api.deps import get_current_faculty, get_current_active_user, get_current_student, get_current_user
+from app.api.etag import etag_version
 from app.models.session import SessionStatus, Session as SessionModel
 from app.models.user import UserRole
 from app.schemas.user import User
 from app.services.attendance import AttendanceService
 from app.services.session import SessionService
+from app.services.headcount import HeadcountService
 from app.services.qr_code import QRCodeService
 from app.schemas.session import (
-    Session, SessionCreate, SessionResponse, SessionList, QRCodeResponse, VerifySessionRequest
+    Session, SessionCreate, SessionResponse, SessionList, QRCodeResponse, VerifySessionRequest,
+    SessionHeadcount
 )
 
 from fastapi.concurrency import run_in_threadpool
@@ -47,13 +50,22 @@ def get_sessions(
         
     return {"sessions": sessions}
 
-@router.get("/my", response_model=SessionList)
+def _my_sessions_version(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_faculty)
+) -> Any:
+    return current_user.id, SessionService(db).get_faculty_sessions_version(current_user.id)
+
+@router.get("/my", response_model=SessionList, dependencies=[Depends(etag_version(_my_sessions_version))])
 def get_my_sessions(
     active_only: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_faculty)
 ) -> Any:
-    """Get current faculty's sessions"""
+    """Get current faculty's sessions
+    
+    A matching If-None-Match gets 304 before the sessions are loaded.
+    """
     session_service = SessionService(db)
     
     if active_only:
@@ -156,14 +168,16 @@ def get_session_qr(
                 detail="Not authorized to access this session"
             )
         
-        # Generate or retrieve QR code
-        qr_data = qr_code_service.generate_session_qr(
-            session_id=session.id,
-            faculty_id=session.faculty_id,
-            course_code=session.course_code,
-            room_number=session.room_number,
-            proximity_uuid=session.proximity_uuid
-        )
+        # Serve the scheduler's pre-generated QR code while valid, else generate one
+        qr_data = qr_code_service.get_pregenerated_qr(session.id)
+        if qr_data is None:
+            qr_data = qr_code_service.generate_session_qr(
+                session_id=session.id,
+                faculty_id=session.faculty_id,
+                course_code=session.course_code,
+                room_number=session.room_number,
+                proximity_uuid=session.proximity_uuid
+            )
         
         return qr_data
     except Exception as e:
@@ -211,7 +225,7 @@ def end_session(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_faculty)
 ) -> Any:
-    """End a session (change status to ENDED)"""
+    """End a session (change status to COMPLETED)"""
     # Verify the session exists and belongs to the faculty
     session_service = SessionService(db)
     session = session_service.get_session(session_id)
@@ -235,6 +249,30 @@ def end_session(
         )
     
     return session
+
+@router.get("/{session_id}/headcount", response_model=SessionHeadcount)
+def get_session_headcount(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_faculty)
+) -> Any:
+    """Marks so far against the room's capacity; active sessions answer from memory"""
+    session = SessionService(db).get_session(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    if session.faculty_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this session"
+        )
+    
+    headcount_service = HeadcountService(db)
+    live = session.status == SessionStatus.ACTIVE
+    count, capacity = headcount_service.get_live(session) if live else headcount_service.count_marks(session)
+    return {"session_id": str(session.id), "count": count, "capacity": capacity, "live": live}
 # app/api/endpoints/sessions.py
 
 @router.post("/verify")
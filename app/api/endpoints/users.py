@@ -1,11 +1,13 @@
 # app/api/endpoints/users.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session  # Change from AsyncSession
 import uuid
 from app.db.session import get_db
+from app.api.deps import get_current_admin
+from app.api.etag import etag_version
 from app.services.user import UserService
-from app.schemas.user import User, UserCreate, UserUpdate, UserList
+from app.schemas.user import User, UserCreate, UserUpdate, UserList, UserBulkSelection, UserBulkResult
 from app.models.user import UserRole
 
 router = APIRouter()
@@ -36,17 +38,35 @@ def get_user_me(
     admin = admin_users[0]
     return admin
 
-@router.get("/", response_model=UserList)
+def _users_version(
+    role: UserRole = None,
+    db: Session = Depends(get_db)
+) -> Any:
+    return UserService(db).get_users_version(role)
+
+@router.get("/", response_model=UserList, dependencies=[Depends(etag_version(_users_version))])
 def get_users(
     role: UserRole = None,
-    skip: int = 0,
-    limit: int = 100,
+    q: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ) -> Any:
-    """Get all users, optionally filtered by role"""
+    """Get a page of the user directory by name, optionally filtered by role
+    
+    `q` matches anywhere in the name, email or roll number (as a prefix when
+    shorter than three characters). Pass the returned next_cursor as
+    `cursor` to fetch the following page. A matching If-None-Match gets
+    304 before the users are loaded.
+    """
     user_service = UserService(db)
-    users = user_service.get_users(role, skip, limit)
-    return {"users": users}
+    try:
+        return user_service.search_users(role, q=q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.post("/", response_model=User)
 def create_user(
@@ -124,4 +144,47 @@ def deactivate_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
\ No newline at end of file
+    return user
+
+def _run_bulk(operation) -> Any:
+    """Run a bulk operation, mapping an empty selection to a 400"""
+    try:
+        return operation()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/bulk/activate", response_model=UserBulkResult)
+def bulk_activate_users(
+    selection: UserBulkSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+) -> Any:
+    """Activate every user matching the ids and filters in one UPDATE"""
+    user_service = UserService(db)
+    return {"updated": _run_bulk(lambda: user_service.set_users_active(selection, True))}
+
+@router.post("/bulk/deactivate", response_model=UserBulkResult)
+def bulk_deactivate_users(
+    selection: UserBulkSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+) -> Any:
+    """Deactivate every user matching the ids and filters in one UPDATE, except the caller"""
+    user_service = UserService(db)
+    return {"updated": _run_bulk(lambda: user_service.set_users_active(selection, False, exclude_id=current_user.id))}
+
+@router.post("/bulk/delete", response_model=UserBulkResult)
+def bulk_delete_users(
+    selection: UserBulkSelection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+) -> Any:
+    """Delete every user matching the ids and filters in one DELETE, except the caller
+    
+    Users with sessions, attendance marks or assignments are kept and counted.
+    """
+    user_service = UserService(db)
+    return _run_bulk(lambda: user_service.delete_users(selection, exclude_id=current_user.id))
@@ -0,0 +1,62 @@
+# app/api/etag.py
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.core.cache import RenderedJSON
+
+_HEADERS = {"Cache-Control": "no-cache"}
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from a hash of the given parts"""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names this ETag"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **_HEADERS})
+
+
+def conditional_json(request: Request, rendered: RenderedJSON) -> Response:
+    """304 if the client already holds this body, otherwise the body with its ETag"""
+    if etag_matches(request, rendered.etag):
+        return not_modified(rendered.etag)
+    return Response(
+        content=rendered.body,
+        media_type="application/json",
+        headers={"ETag": rendered.etag, **_HEADERS}
+    )
+
+
+def etag_version(version: Callable[..., Any]) -> Callable[..., None]:
+    """Route dependency that answers If-None-Match from a cheap version function
+
+    `version` is itself a dependency, so it can take the request's query
+    parameters, database session and current user. Whatever it returns is
+    hashed with the path and query string into the ETag. It runs before the
+    route body, so a matching ETag skips the route's query and serialization.
+    The version must come from the database (counts, max timestamps), not
+    from per-process state, and must include the user for per-user routes.
+
+        @router.get("/", dependencies=[Depends(etag_version(items_version))])
+    """
+    def check(request: Request, response: Response, current: Any = Depends(version)) -> None:
+        etag = make_etag(request.url.path, request.url.query, current)
+        if etag_matches(request, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **_HEADERS})
+        response.headers["ETag"] = etag
+        response.headers.update(_HEADERS)
+
+    return check
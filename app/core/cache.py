@@ -0,0 +1,194 @@
+# app/core/cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import column, event, select, table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "changed_tables"
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+
+# Counters in the database that every worker bumps when it writes a cached table
+_shared_table = table("table_versions", column("id"), column("name"), column("version"))
+# Tables some VersionedCache is built on; writes to any other table cost nothing extra
+_watched = set()
+_shared: Dict[str, int] = {}
+_shared_checked_at: Optional[float] = None
+_version_engine: Optional[Engine] = None
+
+
+def table_versions(*tables: str) -> Tuple[int, ...]:
+    """Current write version of each table, bumped on every commit that touches it"""
+    return tuple(_versions.get(table, 0) for table in tables)
+
+
+def shared_versions(*tables: str) -> Tuple[int, ...]:
+    """Database-held version of each table, re-read at most every CACHE_VERSION_CHECK_SECONDS
+
+    These move when any worker commits a write, so they catch what the
+    in-process versions miss. A negative interval turns the check off.
+    """
+    global _shared, _shared_checked_at
+    interval = settings.CACHE_VERSION_CHECK_SECONDS
+    now = time.monotonic()
+    due = _shared_checked_at is None or now - _shared_checked_at >= interval
+    if _version_engine is not None and interval >= 0 and due:
+        try:
+            with _version_engine.connect() as conn:
+                rows = dict(conn.execute(select(_shared_table.c.name, _shared_table.c.version)).all())
+        except DBAPIError as e:
+            # Usually the table_versions migration has not been applied yet
+            logger.warning(f"Could not read shared table versions: {str(e)}")
+            rows = _shared
+        with _lock:
+            _shared, _shared_checked_at = rows, now
+    return tuple(_shared.get(table, 0) for table in tables)
+
+
+def bump_tables(tables: Iterable[str]) -> None:
+    """Mark tables as changed, invalidating every cache built on them"""
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _record_flush(session: Session, flush_context, instances) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            _pending(session).add(table)
+
+
+def _record_bulk(orm_execute_state) -> None:
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name != _shared_table.name:
+            _pending(orm_execute_state.session).add(table.name)
+
+
+def _bump_shared(session: Session) -> None:
+    """Bump the database versions of watched tables in the transaction that writes them"""
+    if session.in_nested_transaction():
+        return
+    session.flush()
+    changed = sorted(session.info.get(_PENDING_KEY, set()) & _watched)
+    dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(session.get_bind().dialect.name)
+    if not changed or dialect is None:
+        return
+    upsert = dialect.insert(_shared_table).values([
+        {"id": str(uuid.uuid4()), "name": name, "version": 1} for name in changed
+    ])
+    session.execute(upsert.on_conflict_do_update(
+        index_elements=[_shared_table.c.name],
+        set_={"version": _shared_table.c.version + 1}
+    ))
+
+
+def _publish(session: Session) -> None:
+    # A savepoint releasing is not the commit; wait for the outer one
+    if session.in_nested_transaction():
+        return
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        bump_tables(changed)
+
+
+def _discard(session: Session, *args) -> None:
+    # Rolling back a savepoint keeps the outer transaction's writes pending
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_write_tracking(session_class=Session, version_engine: Optional[Engine] = None) -> None:
+    """Bump table versions whenever an ORM session commits writes to them
+
+    Covers unit-of-work flushes and bulk query().update()/delete(). The
+    in-process version moves after commit; the shared version in the
+    table_versions table moves inside the same transaction, and is read
+    back through `version_engine`. Writes made through a raw connection
+    are not seen and need bump_tables().
+    """
+    global _version_engine
+    if version_engine is not None:
+        _version_engine = version_engine
+    if event.contains(session_class, "after_commit", _publish):
+        return
+    event.listen(session_class, "before_flush", _record_flush)
+    event.listen(session_class, "do_orm_execute", _record_bulk)
+    event.listen(session_class, "before_commit", _bump_shared)
+    event.listen(session_class, "after_commit", _publish)
+    event.listen(session_class, "after_rollback", _discard)
+
+
+class VersionedCache:
+    """In-process cache whose entries expire when any of its tables change
+
+    Entries are keyed by the caller's key plus the tables' versions, so a
+    commit invalidates them without an explicit delete. A commit in this
+    process counts at once; one in another worker counts once the shared
+    versions are next read, within CACHE_VERSION_CHECK_SECONDS. Each worker
+    process keeps its own copy.
+    """
+
+    def __init__(self, name: str, tables: Iterable[str]):
+        self.name = name
+        self.tables = tuple(tables)
+        self._entries: Dict[Hashable, Tuple[Tuple[int, ...], Any]] = {}
+        self._lock = threading.Lock()
+        _watched.update(self.tables)
+
+    def version(self) -> Tuple[int, ...]:
+        return table_versions(*self.tables) + shared_versions(*self.tables)
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it if missing or stale"""
+        version = self.version()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        value = compute()
+        with self._lock:
+            # A write that landed while computing leaves the entry stale for the next reader
+            self._entries[key] = (version, value)
+        logger.debug(f"Cache {self.name} rebuilt {key!r} at version {version}")
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RenderedJSON(NamedTuple):
+    """A serialized response body and its strong ETag"""
+    body: bytes
+    etag: str
+
+
+def render_json(data: Any) -> RenderedJSON:
+    """Serialize once and tag with a hash of the bytes
+
+    Cache versions differ between workers, so the ETag comes from the
+    content and every worker hands out the same tag for the same body.
+    """
+    body = json.dumps(jsonable_encoder(data)).encode()
+    return RenderedJSON(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
@@ -21,6 +21,16 @@ class Settings(BaseSettings):
     
     # SQLite settings (for development)
     SQLITE_DB_PATH: str = "secureattend.db"
+    # SQLite tuning profile, applied to every new connection
+    SQLITE_TUNING_ENABLED: bool = True  # False keeps SQLite's defaults (rollback journal, full fsync)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers no longer block the writer, nor the writer readers
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # With WAL a crash can lose the last commits but never corrupts
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # How long a writer waits for the lock before "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection
+    SQLITE_MMAP_SIZE_MB: int = 256  # Memory-mapped reads; 0 disables
+    SQLITE_TEMP_STORE_MEMORY: bool = True  # Sorts and temp indexes in memory instead of temp files
+    SQLITE_READ_POOL_SIZE: int = 8  # Read-only connections for GET routes and job reads; 0 shares one pool for reads and writes
+    SQLITE_WRITE_QUEUE_TIMEOUT_SECONDS: float = 30.0  # How long a write waits its turn for the single writer connection
     
     # PostgreSQL settings (for production)
     POSTGRES_SERVER: Optional[str] = "localhost"
@@ -28,10 +38,45 @@ class Settings(BaseSettings):
     POSTGRES_USER: Optional[str] = "postgres"
     POSTGRES_PASSWORD: Optional[str] = "password"
     POSTGRES_DB: Optional[str] = "secureattend"
+    POSTGRES_POOL_SIZE: int = 10  # Connections each worker keeps open
+    POSTGRES_MAX_OVERFLOW: int = 20  # Extra connections allowed at peaks such as class start
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 10.0  # Wait for a free connection before answering 503
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 1800  # Reopen connections older than this; -1 never
+    POSTGRES_POOL_PRE_PING: bool = True  # Check connections on checkout so dropped ones are replaced
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 30000  # Server-side limit per statement; 0 disables
     
     # QR code configuration
     QR_CODE_STORAGE_PATH: str = "static/qr_codes"
     QR_CODE_EXPIRY_MINUTES: int = 15
+    # Attendance percentage below which a student is flagged
+    ATTENDANCE_THRESHOLD_PERCENT: float = 75.0
+    # Background jobs
+    BACKGROUND_JOBS_ENABLED: bool = True
+    ROLLUP_REFRESH_SECONDS: int = 300  # 0 disables the rollup refresher
+    ROLLUP_LAG_SECONDS: int = 60  # Marks younger than this wait for the next run
+    ANOMALY_SCAN_SECONDS: int = 900  # 0 disables the proxy-attendance scanner
+    ANOMALY_BURST_SECONDS: float = 0.25  # Burst gap for sessions too small to score against their own pace
+    ANOMALY_SCORE_THRESHOLD: float = 3.5  # Robust z-score above which a late mark is flagged
+    # Monthly attendance partitions (PostgreSQL only)
+    ATTENDANCE_PARTITION_MONTHS_AHEAD: int = 3  # Future months kept ready for inserts
+    ATTENDANCE_PARTITION_JOB_SECONDS: int = 86400  # 0 disables partition maintenance
+    # Parquet archive of old sessions and their marks
+    ARCHIVE_PATH: str = "archive"
+    ARCHIVE_AFTER_DAYS: int = 365  # Finished sessions older than this are archived
+    ARCHIVE_BATCH_SESSIONS: int = 200  # Sessions written and deleted per transaction
+    ARCHIVE_JOB_SECONDS: int = 0  # 0 disables the archiver; run manage.py archive-sessions instead
+    # Sessions opened and closed automatically from the timetable
+    TIMETABLE_TIMEZONE: str = "UTC"  # Zone the assignment time slots are written in
+    SCHEDULER_INTERVAL_SECONDS: int = 0  # 0 disables automatic sessions from the timetable
+    SCHEDULER_LEAD_MINUTES: int = 10  # Sessions open this long before their slot starts
+    SCHEDULER_SPREAD_SECONDS: int = 300  # Openings are spread over this much of the lead time
+    SCHEDULER_BATCH_SIZE: int = 50  # Sessions opened or closed per transaction
+    SCHEDULER_END_GRACE_MINUTES: int = 5  # Scheduled sessions close this long after their slot ends
+    ROSTER_CACHE_ENABLED: bool = False  # Keep course rosters in memory for absentee lists
+    CACHE_VERSION_CHECK_SECONDS: float = 1.0  # In-memory caches pick up other workers' writes this often; negative never (single worker)
+    HEADCOUNT_RESYNC_SECONDS: int = 60  # Live headcounts re-read COUNT(*) this often to catch other workers' marks; 0 never
+    HEADCOUNT_CONFIRM_MARGIN: int = 5  # Marks re-read COUNT(*) first when this few places are left in the room
+    
     # Admin user
     ADMIN_EMAIL: str = "admin@secureattend.com"
     ADMIN_PASSWORD: str = "secureadmin"
@@ -0,0 +1,76 @@
+# app/core/jobs.py
+import logging
+import random
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Run a function every `interval_seconds` on a daemon thread
+
+    Failures are logged and the job keeps its schedule. `jitter_seconds`
+    spreads runs so several workers don't fire at the same instant.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], object],
+        jitter_seconds: float = 0
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.jitter_seconds = jitter_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> None:
+        try:
+            self.func()
+        except Exception as e:
+            logger.error(f"Background job {self.name} failed: {str(e)}", exc_info=True)
+
+    def _loop(self) -> None:
+        logger.info(f"Background job {self.name} started (every {self.interval_seconds}s)")
+        while not self._stop.wait(self.interval_seconds + random.uniform(0, self.jitter_seconds)):
+            self.run_once()
+        logger.info(f"Background job {self.name} stopped")
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+_jobs: Dict[str, PeriodicJob] = {}
+
+
+def register_job(job: PeriodicJob) -> PeriodicJob:
+    """Add a job to be started with the application"""
+    _jobs[job.name] = job
+    return job
+
+
+def registered_jobs() -> List[PeriodicJob]:
+    return list(_jobs.values())
+
+
+def start_jobs() -> None:
+    for job in _jobs.values():
+        job.start()
+
+
+def stop_jobs() -> None:
+    for job in _jobs.values():
+        job.stop()
@@ -0,0 +1,88 @@
+# app/core/timetable.py
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MINUTES_PER_DAY = 24 * 60
+
+_TIME = re.compile(r"^\s*(\d{1,2})(?:[:.](\d{2}))?\s*([ap]\.?m\.?)?\s*$", re.IGNORECASE)
+_RANGE_SEPARATOR = re.compile(r"\s*(?:-|–|—|\bto\b)\s*", re.IGNORECASE)
+
+
+def term_for(when: Optional[datetime]) -> str:
+    """Academic term a session belongs to: January-June is spring, July-December autumn"""
+    if when is None:
+        return "unknown"
+    return f"{when.year}-{'spring' if when.month <= 6 else 'autumn'}"
+
+
+def parse_weekday(value: str) -> int:
+    """Weekday number (Monday is 0) from a full or three-letter day name"""
+    name = value.strip().lower()
+    for number, day in enumerate(WEEKDAYS):
+        if name == day.lower() or (len(name) >= 3 and day.lower().startswith(name)):
+            return number
+    raise ValueError(f"Unknown day: {value}")
+
+
+def parse_days(value: Optional[str]) -> List[int]:
+    """Sorted, de-duplicated weekday numbers from a comma-separated day list"""
+    if not value or not value.strip():
+        return []
+    return sorted({parse_weekday(day) for day in value.split(",") if day.strip()})
+
+
+def parse_time(value: str, meridiem: Optional[str] = None) -> int:
+    """Minutes since midnight from 24-hour "13:30" or 12-hour "1:30 PM" text
+
+    `meridiem` applies when the value itself has none, so "10-11 AM" works.
+    """
+    match = _TIME.match(value)
+    if not match:
+        raise ValueError(f"Unrecognised time: {value}")
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    suffix = (match.group(3) or meridiem or "").lower().replace(".", "")
+    if suffix:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"Unrecognised time: {value}")
+        hour = hour % 12 + (12 if suffix == "pm" else 0)
+    if hour > 23 or minute > 59:
+        raise ValueError(f"Unrecognised time: {value}")
+    return hour * 60 + minute
+
+
+def parse_time_slot(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(start, end) minutes since midnight from text such as "10:00 AM - 11:30 AM"
+
+    Returns None for an empty slot and raises ValueError if it cannot be read
+    or does not end after it starts.
+    """
+    if not value or not value.strip():
+        return None
+    parts = _RANGE_SEPARATOR.split(value.strip())
+    if len(parts) != 2:
+        raise ValueError(f"Time slot should look like 10:00-11:30: {value}")
+    end_match = _TIME.match(parts[1])
+    end_meridiem = end_match.group(3) if end_match else None
+    start, end = parse_time(parts[0], meridiem=end_meridiem), parse_time(parts[1])
+    if end <= start:
+        raise ValueError(f"Time slot must end after it starts: {value}")
+    return start, end
+
+
+def parse_schedule(day_of_week: Optional[str], time_slot: Optional[str]) -> List[Tuple[int, int, int]]:
+    """(weekday, start minute, end minute) for every day of a recurring slot
+
+    Assignments missing either the days or the time are unscheduled and
+    have no slots.
+    """
+    days = parse_days(day_of_week)
+    slot = parse_time_slot(time_slot)
+    if not days or slot is None:
+        return []
+    return [(day, slot[0], slot[1]) for day in days]
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
@@ -8,4 +8,10 @@ from app.models.course import Course
 from app.models.room import Room
 from app.models.session import Session
 from app.models.attendance import Attendance
-from app.models.assignment import Assignment  # Fixed import
\ No newline at end of file
+from app.models.enrollment import Enrollment
+from app.models.assignment import Assignment, AssignmentSlot  # Fixed import
+from app.models.rollup import (
+    CourseDailyAttendance, StudentMonthlyAttendance, RollupState, CourseSessionCounter, StudentCourseCounter
+)
+from app.models.anomaly import AttendanceAnomaly
+from app.models.table_version import TableVersion
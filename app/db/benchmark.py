@@ -0,0 +1,94 @@
+# app/db/benchmark.py
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User, UserRole
+
+
+def _remove_database(path: str) -> None:
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def run_mark_benchmark(path: str, tuned: bool, workers: int = 8, marks: int = 2000) -> Dict[str, Any]:
+    """Mark attendance from `workers` threads at once into a fresh SQLite file
+
+    Every mark goes through AttendanceService.create_attendance, so it is
+    the same insert, counter upsert and commit as a real QR mark. Marks
+    that fail (usually "database is locked") are counted, not retried.
+    """
+    from app.services.attendance import AttendanceService
+
+    _remove_database(path)
+    engine = create_db_engine(f"sqlite:///{path}", sqlite_tuning=tuned)
+    try:
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        faculty_id, session_id = str(uuid.uuid4()), str(uuid.uuid4())
+        students = [str(uuid.uuid4()) for _ in range(marks)]
+        with factory() as db:
+            db.add(User(
+                id=faculty_id, email="bench_faculty@bench.local", full_name="Bench Faculty",
+                hashed_password="-", role=UserRole.FACULTY, is_active=True
+            ))
+            db.add(SessionModel(
+                id=session_id, faculty_id=faculty_id, course_code="BENCH", status=SessionStatus.ACTIVE,
+                start_time=datetime.utcnow()
+            ))
+            db.execute(insert(User.__table__), [
+                {
+                    "id": student_id, "email": f"bench{i}@bench.local", "full_name": f"Bench Student {i}",
+                    "hashed_password": "-", "role": UserRole.STUDENT.value, "is_active": True
+                }
+                for i, student_id in enumerate(students)
+            ])
+            db.commit()
+
+        failed: List[int] = []
+        start = threading.Barrier(workers + 1)
+
+        def mark(chunk: List[str]) -> None:
+            errors = 0
+            start.wait()
+            for student_id in chunk:
+                db = factory()
+                try:
+                    if AttendanceService(db).create_attendance(student_id, session_id, {"qr": True}, "BENCH") is None:
+                        errors += 1
+                finally:
+                    db.close()
+            failed.append(errors)
+
+        threads = [threading.Thread(target=mark, args=(students[i::workers],)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - began
+    finally:
+        engine.dispose()
+        _remove_database(path)
+
+    errors = sum(failed)
+    return {
+        "profile": "tuned" if tuned else "default",
+        "workers": workers,
+        "marked": marks - errors,
+        "failed": errors,
+        "seconds": round(seconds, 3),
+        "marks_per_second": round((marks - errors) / seconds, 1) if seconds else 0.0
+    }
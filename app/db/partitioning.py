@@ -0,0 +1,164 @@
+# app/db/partitioning.py
+import logging
+import re
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = "attendance"
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{PARTITIONED_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(when: date) -> date:
+    return date(when.year, when.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the attendance partition holding marks from the given month"""
+    return f"{PARTITIONED_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Reverse partition_name, or None for the default partition and foreign tables"""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """True when attendance is a declaratively partitioned PostgreSQL table"""
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": PARTITIONED_TABLE}
+    ).scalar())
+
+
+def list_partitions(conn: Connection) -> List[str]:
+    """Attached monthly partitions, oldest first"""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": PARTITIONED_TABLE}
+    ).scalars()
+    return sorted(name for name in rows if partition_month(name) is not None)
+
+
+def create_month_partition(conn: Connection, month: date, move_strays: bool = False) -> bool:
+    """Create the partition for one month, returning False if it was not created
+
+    Months are meant to be created ahead of their marks. If marks for the
+    month already landed in the default partition, PostgreSQL refuses the
+    new partition, and moving them means detaching the default partition,
+    which blocks every attendance query while it runs. That is only done
+    with `move_strays`, from a maintenance window; otherwise the month is
+    skipped with a warning and its marks stay in the default partition.
+    """
+    month = month_start(month)
+    name = partition_name(month)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        return False
+
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    strays = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE marked_at >= :lower AND marked_at < :upper)"),
+        {"lower": lower, "upper": upper}
+    ).scalar()
+    if not strays:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} {bounds}"))
+    elif not move_strays:
+        logger.warning(
+            f"Marks for {lower[:7]} are in {DEFAULT_PARTITION}; run partitions-ensure --move-strays "
+            f"in a maintenance window to create {name}"
+        )
+        return False
+    else:
+        conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} {bounds}"))
+        conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE marked_at >= :lower AND marked_at < :upper RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"lower": lower, "upper": upper}
+        )
+        conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.info(f"Created attendance partition {name}")
+    return True
+
+
+def ensure_partitions(
+    conn: Connection,
+    now: Optional[datetime] = None,
+    months_ahead: Optional[int] = None,
+    since: Optional[date] = None,
+    move_strays: bool = False
+) -> List[str]:
+    """Make sure the default partition and every month from `since` (default: this
+    month) to `months_ahead` months from now exist. Returns the partitions created.
+
+    See create_month_partition for `move_strays`; the background job never sets it.
+    """
+    months_ahead = settings.ATTENDANCE_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARTITIONED_TABLE} DEFAULT"))
+
+    current = month_start((now or datetime.utcnow()).date())
+    month = month_start(since) if since else current
+    last = add_months(current, months_ahead)
+    created = []
+    while month <= last:
+        if create_month_partition(conn, month, move_strays=move_strays):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def detach_partitions(conn: Connection, before: date) -> List[str]:
+    """Detach monthly partitions that end on or before `before`
+
+    Detached partitions become ordinary tables with the same name, ready to
+    be dumped or dropped; their marks no longer appear in attendance queries.
+    """
+    detached = []
+    for name in list_partitions(conn):
+        if add_months(partition_month(name), 1) <= before:
+            conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+            logger.info(f"Detached attendance partition {name}")
+    return detached
+
+
+def create_initial_partitions(target, connection: Connection, **kw) -> None:
+    """after_create hook so create_all() leaves a partitioned table ready for inserts
+
+    Skipped when DDL is only being rendered through a mock engine.
+    """
+    if connection.dialect.name == "postgresql" and isinstance(connection, Connection):
+        ensure_partitions(connection)
+
+
+def maintain_partitions() -> None:
+    """Entry point for the background job"""
+    from app.db.session import engine
+
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            ensure_partitions(conn)
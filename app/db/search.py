@@ -0,0 +1,133 @@
+# app/db/search.py
+import logging
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "user_search"
+SEARCH_COLUMNS = ("full_name", "email", "roll_number")
+# Both indexes look terms up by trigram, so shorter terms fall back to a prefix match
+MIN_INDEXED_LENGTH = 3
+
+_search_table = table(SEARCH_TABLE, column("rowid"), column(SEARCH_TABLE))
+_TRIGGERS = {f"{SEARCH_TABLE}_{suffix}" for suffix in ("ai", "ad", "au")}
+# Databases known to have the FTS5 table
+_installed = set()
+
+# External-content FTS5 table over the user rows, kept in step by triggers
+_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"{', '.join(SEARCH_COLUMNS)}, content='user', content_rowid='rowid', tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, full_name, email, roll_number)
+        VALUES (new.rowid, new.full_name, new.email, new.roll_number);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, full_name, email, roll_number)
+        VALUES ('delete', old.rowid, old.full_name, old.email, old.roll_number);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF full_name, email, roll_number ON "user" BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, full_name, email, roll_number)
+        VALUES ('delete', old.rowid, old.full_name, old.email, old.roll_number);
+        INSERT INTO {SEARCH_TABLE}(rowid, full_name, email, roll_number)
+        VALUES (new.rowid, new.full_name, new.email, new.roll_number);
+    END""",
+)
+
+_POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *(
+        f'CREATE INDEX IF NOT EXISTS ix_user_{name}_trgm ON "user" USING gin ({name} gin_trgm_ops)'
+        for name in SEARCH_COLUMNS
+    ),
+)
+
+
+def install_user_search(conn: Connection) -> None:
+    """Create the user search index: FTS5 on SQLite, trigram GIN indexes on PostgreSQL"""
+    statements = {"sqlite": _SQLITE_DDL, "postgresql": _POSTGRES_DDL}.get(conn.dialect.name, ())
+    for statement in statements:
+        conn.execute(text(statement))
+    if conn.dialect.name == "sqlite":
+        rebuild_user_search(conn)
+
+
+def rebuild_user_search(conn: Connection) -> bool:
+    """Re-read every user into the SQLite FTS5 table
+
+    Needed after VACUUM, which may renumber the rowids the index points
+    at. PostgreSQL indexes maintain themselves, so this returns False there.
+    """
+    if not has_user_search(conn):
+        return False
+    conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+    logger.info("Rebuilt user search index")
+    return True
+
+
+def user_search_in_sync(conn: Connection) -> bool:
+    """True when the FTS5 table still points at the user rowids and its triggers exist
+
+    The index is keyed by rowid, which "user" does not declare, so VACUUM
+    or a migration that copies the table may renumber the rows; a copy
+    also drops the triggers. Renumbering closes the gaps left by deletes,
+    which shows as a different row count or highest rowid.
+    """
+    users = conn.execute(text('SELECT COUNT(*), MAX(rowid) FROM "user"')).one()
+    indexed = conn.execute(text(f"SELECT COUNT(*), MAX(id) FROM {SEARCH_TABLE}_docsize")).one()
+    triggers = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars())
+    return tuple(users) == tuple(indexed) and _TRIGGERS <= triggers
+
+
+def sync_user_search(conn: Connection) -> bool:
+    """Re-install the SQLite index if it no longer matches the user table; True if it did"""
+    if not has_user_search(conn) or user_search_in_sync(conn):
+        return False
+    logger.warning("User search index is out of step with the user table, re-indexing")
+    install_user_search(conn)
+    return True
+
+
+def check_user_search() -> None:
+    """Startup hook, repairing the index after a VACUUM or table copy made while the app was down"""
+    from app.db.session import engine
+
+    with engine.begin() as conn:
+        sync_user_search(conn)
+
+
+def has_user_search(conn: Connection) -> bool:
+    """True when the SQLite FTS5 table exists; only a positive answer is remembered"""
+    if conn.dialect.name != "sqlite":
+        return False
+    url = str(conn.engine.url)
+    if url not in _installed:
+        if conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+        ).scalar():
+            _installed.add(url)
+    return url in _installed
+
+
+def search_rowids(term: str):
+    """SELECT of the user rowids whose name, email or roll number contains `term`, via FTS5"""
+    phrase = '"' + term.replace('"', '""') + '"'
+    return select(_search_table.c.rowid).where(_search_table.c[SEARCH_TABLE].match(phrase))
+
+
+def create_user_search(target, connection: Connection, **kw) -> None:
+    """after_create hook so create_all() leaves the search index in place
+
+    Skipped when DDL is only being rendered through a mock engine.
+    """
+    if isinstance(connection, Connection):
+        install_user_search(connection)
+
+
+def drop_user_search(target, connection: Connection, **kw) -> None:
+    """before_drop hook; the triggers go with the user table but the FTS5 table would not"""
+    if connection.dialect.name == "sqlite" and isinstance(connection, Connection):
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+        _installed.discard(str(connection.engine.url))
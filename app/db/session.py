@@ -1,25 +1,123 @@
 # app/db/session.py
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.cache import install_write_tracking
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.sqlite import install_immediate_transactions, install_read_only, install_sqlite_tuning
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+def postgres_engine_options() -> Dict[str, Any]:
+    """create_engine arguments for the PostgreSQL pool and statement timeout settings"""
+    options = {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
+    if settings.POSTGRES_STATEMENT_TIMEOUT_MS > 0:
+        # Set per connection at startup, so it costs no extra round trip
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.POSTGRES_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def create_db_engine(url: Optional[str] = None, sqlite_tuning: Optional[bool] = None, **options: Any):
+    """Engine for the configured database, with the SQLite tuning profile when enabled
+
+    Extra keyword arguments (pool sizes and the like) go to create_engine.
+    """
+    url = url or settings.DATABASE_URI
+    if not url.startswith("sqlite"):
+        return create_engine(url, **{**postgres_engine_options(), **options})
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # SQLite-specific
+        **options
+    )
+    if settings.SQLITE_TUNING_ENABLED if sqlite_tuning is None else sqlite_tuning:
+        install_sqlite_tuning(engine)
+    return engine
+
+
+def create_engines(url: str) -> Tuple[Engine, Engine]:
+    """Writer and reader engines, which are one and the same unless SQLite reads are split off
+
+    SQLite allows one writer at a time. With SQLITE_READ_POOL_SIZE set,
+    writes get a single connection whose pool queues them in order, and
+    reads get a pool of read-only connections that WAL lets run alongside.
+    """
+    if not url.startswith("sqlite") or settings.SQLITE_READ_POOL_SIZE <= 0:
+        engine = create_db_engine(url)
+        return engine, engine
+
+    writer = create_db_engine(
+        url,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITE_QUEUE_TIMEOUT_SECONDS
+    )
+    install_immediate_transactions(writer)
+    reader = create_db_engine(url, pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0)
+    install_read_only(reader)
+    return writer, reader
+
 
-# Create SQLite engine
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URI
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # SQLite-specific
-)
+engine, read_engine = create_engines(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sessions for read-only work; the same as SessionLocal unless SQLite reads are split off
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+# Commits bump per-table versions that in-process caches key on; the shared
+# copy other workers write is read through the reader
+install_write_tracking(version_engine=read_engine)
 
 Base = declarative_base()
 
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Live checked-in, checked-out and overflow counts of each connection pool in this worker"""
+    engines = [("default", engine)] if engine is read_engine else [("writer", engine), ("reader", read_engine)]
+    stats = []
+    for name, pooled in engines:
+        pool = pooled.pool
+        # Only QueuePool keeps these counts; other pool classes report the class alone
+        counts = hasattr(pool, "checkedout")
+        stats.append({
+            "name": name,
+            "pool": type(pool).__name__,
+            "size": pool.size() if counts else None,
+            "checked_in": pool.checkedin() if counts else None,
+            "checked_out": pool.checkedout() if counts else None,
+            # QueuePool counts overflow from -size, negative until the pool is full
+            "overflow": max(0, pool.overflow()) if counts else None,
+            "timeout": pool.timeout() if counts else None
+        })
+    return stats
+
+
+def uses_reader(request: Request) -> bool:
+    """Whether the matched route only reads: GET or HEAD
+
+    No GET route writes; one that needs to must become a POST.
+    """
+    route = request.scope.get("route")
+    if route is None or not getattr(route, "methods", None):
+        return False
+    return route.methods <= READ_METHODS
+
+
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    db = (ReadSessionLocal if uses_reader(request) else SessionLocal)()
     try:
         yield db
     finally:
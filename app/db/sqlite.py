@@ -0,0 +1,80 @@
+# app/db/sqlite.py
+import logging
+from typing import List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def tuning_pragmas() -> List[Tuple[str, str]]:
+    """PRAGMA name and value pairs of the configured SQLite tuning profile"""
+    pragmas = [
+        ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+        ("busy_timeout", str(settings.SQLITE_BUSY_TIMEOUT_MS)),
+        # A negative cache_size is in KiB rather than pages
+        ("cache_size", str(-settings.SQLITE_CACHE_SIZE_KB)),
+        ("mmap_size", str(settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024)),
+    ]
+    if settings.SQLITE_TEMP_STORE_MEMORY:
+        pragmas.append(("temp_store", "MEMORY"))
+    return pragmas
+
+
+def _apply_tuning(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in tuning_pragmas():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_tuning(engine: Engine) -> None:
+    """Apply the tuning profile to each connection the engine opens
+
+    journal_mode=WAL is stored in the database file, the other pragmas only
+    last as long as the connection. In-memory databases ignore WAL.
+    """
+    if not event.contains(engine, "connect", _apply_tuning):
+        event.listen(engine, "connect", _apply_tuning)
+    logger.debug(f"SQLite tuning: {', '.join(f'{name}={value}' for name, value in tuning_pragmas())}")
+
+
+def _read_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def install_read_only(engine: Engine) -> None:
+    """Refuse writes on every connection of a reader engine"""
+    if not event.contains(engine, "connect", _read_only):
+        event.listen(engine, "connect", _read_only)
+
+
+def _manual_transactions(dbapi_connection, connection_record) -> None:
+    # Stop pysqlite issuing its own deferred BEGIN, so the begin hook below decides
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(conn) -> None:
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def install_immediate_transactions(engine: Engine) -> None:
+    """Start every transaction with BEGIN IMMEDIATE
+
+    A deferred transaction that reads and then writes cannot wait for the
+    write lock, it fails at once with "database is locked". Taking the lock
+    up front lets busy_timeout queue writers from other processes instead.
+    """
+    if not event.contains(engine, "connect", _manual_transactions):
+        event.listen(engine, "connect", _manual_transactions)
+        event.listen(engine, "begin", _begin_immediate)
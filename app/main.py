@@ -5,9 +5,17 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.middleware.cors import CORSMiddleware
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.jobs import PeriodicJob, register_job, start_jobs, stop_jobs
+from app.db.partitioning import maintain_partitions
+from app.db.search import check_user_search
+from app.services.rollup import refresh_rollups
+from app.services.anomaly import scan_anomalies
+from app.services.archive import archive_old_sessions
+from app.services.scheduler import run_scheduler
 
 # Create FastAPI app
 app = FastAPI(
@@ -38,6 +46,57 @@ os.makedirs("static/qr_codes", exist_ok=True)
 # Set up Jinja2 templates
 templates = Jinja2Templates(directory="templates")
 
+# Background jobs
+if settings.BACKGROUND_JOBS_ENABLED and settings.ROLLUP_REFRESH_SECONDS > 0:
+    register_job(PeriodicJob(
+        "attendance-rollups",
+        settings.ROLLUP_REFRESH_SECONDS,
+        refresh_rollups,
+        jitter_seconds=settings.ROLLUP_REFRESH_SECONDS * 0.1
+    ))
+if settings.BACKGROUND_JOBS_ENABLED and settings.ANOMALY_SCAN_SECONDS > 0:
+    register_job(PeriodicJob(
+        "attendance-anomalies",
+        settings.ANOMALY_SCAN_SECONDS,
+        scan_anomalies,
+        jitter_seconds=settings.ANOMALY_SCAN_SECONDS * 0.1
+    ))
+if (settings.BACKGROUND_JOBS_ENABLED and settings.DATABASE_TYPE == "postgresql"
+        and settings.ATTENDANCE_PARTITION_JOB_SECONDS > 0):
+    register_job(PeriodicJob(
+        "attendance-partitions",
+        settings.ATTENDANCE_PARTITION_JOB_SECONDS,
+        maintain_partitions,
+        jitter_seconds=settings.ATTENDANCE_PARTITION_JOB_SECONDS * 0.1
+    ))
+if settings.BACKGROUND_JOBS_ENABLED and settings.ARCHIVE_JOB_SECONDS > 0:
+    register_job(PeriodicJob(
+        "session-archiver",
+        settings.ARCHIVE_JOB_SECONDS,
+        archive_old_sessions,
+        jitter_seconds=settings.ARCHIVE_JOB_SECONDS * 0.1
+    ))
+if settings.BACKGROUND_JOBS_ENABLED and settings.SCHEDULER_INTERVAL_SECONDS > 0:
+    register_job(PeriodicJob(
+        "session-scheduler",
+        settings.SCHEDULER_INTERVAL_SECONDS,
+        run_scheduler,
+        jitter_seconds=settings.SCHEDULER_INTERVAL_SECONDS * 0.1
+    ))
+
+@app.on_event("startup")
+def start_background_jobs():
+    start_jobs()
+
+@app.on_event("startup")
+def repair_user_search():
+    if settings.DATABASE_TYPE == "sqlite":
+        check_user_search()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    stop_jobs()
+
 # Health check endpoint
 @app.get("/health")
 def health_check():
@@ -48,6 +107,15 @@ def health_check():
 def admin_dashboard(request: Request):
     return templates.TemplateResponse("admin/dashboard.html", {"request": request})
 
+# A request that waited its whole pool timeout for a connection can be retried shortly
+@app.exception_handler(PoolTimeoutError)
+def handle_pool_timeout(request: Request, exc: PoolTimeoutError):
+    return JSONResponse(
+        status_code=503,
+        content={"message": "Database busy, try again", "detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
 # Error handler for exceptions
 @app.exception_handler(Exception)
 def handle_exception(request: Request, exc: Exception):
@@ -5,4 +5,10 @@ from app.models.course import Course
 from app.models.room import Room
 from app.models.session import Session, SessionStatus
 from app.models.attendance import Attendance
-from app.models.assignment import Assignment  # This line is important
\ No newline at end of file
+from app.models.enrollment import Enrollment
+from app.models.assignment import Assignment, AssignmentSlot  # This line is important
+from app.models.rollup import (
+    CourseDailyAttendance, StudentMonthlyAttendance, RollupState, CourseSessionCounter, StudentCourseCounter
+)
+from app.models.anomaly import AttendanceAnomaly
+from app.models.table_version import TableVersion
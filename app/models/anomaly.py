@@ -0,0 +1,44 @@
+# app/models/anomaly.py
+import uuid
+from datetime import datetime
+from enum import Enum, IntFlag
+from typing import List
+from sqlalchemy import (
+    Column, String, DateTime, Integer, Float, JSON, ForeignKey, ForeignKeyConstraint, Index, Enum as SQLEnum
+)
+from app.db.base_class import Base
+
+class AnomalyReason(IntFlag):
+    BURST = 1  # Marked within a burst of near-simultaneous marks
+    IDENTICAL_FACTORS = 2  # Burst neighbour has the exact same factor set
+    LATE = 4  # Marked far later than the rest of the session
+
+class AnomalyStatus(str, Enum):
+    OPEN = "OPEN"
+    CONFIRMED = "CONFIRMED"
+    DISMISSED = "DISMISSED"
+
+class AttendanceAnomaly(Base):
+    __tablename__ = "attendance_anomaly"
+    __table_args__ = (
+        Index("ix_attendance_anomaly_status_score", "status", "score"),
+        Index("ix_attendance_anomaly_session", "session_id"),
+        # A partitioned attendance table has no key on id alone to reference
+        ForeignKeyConstraint(["attendance_id"], ["attendance.id"], ondelete="CASCADE").ddl_if(dialect="sqlite"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    attendance_id = Column(String(36), unique=True, nullable=False)
+    session_id = Column(String(36), ForeignKey("session.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(String(36), nullable=False)
+    reasons = Column(Integer, nullable=False, default=0)  # AnomalyReason bits
+    score = Column(Float, nullable=False, default=0.0)  # Robust z-score, higher is more suspicious
+    details = Column(JSON, nullable=True)
+    status = Column(SQLEnum(AnomalyStatus), nullable=False, default=AnomalyStatus.OPEN)
+    detected_at = Column(DateTime, default=datetime.utcnow)
+    reviewed_by = Column(String(36), nullable=True)
+    reviewed_at = Column(DateTime, nullable=True)
+    
+    @property
+    def reason_names(self) -> List[str]:
+        return [reason.name.lower() for reason in AnomalyReason if (self.reasons or 0) & reason]
@@ -1,7 +1,7 @@
 # app/models/assignment.py
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Integer, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -9,7 +9,7 @@ class Assignment(Base):
     __tablename__ = "assignments"
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    faculty_id = Column(String(36), ForeignKey("user.id"), nullable=False)
+    faculty_id = Column(String(36), ForeignKey("user.id"), nullable=False, index=True)
     course_id = Column(String(36), ForeignKey("courses.id"), nullable=False)
     room_id = Column(String(36), ForeignKey("rooms.id"), nullable=False)
     day_of_week = Column(String, nullable=True)  # For recurring schedules
@@ -21,4 +21,21 @@ class Assignment(Base):
     # Relationships
     faculty = relationship("User", back_populates="assignments", foreign_keys=[faculty_id])
     course = relationship("Course", back_populates="assignments")
-    room = relationship("Room", back_populates="assignments")
\ No newline at end of file
+    room = relationship("Room", back_populates="assignments")
+    slots = relationship("AssignmentSlot", back_populates="assignment", cascade="all, delete-orphan")
+
+
+class AssignmentSlot(Base):
+    """One weekly occurrence of an assignment, parsed from day_of_week and time_slot"""
+    __tablename__ = "assignment_slots"
+    __table_args__ = (
+        Index("ix_assignment_slots_weekday_start", "weekday", "start_minute"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    assignment_id = Column(String(36), ForeignKey("assignments.id", ondelete="CASCADE"), nullable=False, index=True)
+    weekday = Column(Integer, nullable=False)  # Monday is 0
+    start_minute = Column(Integer, nullable=False)  # Minutes since midnight
+    end_minute = Column(Integer, nullable=False)
+    
+    assignment = relationship("Assignment", back_populates="slots")
\ No newline at end of file
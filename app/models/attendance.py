@@ -1,19 +1,102 @@
 # app/models/attendance.py
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
+from enum import IntFlag
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import Column, String, DateTime, Integer, JSON, ForeignKey, Index, PrimaryKeyConstraint, event
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.partitioning import create_initial_partitions
+
+class VerificationFactor(IntFlag):
+    QR = 1
+    FACE = 2
+    PROXIMITY = 4
+
+# All factors a mark needs to count as fully verified
+ALL_VERIFICATION_FACTORS = VerificationFactor.QR | VerificationFactor.FACE | VerificationFactor.PROXIMITY
+
+
+def pack_verification_factors(factors: Optional[Dict[str, Any]]) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """Split a factors dict into a bitmask of passed known factors and leftover metadata"""
+    mask = 0
+    extra = {}
+    for key, value in (factors or {}).items():
+        member = VerificationFactor.__members__.get(str(key).upper())
+        if member is not None:
+            if value:
+                mask |= member
+        else:
+            extra[key] = value
+    return int(mask), (extra or None)
+
+
+def unpack_verification_factors(mask: Optional[int], extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Rebuild the factors dict clients send and expect back"""
+    mask = mask or 0
+    factors = {member.name.lower(): bool(mask & member) for member in VerificationFactor}
+    if extra:
+        factors.update(extra)
+    return factors
+
 
 class Attendance(Base):
     __tablename__ = "attendance"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    __table_args__ = (
+        # PostgreSQL partitions by month of marked_at, which every primary or
+        # unique key there has to include
+        PrimaryKeyConstraint("id", "marked_at"),
+        Index("uq_attendance_id", "id", unique=True).ddl_if(dialect="sqlite"),
+        # One mark per student per session; also serves lookups by session.
+        # Partitioned tables can only enforce this per month, so PostgreSQL
+        # gets a plain index and relies on the check in mark_attendance_with_qr,
+        # made under an advisory lock per student and session
+        Index("uq_attendance_session_student", "session_id", "student_id", unique=True).ddl_if(dialect="sqlite"),
+        Index("ix_attendance_session_student", "session_id", "student_id").ddl_if(dialect="postgresql"),
+        Index("ix_attendance_session_marked", "session_id", "marked_at"),
+        # Matches the (marked_at, id) keyset used to page a student's history
+        Index("ix_attendance_student_marked", "student_id", "marked_at", "id"),
+        # Covers per-session factor filters and counts without touching the table
+        Index("ix_attendance_session_verification", "session_id", "verification_mask"),
+        {"postgresql_partition_by": "RANGE (marked_at)"},
+    )
+
+    id = Column(String(36), default=lambda: str(uuid.uuid4()))
     session_id = Column(String(36), ForeignKey("session.id"), nullable=False)
     student_id = Column(String(36), ForeignKey("user.id"), nullable=False)
-    marked_at = Column(DateTime, default=datetime.utcnow)
-    verification_factors = Column(JSON, nullable=True)  # Store verification factors
-    
+    marked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    verification_mask = Column(Integer, nullable=False, default=0)  # VerificationFactor bits that passed
+    verification_metadata = Column(JSON(none_as_null=True), nullable=True)  # Any extra, non-factor verification data
+
+    # Rows are still identified by id alone
+    __mapper_args__ = {"primary_key": [id]}
+
     # Relationships
     session = relationship("Session", back_populates="attendances")
-    student = relationship("User", back_populates="attendances")
\ No newline at end of file
+    student = relationship("User", back_populates="attendances")
+
+    @property
+    def verification_factors(self) -> Dict[str, Any]:
+        return unpack_verification_factors(self.verification_mask, self.verification_metadata)
+
+    @verification_factors.setter
+    def verification_factors(self, factors: Optional[Dict[str, Any]]) -> None:
+        self.verification_mask, self.verification_metadata = pack_verification_factors(factors)
+
+    @property
+    def verification_complete(self) -> bool:
+        return ((self.verification_mask or 0) & ALL_VERIFICATION_FACTORS) == ALL_VERIFICATION_FACTORS
+
+    @classmethod
+    def has_factor(cls, factor: VerificationFactor):
+        """SQL expression that is true when the given factor passed"""
+        return cls.verification_mask.op("&")(int(factor)) != 0
+
+    @classmethod
+    def is_complete(cls):
+        """SQL expression that is true when every factor passed"""
+        return cls.verification_mask.op("&")(int(ALL_VERIFICATION_FACTORS)) == int(ALL_VERIFICATION_FACTORS)
+
+
+# Give a freshly created partitioned table its default and upcoming partitions
+event.listen(Attendance.__table__, "after_create", create_initial_partitions)
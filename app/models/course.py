@@ -16,4 +16,5 @@ class Course(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    assignments = relationship("Assignment", back_populates="course")
\ No newline at end of file
+    assignments = relationship("Assignment", back_populates="course")
+    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,22 @@
+# app/models/enrollment.py
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class Enrollment(Base):
+    """A student on a course's roster"""
+    __tablename__ = "enrollments"
+    __table_args__ = (
+        # Also serves roster lookups by course
+        UniqueConstraint("course_id", "student_id", name="uq_enrollment_course_student"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    course_id = Column(String(36), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    course = relationship("Course", back_populates="enrollments")
+    student = relationship("User")
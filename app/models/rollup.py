@@ -0,0 +1,75 @@
+# app/models/rollup.py
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Date, DateTime, Integer, UniqueConstraint
+from app.db.base_class import Base
+
+class CourseDailyAttendance(Base):
+    __tablename__ = "course_daily_attendance"
+    __table_args__ = (
+        UniqueConstraint("course_code", "day", name="uq_course_daily_attendance"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    course_code = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+    marks = Column(Integer, nullable=False, default=0)
+    complete = Column(Integer, nullable=False, default=0)  # Marks that passed every factor
+    qr = Column(Integer, nullable=False, default=0)
+    face = Column(Integer, nullable=False, default=0)
+    proximity = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class StudentMonthlyAttendance(Base):
+    __tablename__ = "student_monthly_attendance"
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_code", "month", name="uq_student_monthly_attendance"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    student_id = Column(String(36), nullable=False)
+    course_code = Column(String, nullable=False)
+    month = Column(Date, nullable=False)  # First day of the month
+    marks = Column(Integer, nullable=False, default=0)
+    complete = Column(Integer, nullable=False, default=0)
+    qr = Column(Integer, nullable=False, default=0)
+    face = Column(Integer, nullable=False, default=0)
+    proximity = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class RollupState(Base):
+    __tablename__ = "rollup_state"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, unique=True, nullable=False)
+    high_water_mark = Column(DateTime, nullable=True)  # attendance.marked_at already folded in
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class CourseSessionCounter(Base):
+    __tablename__ = "course_session_counter"
+    __table_args__ = (
+        UniqueConstraint("course_code", "term", name="uq_course_session_counter"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    course_code = Column(String, nullable=False)
+    term = Column(String, nullable=False)  # e.g. 2025-spring, from the session's start
+    held = Column(Integer, nullable=False, default=0)  # Sessions ended for the course
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class StudentCourseCounter(Base):
+    __tablename__ = "student_course_counter"
+    __table_args__ = (
+        UniqueConstraint("student_id", "term", "course_code", name="uq_student_course_counter"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    student_id = Column(String(36), nullable=False)
+    course_code = Column(String, nullable=False)
+    term = Column(String, nullable=False)
+    attended = Column(Integer, nullable=False, default=0)  # Sessions the student marked
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
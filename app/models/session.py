@@ -2,7 +2,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -14,6 +14,13 @@ class SessionStatus(str, Enum):
 
 class Session(Base):
     __tablename__ = "session"
+    __table_args__ = (
+        Index("ix_session_faculty_status", "faculty_id", "status"),
+        Index("ix_session_faculty_created", "faculty_id", "created_at"),
+        Index("ix_session_status", "status"),
+        # One scheduled session per assignment slot, however many workers run the scheduler
+        Index("uq_session_assignment_slot", "assignment_id", "scheduled_start", unique=True),
+    )
     
     # Change UUID columns to use String instead
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -25,6 +32,12 @@ class Session(Base):
     end_time = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=False)
     status = Column(SQLEnum(SessionStatus), nullable=True)
+    # Set for sessions the scheduler opened from the timetable
+    assignment_id = Column(
+        String(36), ForeignKey("assignments.id", ondelete="SET NULL", name="fk_session_assignment_id"), nullable=True
+    )
+    scheduled_start = Column(DateTime, nullable=True)
+    scheduled_end = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=True)
     
@@ -0,0 +1,12 @@
+# app/models/table_version.py
+import uuid
+from sqlalchemy import Column, String, Integer
+from app.db.base_class import Base
+
+class TableVersion(Base):
+    """Write counter per cached table, shared by every worker through the database"""
+    __tablename__ = "table_versions"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, unique=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
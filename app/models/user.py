@@ -1,9 +1,10 @@
 # app/models/user.py
 import uuid
 from enum import Enum
-from sqlalchemy import Column, String, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Enum as SQLEnum, Index, event
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.search import create_user_search, drop_user_search
 
 class UserRole(str, Enum):
     ADMIN = "ADMIN"
@@ -18,7 +19,7 @@ class User(Base):
     full_name = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
-    role = Column(SQLEnum(UserRole), nullable=False)
+    role = Column(SQLEnum(UserRole), nullable=False, index=True)
     department = Column(String, nullable=True)  # For faculty
     roll_number = Column(String, nullable=True)  # For students
     
@@ -26,4 +27,15 @@ class User(Base):
     sessions = relationship("Session", back_populates="faculty")
     attendances = relationship("Attendance", back_populates="student")
     # Add the missing relationship
-    assignments = relationship("Assignment", back_populates="faculty", foreign_keys="Assignment.faculty_id")
\ No newline at end of file
+    assignments = relationship("Assignment", back_populates="faculty", foreign_keys="Assignment.faculty_id")
+
+    __table_args__ = (
+        # Keyset order of the user directory, overall and within a role
+        Index("ix_user_full_name_id", "full_name", "id"),
+        Index("ix_user_role_full_name_id", "role", "full_name", "id"),
+    )
+
+
+# Name, email and roll number search index (FTS5 or pg_trgm) alongside the table
+event.listen(User.__table__, "after_create", create_user_search)
+event.listen(User.__table__, "before_drop", drop_user_search)
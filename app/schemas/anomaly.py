@@ -0,0 +1,31 @@
+# app/schemas/anomaly.py
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel
+from app.models.anomaly import AnomalyStatus
+
+class AttendanceAnomaly(BaseModel):
+    id: str
+    attendance_id: str
+    session_id: str
+    student_id: str
+    reason_names: List[str]
+    score: float
+    details: Optional[Dict[str, Any]] = None
+    status: AnomalyStatus
+    detected_at: Optional[datetime] = None
+    reviewed_by: Optional[str] = None
+    reviewed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class AttendanceAnomalyList(BaseModel):
+    anomalies: List[AttendanceAnomaly] = []
+
+class AnomalyReview(BaseModel):
+    status: AnomalyStatus
+
+class AnomalyScanResult(BaseModel):
+    sessions: int
+    flagged: int
@@ -42,4 +42,32 @@ class Assignment(AssignmentBase):
 
 # Schema for list of assignments
 class AssignmentList(BaseModel):
-    assignments: List[Assignment] = []
\ No newline at end of file
+    assignments: List[Assignment] = []
+
+# A booked slot in a free/busy answer
+class BusySlot(BaseModel):
+    assignment_id: str
+    faculty_id: str
+    course_code: Optional[str] = None
+    room_number: Optional[str] = None
+    start: str  # HH:MM
+    end: str
+
+# Free/busy answer for one room or faculty member on one weekday
+class FreeBusy(BaseModel):
+    day: str
+    busy: List[BusySlot] = []
+    free: Optional[bool] = None  # Set when a start and end were asked about
+
+# A slot with the ids needed to prefill a new session
+class ClassSlot(BusySlot):
+    course_id: str
+    course_name: Optional[str] = None
+    room_id: str
+
+# What a room or faculty member is teaching at a moment, and what comes next that day
+class CurrentClass(BaseModel):
+    day: str
+    time: str  # HH:MM in the timetable's time zone
+    current: Optional[ClassSlot] = None
+    next: Optional[ClassSlot] = None
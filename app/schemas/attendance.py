@@ -35,6 +35,10 @@ class AttendanceMarkWithQR(BaseModel):
 
 class AttendanceList(BaseModel):
     attendances: List[Attendance]
+
+class AttendanceHistoryPage(BaseModel):
+    attendances: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page
     
 class AttendanceCreate(BaseModel):
     session_id: str
@@ -42,4 +46,18 @@ class AttendanceCreate(BaseModel):
     verification_factors: Optional[Dict[str, bool]] = None
     
     class Config:
-        from_attributes = True  # Previously orm_mode=True in Pydantic v1
\ No newline at end of file
+        from_attributes = True  # Previously orm_mode=True in Pydantic v1
+
+class CourseAttendancePercentage(BaseModel):
+    course_code: str
+    attended: int
+    held: int
+    percentage: float
+    below_threshold: bool
+
+class AttendancePercentageSummary(BaseModel):
+    student_id: str
+    term: str
+    threshold: float
+    below_threshold: bool
+    courses: List[CourseAttendancePercentage]
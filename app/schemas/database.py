@@ -0,0 +1,15 @@
+# app/schemas/database.py
+from typing import List, Optional
+from pydantic import BaseModel
+
+class PoolStats(BaseModel):
+    name: str  # "default", or "writer"/"reader" when SQLite reads are split off
+    pool: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None  # Connections open beyond size
+    timeout: Optional[float] = None
+
+class PoolStatsList(BaseModel):
+    pools: List[PoolStats]
@@ -0,0 +1,30 @@
+# app/schemas/enrollment.py
+from typing import List, Optional
+from pydantic import BaseModel
+
+# Students to add to a course roster, by any mix of id, roll number and email
+class EnrollmentImport(BaseModel):
+    student_ids: List[str] = []
+    roll_numbers: List[str] = []
+    emails: List[str] = []
+
+class EnrollmentImportResult(BaseModel):
+    enrolled: int
+    already_enrolled: int
+    not_found: List[str] = []  # Ids, roll numbers or emails that matched no student
+
+class RosterStudent(BaseModel):
+    id: str
+    full_name: str
+    email: str
+    roll_number: Optional[str] = None
+
+class CourseRoster(BaseModel):
+    course_code: str
+    students: List[RosterStudent] = []
+
+class SessionAbsentees(BaseModel):
+    session_id: str
+    course_code: str
+    absent: int
+    absentees: List[RosterStudent] = []
@@ -0,0 +1,32 @@
+# app/schemas/overview.py
+from typing import List
+from pydantic import BaseModel
+from app.schemas.assignment import Assignment
+from app.schemas.course import Course
+from app.schemas.room import Room
+from app.schemas.user import User
+
+class OverviewCounts(BaseModel):
+    users: int
+    active_users: int
+    admin_users: int
+    faculty_users: int
+    student_users: int
+    courses: int
+    rooms: int
+    assignments: int
+    active_assignments: int
+
+class FacultyOption(BaseModel):
+    id: str
+    full_name: str
+
+# Everything the admin dashboard needs on load, in one response
+class AdminOverview(BaseModel):
+    counts: OverviewCounts
+    limit: int
+    users: List[User] = []
+    courses: List[Course] = []
+    rooms: List[Room] = []
+    assignments: List[Assignment] = []
+    faculty: List[FacultyOption] = []
@@ -0,0 +1,33 @@
+# app/schemas/report.py
+from typing import List
+from datetime import date
+from pydantic import BaseModel
+
+# Counters shared by every rollup row
+class RollupCounts(BaseModel):
+    marks: int
+    complete: int
+    qr: int
+    face: int
+    proximity: int
+
+class CourseDailyRollup(RollupCounts):
+    course_code: str
+    day: date
+    
+    class Config:
+        from_attributes = True
+
+class StudentMonthlyRollup(RollupCounts):
+    student_id: str
+    course_code: str
+    month: date
+    
+    class Config:
+        from_attributes = True
+
+class CourseDailyRollupList(BaseModel):
+    days: List[CourseDailyRollup] = []
+
+class StudentMonthlyRollupList(BaseModel):
+    months: List[StudentMonthlyRollup] = []
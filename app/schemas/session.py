@@ -56,4 +56,9 @@ class SessionResponse(BaseModel):
     qr_data: Optional[QRCodeResponse] = None
 
 class SessionList(BaseModel):
-    sessions: List[Session]
\ No newline at end of file
+    sessions: List[Session]
+class SessionHeadcount(BaseModel):
+    session_id: str
+    count: int
+    capacity: Optional[int] = None
+    live: bool  # True when read from the in-memory headcount of an active session
@@ -53,4 +53,19 @@ class UserInDB(UserInDBBase):
 
 
 class UserList(BaseModel):
-    users: List[User]
\ No newline at end of file
+    users: List[User]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page
+
+
+# Users picked for a bulk operation; ids and filters narrow it together
+class UserBulkSelection(BaseModel):
+    ids: List[UUID4] = []
+    role: Optional[UserRole] = None
+    department: Optional[str] = None
+    roll_number_prefix: Optional[str] = None
+
+
+class UserBulkResult(BaseModel):
+    updated: int = 0
+    deleted: int = 0
+    kept: int = 0  # Selected users with sessions, marks or assignments, which are not deleted
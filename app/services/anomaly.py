@@ -0,0 +1,297 @@
+# app/services/anomaly.py
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import ReadSessionLocal, SessionLocal
+from app.models.anomaly import AnomalyReason, AnomalyStatus, AttendanceAnomaly
+from app.models.attendance import Attendance
+from app.models.session import Session as SessionModel, SessionStatus
+from app.services.rollup import RollupService
+
+logger = logging.getLogger(__name__)
+
+SCAN_NAME = "attendance_anomalies"
+SCAN_BATCH_SESSIONS = 500
+# Sessions with fewer marks than this are too small for a meaningful median
+MIN_MARKS_FOR_STATS = 5
+# Scales a median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+# Smallest spread assumed for log inter-arrival gaps. A queue of students is
+# never steadier than about +/-25% of its pace, and a perfectly regular
+# session still needs a scale to measure an outlying gap against
+MIN_LOG_GAP_MAD = 0.25
+
+
+def _sorted_group_median(values: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median of each group in an array already sorted by (group, value)"""
+    lo = starts + (counts - 1) // 2
+    hi = starts + counts // 2
+    return (values[lo] + values[hi]) / 2.0
+
+
+def group_robust_z(values: np.ndarray, codes: np.ndarray, n_groups: int, min_mad: float = 0.0) -> np.ndarray:
+    """Per-group robust z-score (x - median) / (1.4826 * MAD) for every value
+
+    `codes` gives each value's group in 0..n_groups-1. A group's MAD is
+    raised to at least `min_mad`; groups left with zero spread score 0.
+    """
+    z = np.zeros(len(values), dtype=np.float64)
+    if not len(values):
+        return z
+
+    counts = np.bincount(codes, minlength=n_groups)
+    present = counts > 0
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    median = np.zeros(n_groups)
+    order = np.lexsort((values, codes))
+    median[present] = _sorted_group_median(values[order], starts[present], counts[present])
+
+    deviation = np.abs(values - median[codes])
+    mad = np.zeros(n_groups)
+    order = np.lexsort((deviation, codes))
+    mad[present] = _sorted_group_median(deviation[order], starts[present], counts[present])
+
+    scale = MAD_SCALE * np.maximum(mad, min_mad)[codes]
+    np.divide(values - median[codes], scale, out=z, where=scale > 0)
+    return z
+
+
+def score_marks(
+    codes: np.ndarray,
+    marked_at: np.ndarray,
+    started_at: np.ndarray,
+    masks: np.ndarray,
+    burst_seconds: float,
+    z_threshold: float
+) -> Dict[str, np.ndarray]:
+    """Vectorized proxy-attendance scoring for a batch of sessions
+
+    Rows must be sorted by (session code, marked_at). `marked_at` and
+    `started_at` are seconds; `started_at` is per session code. Returns
+    per-mark reasons (AnomalyReason bits), score, neighbour gap and delay.
+
+    A gap is a burst when it is an outlier against its own session's gaps,
+    so a dense class that marks every second is judged against that pace.
+    Only sessions too small for statistics fall back to `burst_seconds`.
+    """
+    n = len(codes)
+    n_groups = len(started_at)
+    reasons = np.zeros(n, dtype=np.int64)
+    gap_score = np.zeros(n)
+    neighbour_gap = np.full(n, np.inf)
+
+    # Inter-arrival gaps between consecutive marks of the same session
+    after = np.nonzero(codes[1:] == codes[:-1])[0] + 1
+    before = after - 1
+    gaps = marked_at[after] - marked_at[before]
+    neighbour_gap[after] = gaps
+    neighbour_gap[before] = np.minimum(neighbour_gap[before], gaps)
+
+    # Unusually short gaps score high, relative to the session's own rhythm
+    low_gap_z = -group_robust_z(np.log(gaps + 1e-3), codes[after], n_groups, min_mad=MIN_LOG_GAP_MAD)
+    gap_score[after] = low_gap_z
+    gap_score[before] = np.maximum(gap_score[before], low_gap_z)
+
+    large_enough = np.bincount(codes, minlength=n_groups)[codes] >= MIN_MARKS_FOR_STATS
+    in_burst = np.where(large_enough[after], low_gap_z >= z_threshold, gaps < burst_seconds)
+    reasons[after[in_burst]] |= int(AnomalyReason.BURST)
+    reasons[before[in_burst]] |= int(AnomalyReason.BURST)
+    cloned = in_burst & (masks[after] == masks[before])
+    reasons[after[cloned]] |= int(AnomalyReason.IDENTICAL_FACTORS)
+    reasons[before[cloned]] |= int(AnomalyReason.IDENTICAL_FACTORS)
+
+    # Marks that arrive long after the rest of the session
+    delay = marked_at - started_at[codes]
+    delay_score = group_robust_z(delay, codes, n_groups)
+    late = large_enough & (delay > 0) & (delay_score >= z_threshold)
+    reasons[late] |= int(AnomalyReason.LATE)
+
+    score = np.maximum(np.maximum(gap_score, np.where(large_enough, delay_score, 0.0)), 0.0)
+    return {
+        "reasons": reasons,
+        "score": score,
+        "neighbour_gap": neighbour_gap,
+        "delay": delay
+    }
+
+
+class AnomalyService:
+    """Proxy-attendance review queue; `reader`, when given, loads and scores the marks"""
+
+    def __init__(self, db: Session, reader: Optional[Session] = None):
+        self.db = db
+        self.reader = reader or db
+
+    def _load_marks(self, session_ids: Sequence[str]) -> List[Any]:
+        stmt = (
+            select(
+                Attendance.id,
+                Attendance.session_id,
+                Attendance.student_id,
+                Attendance.marked_at,
+                Attendance.verification_mask,
+                SessionModel.start_time
+            )
+            .join(SessionModel, SessionModel.id == Attendance.session_id)
+            .where(Attendance.session_id.in_(list(session_ids)))
+            .where(Attendance.marked_at.isnot(None))
+            .order_by(Attendance.session_id, Attendance.marked_at)
+        )
+        return self.reader.execute(stmt).all()
+
+    def score_sessions(self, session_ids: Sequence[str]) -> List[AttendanceAnomaly]:
+        """Unsaved review items for the suspicious marks in the given sessions"""
+        rows = self._load_marks(session_ids)
+        flagged: List[AttendanceAnomaly] = []
+        if rows:
+            session_keys = np.array([row.session_id for row in rows])
+            boundaries = np.concatenate(([True], session_keys[1:] != session_keys[:-1]))
+            codes = np.cumsum(boundaries) - 1
+            marked_at = np.array([row.marked_at for row in rows], dtype="datetime64[us]")
+            seconds = (marked_at - marked_at.min()) / np.timedelta64(1, "s")
+
+            # Sessions without a start time are measured from their first mark
+            first_rows = np.nonzero(boundaries)[0]
+            started_at = seconds[first_rows].copy()
+            for group, index in enumerate(first_rows):
+                start_time = rows[index].start_time
+                if start_time is not None:
+                    started_at[group] = (np.datetime64(start_time, "us") - marked_at.min()) / np.timedelta64(1, "s")
+
+            masks = np.array([row.verification_mask or 0 for row in rows], dtype=np.int64)
+            result = score_marks(
+                codes, seconds, started_at, masks,
+                burst_seconds=settings.ANOMALY_BURST_SECONDS,
+                z_threshold=settings.ANOMALY_SCORE_THRESHOLD
+            )
+
+            for i in np.nonzero(result["reasons"])[0]:
+                row = rows[i]
+                gap = result["neighbour_gap"][i]
+                flagged.append(AttendanceAnomaly(
+                    attendance_id=row.id,
+                    session_id=row.session_id,
+                    student_id=row.student_id,
+                    reasons=int(result["reasons"][i]),
+                    score=round(float(result["score"][i]), 3),
+                    details={
+                        "gap_seconds": round(float(gap), 3) if np.isfinite(gap) else None,
+                        "delay_seconds": round(float(result["delay"][i]), 3)
+                    },
+                    status=AnomalyStatus.OPEN
+                ))
+        return flagged
+
+    def scan_sessions(self, session_ids: Sequence[str]) -> int:
+        """Score every mark in the given sessions and replace their open review items
+
+        Returns the number of marks flagged. Reviewed items are left alone.
+        The caller commits.
+        """
+        session_ids = [str(session_id) for session_id in session_ids]
+        if not session_ids:
+            return 0
+
+        flagged = self.score_sessions(session_ids)
+        # Scoring only read; the write transaction starts here
+        reviewed = {
+            attendance_id for (attendance_id,) in self.db.query(AttendanceAnomaly.attendance_id).filter(
+                AttendanceAnomaly.session_id.in_(session_ids),
+                AttendanceAnomaly.status != AnomalyStatus.OPEN
+            )
+        }
+        self.db.query(AttendanceAnomaly).filter(
+            AttendanceAnomaly.session_id.in_(session_ids),
+            AttendanceAnomaly.status == AnomalyStatus.OPEN
+        ).delete(synchronize_session=False)
+        flagged = [anomaly for anomaly in flagged if anomaly.attendance_id not in reviewed]
+        self.db.add_all(flagged)
+        return len(flagged)
+
+    def scan(self, now: Optional[datetime] = None, batch_size: int = SCAN_BATCH_SESSIONS) -> Dict[str, Any]:
+        """Scan sessions completed since the last run, batch_size sessions at a time
+
+        Each batch is written in its own short transaction. Re-running after
+        a failure is safe because a scan replaces the open items it finds.
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+        rollups = RollupService(self.db, reader=self.reader)
+        start = rollups.get_high_water_mark(SCAN_NAME)
+
+        query = self.reader.query(SessionModel.id).filter(SessionModel.status == SessionStatus.COMPLETED)
+        if start is None:
+            # First run also picks up sessions ended before end_time was recorded
+            query = query.filter(or_(SessionModel.end_time.is_(None), SessionModel.end_time < cutoff))
+        else:
+            query = query.filter(SessionModel.end_time >= start, SessionModel.end_time < cutoff)
+        session_ids = [session_id for (session_id,) in query.order_by(SessionModel.end_time, SessionModel.id)]
+
+        flagged = 0
+        try:
+            for i in range(0, len(session_ids), batch_size):
+                flagged += self.scan_sessions(session_ids[i:i + batch_size])
+                self.db.commit()
+            rollups.get_state(SCAN_NAME).high_water_mark = cutoff
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Anomaly scan covered {len(session_ids)} sessions and flagged {flagged} marks")
+        return {"sessions": len(session_ids), "flagged": flagged, "high_water_mark": cutoff}
+
+    def rescan_session(self, session_id: str) -> int:
+        """Re-score one session on demand"""
+        flagged = self.scan_sessions([session_id])
+        self.db.commit()
+        return flagged
+
+    def get_anomalies(
+        self,
+        status: Optional[AnomalyStatus] = AnomalyStatus.OPEN,
+        session_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[AttendanceAnomaly]:
+        """Review queue, most suspicious first"""
+        query = self.db.query(AttendanceAnomaly)
+        if status:
+            query = query.filter(AttendanceAnomaly.status == status)
+        if session_id:
+            query = query.filter(AttendanceAnomaly.session_id == str(session_id))
+        return (
+            query.order_by(AttendanceAnomaly.score.desc(), AttendanceAnomaly.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+
+    def review(self, anomaly_id: str, status: AnomalyStatus, reviewer_id: str) -> Optional[AttendanceAnomaly]:
+        """Record an admin's verdict on a flagged mark"""
+        anomaly = self.db.query(AttendanceAnomaly).filter(AttendanceAnomaly.id == str(anomaly_id)).first()
+        if not anomaly:
+            return None
+        anomaly.status = status
+        anomaly.reviewed_by = str(reviewer_id)
+        anomaly.reviewed_at = datetime.utcnow()
+        self.db.commit()
+        self.db.refresh(anomaly)
+        return anomaly
+
+
+def scan_anomalies() -> None:
+    """Entry point for the background job"""
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        AnomalyService(db, reader=reader).scan()
+    finally:
+        reader.close()
+        db.close()
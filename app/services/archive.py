@@ -0,0 +1,297 @@
+# app/services/archive.py
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timetable import term_for
+from app.db.session import ReadSessionLocal, SessionLocal
+from app.models.anomaly import AttendanceAnomaly
+from app.models.attendance import Attendance
+from app.models.session import Session as SessionModel, SessionStatus
+
+logger = logging.getLogger(__name__)
+
+ARCHIVABLE_STATUSES = (SessionStatus.COMPLETED, SessionStatus.CANCELLED)
+SESSION_COLUMNS = [
+    "id", "faculty_id", "course_code", "room_number", "proximity_uuid",
+    "status", "start_time", "end_time", "created_at", "term"
+]
+ATTENDANCE_COLUMNS = [
+    "id", "session_id", "student_id", "marked_at", "verification_mask",
+    "verification_metadata", "course_code", "term"
+]
+TIMESTAMP_COLUMNS = {"start_time", "end_time", "created_at", "marked_at"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError(f"Parquet archive is unavailable: {str(e)}")
+    return pyarrow
+
+
+def _schema(columns: List[str]):
+    pa = _pyarrow()
+    fields = []
+    for column in columns:
+        if column in TIMESTAMP_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp("us")))
+        elif column == "verification_mask":
+            fields.append(pa.field(column, pa.int64()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+class ArchiveStore:
+    """Parquet files of archived sessions and marks, one partition per term and course
+
+    Layout: <root>/term=<term>/course=<course_code>/{sessions,attendance}.parquet
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.ARCHIVE_PATH)
+
+    def partition_dir(self, term: str, course_code: str) -> Path:
+        return self.root / f"term={term}" / f"course={quote(course_code, safe='')}"
+
+    def files(self, table: str, course_code: Optional[str] = None) -> List[Path]:
+        course = quote(course_code, safe="") if course_code else "*"
+        return sorted(self.root.glob(f"term=*/course={course}/{table}.parquet"))
+
+    def _write(self, path: Path, frame: pd.DataFrame, columns: List[str], sort_by: List[str]) -> None:
+        """Merge frame into the file at path, replacing rows with the same id"""
+        pa = _pyarrow()
+        schema = _schema(columns)
+        if path.exists():
+            existing = pa.parquet.read_table(path, schema=schema).to_pandas()
+            frame = pd.concat([existing, frame], ignore_index=True)
+        frame = frame.drop_duplicates("id", keep="last").sort_values(sort_by, kind="stable")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        table = pa.Table.from_pandas(frame[columns], schema=schema, preserve_index=False)
+        pa.parquet.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def write_partition(self, term: str, course_code: str, sessions: pd.DataFrame, marks: pd.DataFrame) -> None:
+        """Add sessions and their marks to a term/course partition, idempotently"""
+        directory = self.partition_dir(term, course_code)
+        self._write(directory / "sessions.parquet", sessions, SESSION_COLUMNS, ["start_time", "id"])
+        if not marks.empty:
+            self._write(directory / "attendance.parquet", marks, ATTENDANCE_COLUMNS, ["session_id", "marked_at", "id"])
+
+    def read(self, table: str, course_code: Optional[str] = None, filter=None) -> pd.DataFrame:
+        """Rows of sessions or attendance across partitions, optionally filtered
+
+        `filter` is a pyarrow.dataset expression, pushed down to the Parquet reader.
+        """
+        columns = SESSION_COLUMNS if table == "sessions" else ATTENDANCE_COLUMNS
+        paths = self.files(table, course_code)
+        if not paths:
+            return pd.DataFrame(columns=columns)
+        pa = _pyarrow()
+        dataset = pa.dataset.dataset([str(path) for path in paths], format="parquet", schema=_schema(columns))
+        return dataset.to_table(filter=filter).to_pandas()
+
+    def field(self, name: str):
+        return _pyarrow().dataset.field(name)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """An archived session as a dict, or None"""
+        if not self.files("sessions"):
+            return None
+        frame = self.read("sessions", filter=self.field("id") == str(session_id))
+        if frame.empty:
+            return None
+        return _records(frame)[0]
+
+    def get_student_history(
+        self,
+        student_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Archived marks for a student joined to their sessions, newest first by (marked_at, id)"""
+        if not self.files("attendance"):
+            return []
+        marks = self.read("attendance", filter=self.field("student_id") == str(student_id))
+        if after is not None:
+            marked_at = pd.Timestamp(after[0])
+            marks = marks[(marks["marked_at"] < marked_at) | ((marks["marked_at"] == marked_at) & (marks["id"] < after[1]))]
+        if marks.empty:
+            return []
+        marks = marks.sort_values(["marked_at", "id"], ascending=False)
+        if limit is not None:
+            marks = marks.head(limit)
+
+        sessions = self.read("sessions", filter=self.field("id").isin(list(marks["session_id"].unique())))
+        sessions = sessions.set_index("id")
+        return [
+            {"attendance": mark, "session": sessions.loc[mark["session_id"]].to_dict() if mark["session_id"] in sessions.index else {}}
+            for mark in _records(marks)
+        ]
+
+    def get_course_sessions(self, course_code: str) -> pd.DataFrame:
+        """Archived sessions that count as held, i.e. completed"""
+        return self.read("sessions", course_code=course_code, filter=self.field("status") == SessionStatus.COMPLETED.value)
+
+    def get_course_marks(self, course_code: str) -> pd.DataFrame:
+        return self.read("attendance", course_code=course_code)
+
+    def get_session_marks(self, session: Dict[str, Any]) -> pd.DataFrame:
+        """Marks of one archived session, read from its own partition only"""
+        path = self.partition_dir(session["term"], session["course_code"]) / "attendance.parquet"
+        if not path.exists():
+            return pd.DataFrame(columns=ATTENDANCE_COLUMNS)
+        pa = _pyarrow()
+        table = pa.parquet.read_table(path, schema=_schema(ATTENDANCE_COLUMNS), filters=[("session_id", "=", session["id"])])
+        return table.to_pandas().sort_values("marked_at", kind="stable")
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame rows as dicts with None instead of NaN/NaT and datetimes instead of Timestamps"""
+    records = []
+    for record in frame.astype(object).where(frame.notna(), None).to_dict("records"):
+        records.append({
+            key: value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+            for key, value in record.items()
+        })
+    return records
+
+
+class ArchiveService:
+    """Moves old sessions to Parquet; `reader`, when given, reads the rows being archived"""
+
+    def __init__(self, db: Session, store: Optional[ArchiveStore] = None, reader: Optional[Session] = None):
+        self.db = db
+        self.store = store or ArchiveStore()
+        self.reader = reader or db
+
+    def _archivable(self, cutoff: datetime):
+        started = func.coalesce(SessionModel.start_time, SessionModel.created_at)
+        return (
+            self.reader.query(
+                SessionModel.id,
+                SessionModel.faculty_id,
+                SessionModel.course_code,
+                SessionModel.room_number,
+                SessionModel.proximity_uuid,
+                SessionModel.status,
+                SessionModel.start_time,
+                SessionModel.end_time,
+                SessionModel.created_at
+            )
+            .filter(SessionModel.status.in_(ARCHIVABLE_STATUSES), started < cutoff)
+            .order_by(started, SessionModel.id)
+        )
+
+    def archive_batch(self, sessions: List[Any]) -> int:
+        """Write a batch of sessions and their marks to Parquet, then delete them
+
+        Returns the number of marks archived. The caller commits.
+        """
+        session_ids = [session.id for session in sessions]
+        session_rows = []
+        for session in sessions:
+            started = session.start_time or session.created_at
+            session_rows.append({
+                "id": session.id,
+                "faculty_id": session.faculty_id,
+                "course_code": session.course_code,
+                "room_number": session.room_number,
+                "proximity_uuid": session.proximity_uuid,
+                "status": session.status.value if session.status else None,
+                "start_time": session.start_time,
+                "end_time": session.end_time,
+                "created_at": session.created_at,
+                "term": term_for(started)
+            })
+        session_frame = pd.DataFrame(session_rows, columns=SESSION_COLUMNS)
+
+        partition_of = {row["id"]: (row["term"], row["course_code"]) for row in session_rows}
+        mark_rows = [
+            {
+                "id": mark.id,
+                "session_id": mark.session_id,
+                "student_id": mark.student_id,
+                "marked_at": mark.marked_at,
+                "verification_mask": mark.verification_mask or 0,
+                "verification_metadata": json.dumps(mark.verification_metadata) if mark.verification_metadata else None,
+                "course_code": partition_of[mark.session_id][1],
+                "term": partition_of[mark.session_id][0]
+            }
+            for mark in self.reader.query(
+                Attendance.id,
+                Attendance.session_id,
+                Attendance.student_id,
+                Attendance.marked_at,
+                Attendance.verification_mask,
+                Attendance.verification_metadata
+            ).filter(Attendance.session_id.in_(session_ids))
+        ]
+        mark_frame = pd.DataFrame(mark_rows, columns=ATTENDANCE_COLUMNS)
+
+        for (term, course_code), partition_sessions in session_frame.groupby(["term", "course_code"]):
+            partition_marks = mark_frame[mark_frame["session_id"].isin(partition_sessions["id"])]
+            self.store.write_partition(term, course_code, partition_sessions, partition_marks)
+
+        # Only delete once every partition is safely on disk; the write
+        # transaction starts here, not while the Parquet files are written
+        self.db.query(AttendanceAnomaly).filter(AttendanceAnomaly.session_id.in_(session_ids)).delete(synchronize_session=False)
+        self.db.query(Attendance).filter(Attendance.session_id.in_(session_ids)).delete(synchronize_session=False)
+        self.db.query(SessionModel).filter(SessionModel.id.in_(session_ids)).delete(synchronize_session=False)
+        return len(mark_rows)
+
+    def archive_sessions(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Move finished sessions that started before the cutoff, and their marks, to Parquet
+
+        Each batch is written and then deleted in its own transaction. Re-running
+        after a failure is safe because partitions are merged by row id.
+        """
+        older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SESSIONS
+        cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+
+        archived_sessions = archived_marks = 0
+        while True:
+            sessions = self._archivable(cutoff).limit(batch_size).all()
+            if not sessions:
+                break
+            try:
+                archived_marks += self.archive_batch(sessions)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            archived_sessions += len(sessions)
+
+        logger.info(f"Archived {archived_sessions} sessions and {archived_marks} marks older than {cutoff.isoformat()}")
+        return {"sessions": archived_sessions, "marks": archived_marks, "cutoff": cutoff}
+
+
+def archive_old_sessions() -> None:
+    """Entry point for the background job"""
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        ArchiveService(db, reader=reader).archive_sessions()
+    finally:
+        reader.close()
+        db.close()
@@ -1,12 +1,34 @@
 # app/services/assignment.py
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.models.assignment import Assignment
+from app.core.timetable import parse_schedule
+from app.models.assignment import Assignment, AssignmentSlot
+from app.models.course import Course
+from app.models.room import Room
+from app.models.user import User
 from app.schemas.assignment import AssignmentCreate, AssignmentUpdate
+from app.services.timetable import TimetableService
+
+def serialize_assignment(
+    assignment: Assignment,
+    faculty_name: Optional[str] = None,
+    course_code: Optional[str] = None,
+    course_name: Optional[str] = None,
+    room_number: Optional[str] = None
+) -> Dict[str, Any]:
+    """Assignment columns plus the related names every assignment response carries"""
+    assignment_dict = {column.name: getattr(assignment, column.name) for column in Assignment.__table__.columns}
+    assignment_dict["faculty_name"] = faculty_name
+    assignment_dict["course_code"] = course_code
+    assignment_dict["course_name"] = course_name
+    assignment_dict["room_number"] = room_number
+    return assignment_dict
+
 
 class AssignmentService:
     def __init__(self, db: Session):
@@ -20,12 +42,103 @@ class AssignmentService:
         """Get all assignments"""
         return self.db.query(Assignment).all()
     
+    def _details_query(self, skip_incomplete: bool = False):
+        """Assignments plus faculty, course and room names in one statement
+
+        With skip_incomplete, assignments whose faculty, course or room no
+        longer exists are dropped; otherwise their names come back as None.
+        """
+        outer = not skip_incomplete
+        return (
+            self.db.query(Assignment, User.full_name, Course.course_code, Course.course_name, Room.room_number)
+            .join(User, User.id == Assignment.faculty_id, isouter=outer)
+            .join(Course, Course.id == Assignment.course_id, isouter=outer)
+            .join(Room, Room.id == Assignment.room_id, isouter=outer)
+        )
+    
+    def get_assignments_with_details(
+        self,
+        active_only: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Assignments with faculty, course and room names, from a single joined query
+
+        Assignments whose faculty, course or room no longer exists are skipped.
+        """
+        query = self._details_query(skip_incomplete=True)
+        if active_only:
+            query = query.filter(Assignment.is_active.is_(True))
+        query = query.order_by(Assignment.created_at, Assignment.id).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return [serialize_assignment(*row) for row in query]
+    
+    def get_assignments_version(self) -> Tuple:
+        """Counts and latest timestamps of assignments and the tables their names come from, in one query"""
+        columns = []
+        for model in (Assignment, User, Course, Room):
+            columns += [
+                select(func.count(model.id)).scalar_subquery(),
+                select(func.max(model.created_at)).scalar_subquery(),
+                select(func.max(model.updated_at)).scalar_subquery()
+            ]
+        return tuple(self.db.query(*columns).one())
+    
+    def get_assignment_with_details(self, assignment_id: str) -> Optional[Dict[str, Any]]:
+        """One assignment with faculty, course and room names"""
+        row = self._details_query().filter(Assignment.id == assignment_id).first()
+        return serialize_assignment(*row) if row else None
+    
+    def get_faculty_assignments_with_details(self, faculty_id: str) -> List[Dict[str, Any]]:
+        """A faculty member's assignments with course and room names"""
+        query = (
+            self._details_query()
+            .filter(Assignment.faculty_id == faculty_id)
+            .order_by(Assignment.created_at, Assignment.id)
+        )
+        return [serialize_assignment(*row) for row in query]
+    
     def get_faculty_assignments(self, faculty_id: str) -> List[Assignment]:
         """Get all assignments for a faculty member"""
         return self.db.query(Assignment).filter(Assignment.faculty_id == faculty_id).all()
     
+    def is_assigned_to_course(self, faculty_id: str, course_code: str) -> bool:
+        """True if the faculty member has, or had, an assignment for the course"""
+        return self.db.query(
+            select(Assignment.id)
+            .join(Course, Course.id == Assignment.course_id)
+            .where(Assignment.faculty_id == str(faculty_id), Course.course_code == course_code)
+            .exists()
+        ).scalar()
+    
+    def _check_schedule(
+        self,
+        faculty_id: str,
+        room_id: str,
+        day_of_week: Optional[str],
+        time_slot: Optional[str],
+        exclude: Optional[str] = None,
+        check_conflicts: bool = True
+    ) -> List[AssignmentSlot]:
+        """Parse a recurring schedule into slots, raising ValueError if it is unreadable or double-booked"""
+        schedule = parse_schedule(day_of_week, time_slot)
+        if check_conflicts:
+            TimetableService(self.db).check_conflicts(faculty_id, room_id, schedule, exclude=exclude)
+        return [
+            AssignmentSlot(weekday=weekday, start_minute=start, end_minute=end)
+            for weekday, start, end in schedule
+        ]
+    
     def create_assignment(self, assignment_in: AssignmentCreate) -> Assignment:
-        """Create new assignment"""
+        """Create new assignment
+
+        Raises ValueError if the schedule cannot be parsed or double-books the room or faculty
+        """
+        slots = self._check_schedule(
+            assignment_in.faculty_id, assignment_in.room_id, assignment_in.day_of_week, assignment_in.time_slot
+        )
+        
         # Create assignment ID
         assignment_id = str(uuid.uuid4())
         
@@ -39,7 +152,8 @@ class AssignmentService:
             time_slot=assignment_in.time_slot,
             is_active=True,
             created_at=datetime.utcnow(),
-            updated_at=None
+            updated_at=None,
+            slots=slots
         )
         
         # Add to database
@@ -50,7 +164,10 @@ class AssignmentService:
         return db_assignment
     
     def update_assignment(self, assignment_id: str, assignment_in: AssignmentUpdate) -> Optional[Assignment]:
-        """Update existing assignment"""
+        """Update existing assignment
+
+        Raises ValueError if the new schedule cannot be parsed or double-books the room or faculty
+        """
         # Get assignment
         db_assignment = self.get_assignment(assignment_id)
         if not db_assignment:
@@ -59,6 +176,21 @@ class AssignmentService:
         # Update assignment data
         assignment_data = assignment_in.dict(exclude_unset=True)
         
+        # Re-check the timetable when the booking moves or is reactivated
+        merged = {
+            field: assignment_data.get(field, getattr(db_assignment, field))
+            for field in ("faculty_id", "room_id", "day_of_week", "time_slot", "is_active")
+        }
+        schedule_changed = "day_of_week" in assignment_data or "time_slot" in assignment_data
+        rebooked = schedule_changed or "faculty_id" in assignment_data or "room_id" in assignment_data
+        if schedule_changed or (merged["is_active"] and (rebooked or not db_assignment.is_active)):
+            slots = self._check_schedule(
+                merged["faculty_id"], merged["room_id"], merged["day_of_week"], merged["time_slot"],
+                exclude=db_assignment.id, check_conflicts=bool(merged["is_active"])
+            )
+            if schedule_changed:
+                db_assignment.slots = slots
+        
         # Update fields
         for field, value in assignment_data.items():
             setattr(db_assignment, field, value)
@@ -2,11 +2,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import delete
-from typing import List, Optional, Dict, Any
+from sqlalchemy import func, case, tuple_
+from typing import List, Optional, Dict, Any, Tuple
+import base64
+import json
 import uuid
 from datetime import datetime
-from app.models.attendance import Attendance
-from app.models.session import Session, SessionStatus
+from app.models.attendance import (
+    Attendance, VerificationFactor, ALL_VERIFICATION_FACTORS, unpack_verification_factors
+)
+from app.models.session import Session, Session as SessionModel, SessionStatus
+from app.services.archive import ArchiveStore
+from app.services.attendance_stats import AttendanceStatsService, session_term
+from app.services.headcount import HeadcountService, headcounts
 from app.services.qr_code import QRCodeService
 from app.services.session import SessionService
 from sqlalchemy.orm import Session
@@ -14,6 +22,39 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _format_verification(mask: Optional[int], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the verification summary shared by every attendance report"""
+    mask = mask or 0
+    factors = unpack_verification_factors(mask, metadata)
+    return {
+        "methods": [name for name, passed in factors.items() if passed is True],
+        "complete": (mask & ALL_VERIFICATION_FACTORS) == ALL_VERIFICATION_FACTORS,
+        "qr": factors.get('qr', False),
+        "face": factors.get('face', False),
+        "proximity": factors.get('proximity', False)
+    }
+
+
+def encode_history_cursor(marked_at: datetime, attendance_id: str) -> str:
+    """Opaque keyset cursor for attendance history pages
+
+    Faculty session pages use the same format for (created_at, session id).
+    """
+    raw = f"{marked_at.isoformat()}|{attendance_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Reverse encode_history_cursor, raising ValueError on malformed input"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        marked_at, attendance_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(marked_at), attendance_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
 class AttendanceService:
     def __init__(self, db: Session):
         self.db = db
@@ -30,13 +71,21 @@ class AttendanceService:
     #     result = await self.db.execute(select(Attendance).where(Attendance.session_id == session_id))
     #     return result.scalars().all()
     
-    def get_session_attendances_with_details(self, session_id: uuid.UUID) -> List[Dict[str, Any]]:
-        """Get detailed attendance list for a session including student names"""
+    def get_session_attendances_with_details(
+        self,
+        session_id: uuid.UUID,
+        failed_factor: Optional[VerificationFactor] = None
+    ) -> List[Dict[str, Any]]:
+        """Get detailed attendance list for a session including student names
+
+        When failed_factor is given only marks where that factor did not pass are returned
+        """
         try:
             # Get all attendances for this session
-            attendances = self.db.query(Attendance).filter(
-                Attendance.session_id == session_id
-            ).order_by(Attendance.marked_at.desc()).all()
+            query = self.db.query(Attendance).filter(Attendance.session_id == str(session_id))
+            if failed_factor is not None:
+                query = query.filter(~Attendance.has_factor(failed_factor))
+            attendances = query.order_by(Attendance.marked_at.desc()).all()
             
             # Get student details
             from app.models.user import User
@@ -57,11 +106,6 @@ class AttendanceService:
                 student_id = str(attendance.student_id)
                 student_info = students.get(student_id, {"name": "Unknown", "email": "Unknown", "roll_number": ""})
                 
-                # Format verification information
-                verification_factors = attendance.verification_factors or {}
-                verification_methods = list(verification_factors.keys())
-                verification_complete = all(verification_factors.values()) if verification_factors else False
-                
                 result.append({
                     "id": str(attendance.id),
                     "student_id": student_id,
@@ -69,20 +113,40 @@ class AttendanceService:
                     "student_email": student_info["email"],
                     "student_roll": student_info["roll_number"],
                     "marked_at": attendance.marked_at.isoformat(),
-                    "verification": {
-                        "methods": verification_methods,
-                        "complete": verification_complete,
-                        "qr": verification_factors.get('qr', False),
-                        "face": verification_factors.get('face', False),
-                        "proximity": verification_factors.get('proximity', False)
-                    }
+                    "verification": _format_verification(attendance.verification_mask, attendance.verification_metadata)
                 })
                 
             return result
         except Exception as e:
             logger.error(f"Error getting session attendances with details: {str(e)}")
             return []
-    
+
+    def get_session_verification_summary(self, session_id: uuid.UUID) -> Dict[str, Any]:
+        """Count marks per verification factor for a session in a single aggregate query"""
+        try:
+            columns = [func.count(Attendance.id), func.sum(case((Attendance.is_complete(), 1), else_=0))]
+            columns += [
+                func.sum(case((Attendance.has_factor(factor), 1), else_=0))
+                for factor in VerificationFactor
+            ]
+            row = self.db.query(*columns).filter(Attendance.session_id == str(session_id)).one()
+
+            total, complete, *factor_counts = row
+            return {
+                "session_id": str(session_id),
+                "total": total or 0,
+                "complete": complete or 0,
+                "factors": {
+                    factor.name.lower(): {
+                        "passed": passed or 0,
+                        "failed": (total or 0) - (passed or 0)
+                    } for factor, passed in zip(VerificationFactor, factor_counts)
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error getting session verification summary: {str(e)}")
+            return {"session_id": str(session_id), "total": 0, "complete": 0, "factors": {}}
+
     async def get_student_attendances(self, student_id: uuid.UUID) -> List[Attendance]:
         """Get all attendances for a student"""
         result = await self.db.execute(select(Attendance).where(Attendance.student_id == student_id))
@@ -179,9 +243,11 @@ class AttendanceService:
                 }
             
             # Check if student has already marked attendance for this session
+            self.lock_student_mark(student_id, session.id)
             existing_attendance = self.get_student_attendance_for_session(
                 student_id=student_id,
-                session_id=session.id
+                session_id=session.id,
+                since=session.start_time
             )
             
             if existing_attendance:
@@ -190,18 +256,31 @@ class AttendanceService:
                     "error": "Attendance already marked for this session"
                 }
             
+            # More marks than seats often means proxy marking; the live headcount answers from
+            # memory until the room is nearly full
+            headcount = HeadcountService(self.db).get_for_mark(session)
+            if not headcounts.reserve(session.id):
+                return {
+                    "success": False,
+                    "error": f"Room capacity reached ({headcount.capacity} marks)"
+                }
+            
             # Mark attendance
             attendance = self.create_attendance(
                 student_id=student_id,
                 session_id=session.id,
-                verification_factors=verification_factors
+                verification_factors=verification_factors,
+                course_code=session.course_code,
+                term=session_term(session)
             )
             
             if not attendance:
+                headcounts.release(session.id)
                 return {
                     "success": False,
                     "error": "Failed to mark attendance"
                 }
+            headcounts.confirm(session.id)
             
             return {
                 "success": True,
@@ -215,18 +294,37 @@ class AttendanceService:
                 "error": f"Error marking attendance: {str(e)}"
             }
         
+    def lock_student_mark(self, student_id: uuid.UUID, session_id: str) -> None:
+        """Serialize marks by one student in one session until this transaction ends
+
+        PostgreSQL cannot enforce one mark per session on the partitioned
+        table, so two concurrent marks would both pass the duplicate check.
+        The advisory lock makes the second wait for the first to commit.
+        SQLite has the unique index and a single writer, so nothing is done.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+        key = f"attendance:{session_id}:{student_id}"
+        self.db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(key, 0))))
+
     def get_student_attendance_for_session(
         self,
         student_id: uuid.UUID,
-        session_id: str
+        session_id: str,
+        since: Optional[datetime] = None
     ) -> Optional[Attendance]:
-        """Get a student's attendance for a specific session"""
+        """Get a student's attendance for a specific session
+
+        Pass the session's start time as `since` to skip older partitions
+        """
         try:
-            result = self.db.query(Attendance).filter(
+            query = self.db.query(Attendance).filter(
                 Attendance.session_id == session_id,
                 Attendance.student_id == student_id
-            ).first()
-            return result
+            )
+            if since is not None:
+                query = query.filter(Attendance.marked_at >= since)
+            return query.first()
         except Exception as e:
             logger.error(f"Error getting attendance: {str(e)}")
             return None
@@ -235,9 +333,11 @@ class AttendanceService:
         self,
         student_id: uuid.UUID,
         session_id: str,
-        verification_factors: Dict[str, bool]
+        verification_factors: Dict[str, bool],
+        course_code: Optional[str] = None,
+        term: Optional[str] = None
     ) -> Optional[Attendance]:
-        """Create an attendance record"""
+        """Create an attendance record and count it towards the student's course percentage"""
         try:
             # Convert UUIDs to strings if needed
             if isinstance(student_id, uuid.UUID):
@@ -258,6 +358,16 @@ class AttendanceService:
                 verification_factors=verification_factors
             )
             self.db.add(db_attendance)
+            
+            if course_code is None or term is None:
+                session = self.db.query(
+                    SessionModel.course_code, SessionModel.start_time, SessionModel.created_at
+                ).filter(SessionModel.id == session_id_str).first()
+                if session is not None:
+                    course_code, term = session.course_code, session_term(session)
+            if course_code:
+                AttendanceStatsService(self.db).record_mark(student_id_str, course_code, term)
+            
             self.db.commit()
             self.db.refresh(db_attendance)
             return db_attendance
@@ -268,33 +378,45 @@ class AttendanceService:
         
     # Fix for get_student_attendance_history method
 
-    def get_student_attendance_history(self, student_id: uuid.UUID) -> List[Dict[str, Any]]:
-        """Get detailed attendance history for a student with session details"""
+    def get_student_attendance_history(
+        self,
+        student_id: uuid.UUID,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get detailed attendance history for a student with session details
+
+        Records are ordered newest first by (marked_at, id). `after` is the
+        (marked_at, id) of the last record already seen.
+        """
         try:
             # Use aliases to refer to the models in the join
             from app.models.session import Session as SessionModel
             
-            # Get all attendance records for this student with session data
+            # Get attendance records for this student with session data
             query = (
                 self.db.query(
                     Attendance,  # Full attendance record
                     SessionModel  # Full session record
                 )
                 .join(SessionModel, Attendance.session_id == SessionModel.id)
-                .filter(Attendance.student_id == student_id)
-                .order_by(Attendance.marked_at.desc())
+                .filter(Attendance.student_id == str(student_id))
             )
+            if after is not None:
+                # The plain bound lets PostgreSQL prune monthly partitions
+                query = query.filter(
+                    Attendance.marked_at <= after[0],
+                    tuple_(Attendance.marked_at, Attendance.id) < tuple_(*after)
+                )
+            query = query.order_by(Attendance.marked_at.desc(), Attendance.id.desc())
+            if limit is not None:
+                query = query.limit(limit)
             
             results = query.all()
             
             # Format results
             history = []
             for attendance, session in results:
-                # Calculate verification summary
-                verification_factors = attendance.verification_factors or {}
-                verification_methods = list(verification_factors.keys())
-                verification_complete = all(verification_factors.values()) if verification_factors else False
-                
                 # Format session date/time
                 session_date = None
                 session_time = None
@@ -311,13 +433,7 @@ class AttendanceService:
                     "session_date": session_date,
                     "session_time": session_time,
                     "marked_at": attendance.marked_at.isoformat(),
-                    "verification": {
-                        "methods": verification_methods,
-                        "complete": verification_complete,
-                        "qr": verification_factors.get('qr', False),
-                        "face": verification_factors.get('face', False),
-                        "proximity": verification_factors.get('proximity', False)
-                    }
+                    "verification": _format_verification(attendance.verification_mask, attendance.verification_metadata)
                 })
                     
             return history
@@ -325,73 +441,182 @@ class AttendanceService:
             logger.error(f"Error getting student attendance history: {str(e)}")
             return []
 
-    def get_faculty_session_attendance(self, faculty_id: uuid.UUID) -> List[Dict[str, Any]]:
-        """Get attendance stats for all sessions created by a faculty"""
+    def get_archived_attendance_history(
+        self,
+        student_id: uuid.UUID,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Same as get_student_attendance_history, for marks moved to the Parquet archive"""
+        history = []
+        for row in ArchiveStore().get_student_history(str(student_id), limit=limit, after=after):
+            attendance, session = row["attendance"], row["session"]
+            start_time = session.get("start_time")
+            metadata = attendance.get("verification_metadata")
+            history.append({
+                "id": attendance["id"],
+                "session_id": attendance["session_id"],
+                "course_code": session.get("course_code") or attendance["course_code"],
+                "room_number": session.get("room_number") or "No Room",
+                "session_status": session.get("status") or "UNKNOWN",
+                "session_date": start_time.date().isoformat() if start_time else None,
+                "session_time": start_time.time().isoformat() if start_time else None,
+                "marked_at": attendance["marked_at"].isoformat(),
+                "verification": _format_verification(
+                    attendance["verification_mask"],
+                    json.loads(metadata) if metadata else None
+                )
+            })
+        return history
+
+    def get_student_history_version(self, student_id: uuid.UUID) -> Tuple:
+        """Count and latest mark of a student's live attendance, plus the state of those sessions
+
+        Cheap stand-in for the history pages in an ETag: a new mark, an
+        archived mark or a session ending changes it.
+        """
+        row = (
+            self.db.query(
+                func.count(Attendance.id),
+                func.max(Attendance.marked_at),
+                func.max(SessionModel.end_time),
+                func.sum(case((SessionModel.status == SessionStatus.ACTIVE, 1), else_=0))
+            )
+            .outerjoin(SessionModel, SessionModel.id == Attendance.session_id)
+            .filter(Attendance.student_id == str(student_id))
+            .one()
+        )
+        return tuple(row)
+
+    def get_student_attendance_history_page(
+        self,
+        student_id: uuid.UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of a student's attendance history and the cursor for the next
+
+        Raises ValueError if the cursor cannot be decoded
+        """
+        after = decode_history_cursor(cursor) if cursor else None
+        
+        # Fetch one extra record to know whether another page exists
+        records = self.get_student_attendance_history(student_id, limit=limit + 1, after=after)
+        # Archived marks are older than live ones but share the same keyset order,
+        # so the archive is only read once the live rows run out, and only for the rest
+        if len(records) <= limit:
+            records += self.get_archived_attendance_history(student_id, limit=limit + 1 - len(records), after=after)
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            next_cursor = encode_history_cursor(datetime.fromisoformat(last["marked_at"]), last["id"])
+        
+        return {"attendances": records, "next_cursor": next_cursor}
+
+    def get_faculty_session_attendance(
+        self,
+        faculty_id: uuid.UUID,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None,
+        recent_limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Get attendance stats for a page of sessions created by a faculty
+
+        Sessions are ordered newest first by (created_at, id). `after` is the
+        (created_at, id) of the last session already seen; each session carries
+        it encoded as `cursor`. The page, the counts and the recent marks are
+        three queries no matter how many sessions are on the page.
+        """
         try:
             from app.models.session import Session as SessionModel
             from app.models.user import User
             
-            # Get all sessions by this faculty
-            sessions = self.db.query(SessionModel).filter(SessionModel.faculty_id == faculty_id).all()
+            # Page of sessions by this faculty
+            query = self.db.query(SessionModel).filter(SessionModel.faculty_id == str(faculty_id))
+            if after is not None:
+                # Sessions created in the same instant are told apart by id
+                query = query.filter(
+                    SessionModel.created_at <= after[0],
+                    tuple_(SessionModel.created_at, SessionModel.id) < tuple_(*after)
+                )
+            sessions = query.order_by(SessionModel.created_at.desc(), SessionModel.id.desc()).limit(limit).all()
             
-            result = []
+            if not sessions:
+                return []
+            session_ids = [session.id for session in sessions]
             
-            for session in sessions:
-                # Count attendances for this session
-                attendances_count = self.db.query(Attendance).filter(
-                    Attendance.session_id == session.id
-                ).count()
-                
-                # Get the latest few attendances for preview
-                recent_attendances = (
-                    self.db.query(Attendance)
-                    .filter(Attendance.session_id == session.id)
-                    .order_by(Attendance.marked_at.desc())
-                    .limit(5)
-                    .all()
+            # Count attendances for every session on the page
+            counts = dict(
+                self.db.query(Attendance.session_id, func.count(Attendance.id))
+                .filter(Attendance.session_id.in_(session_ids))
+                .group_by(Attendance.session_id)
+                .all()
+            )
+            
+            # Latest few marks per session, ranked in the database and joined to students
+            ranked = (
+                self.db.query(
+                    Attendance.id,
+                    Attendance.session_id,
+                    Attendance.student_id,
+                    Attendance.marked_at,
+                    Attendance.verification_mask,
+                    Attendance.verification_metadata,
+                    func.row_number().over(
+                        partition_by=Attendance.session_id,
+                        order_by=Attendance.marked_at.desc()
+                    ).label("rank")
                 )
-                
-                # Get student names for the recent attendances
-                student_ids = [attendance.student_id for attendance in recent_attendances]
-                student_info = {}
-                
-                if student_ids:
-                    students = self.db.query(User).filter(User.id.in_(student_ids)).all()
-                    student_info = {str(student.id): {
-                        "name": student.full_name,
-                        "roll_number": student.roll_number if hasattr(student, 'roll_number') else None
-                    } for student in students}
-                
+                .filter(Attendance.session_id.in_(session_ids))
+                .subquery()
+            )
+            recent_rows = (
+                self.db.query(ranked, User.full_name, User.roll_number)
+                .outerjoin(User, User.id == ranked.c.student_id)
+                .filter(ranked.c.rank <= recent_limit)
+                .order_by(ranked.c.session_id, ranked.c.rank)
+                .all()
+            )
+            
+            recent_by_session: Dict[str, List[Dict[str, Any]]] = {}
+            for row in recent_rows:
+                recent_by_session.setdefault(row.session_id, []).append({
+                    "id": str(row.id),
+                    "student_id": str(row.student_id),
+                    "student_name": row.full_name or "Unknown",
+                    "student_roll": row.roll_number or "",
+                    "marked_at": row.marked_at.isoformat(),
+                    "verification_methods": _format_verification(
+                        row.verification_mask, row.verification_metadata
+                    )["methods"]
+                })
+            
+            result = []
+            for session in sessions:
                 # Format date/time information
                 session_date = None
                 session_time = None
-                if hasattr(session, 'start_time') and session.start_time:
+                if session.start_time:
                     session_date = session.start_time.date().isoformat()
                     session_time = session.start_time.time().isoformat()
-                elif hasattr(session, 'created_at') and session.created_at:
+                elif session.created_at:
                     session_date = session.created_at.date().isoformat()
                 
                 result.append({
                     "session_id": str(session.id),
-                    "course_code": session.course_code if hasattr(session, 'course_code') else "Unknown Course",
-                    "room_number": session.room_number if hasattr(session, 'room_number') else "No Room",
+                    "course_code": session.course_code or "Unknown Course",
+                    "room_number": session.room_number or "No Room",
                     "date": session_date,
                     "time": session_time,
-                    "status": session.status.value if hasattr(session, 'status') else "UNKNOWN",
-                    "attendances_count": attendances_count,
-                    "recent_attendances": [
-                        {
-                            "id": str(a.id),
-                            "student_id": str(a.student_id),
-                            "student_name": student_info.get(str(a.student_id), {}).get("name", "Unknown"),
-                            "student_roll": student_info.get(str(a.student_id), {}).get("roll_number", ""),
-                            "marked_at": a.marked_at.isoformat(),
-                            "verification_methods": list(a.verification_factors.keys()) if a.verification_factors else []
-                        } for a in recent_attendances
-                    ]
+                    "created_at": session.created_at.isoformat() if session.created_at else None,
+                    "cursor": encode_history_cursor(session.created_at, session.id) if session.created_at else None,
+                    "status": session.status.value if session.status else "UNKNOWN",
+                    "attendances_count": counts.get(session.id, 0),
+                    "recent_attendances": recent_by_session.get(session.id, [])
                 })
                     
             return result
         except Exception as e:
             logger.error(f"Error getting faculty session attendance: {str(e)}")
-            return []
\ No newline at end of file
+            return []
@@ -0,0 +1,299 @@
+# app/services/attendance_export.py
+import csv
+import io
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.session import ReadSessionLocal
+from app.models.attendance import Attendance, VerificationFactor, ALL_VERIFICATION_FACTORS
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User
+from app.services.archive import ArchiveStore
+
+logger = logging.getLogger(__name__)
+
+STUDENT_COLUMNS = ["student_id", "roll_number", "student_name"]
+SUMMARY_COLUMNS = ["attended", "held", "percentage"]
+SESSION_EXPORT_COLUMNS = [
+    "attendance_id", "student_id", "roll_number", "student_name", "student_email",
+    "marked_at", "qr", "face", "proximity", "complete"
+]
+
+
+def session_column_label(start_time, session_id: str) -> str:
+    """Readable, unique column header for a session"""
+    when = start_time.strftime("%Y-%m-%d %H:%M") if start_time is not None else "unscheduled"
+    return f"{when} ({str(session_id)[:8]})"
+
+
+def pivot_attendance(
+    marks: pd.DataFrame,
+    sessions: pd.DataFrame,
+    verified_only: bool = False
+) -> pd.DataFrame:
+    """Pivot (student, session, mask) marks into a students x sessions matrix
+
+    `marks` has student_id, roll_number, student_name, session_id and verification_mask
+    columns. `sessions` has session_id and label columns, in column order. Cells are 1
+    when the student attended (and passed every factor if verified_only) and 0 otherwise.
+    """
+    session_index = pd.Index(sessions["session_id"])
+    held = len(session_index)
+
+    if marks.empty:
+        matrix = np.zeros((0, held), dtype=np.int8)
+        students = pd.DataFrame(columns=STUDENT_COLUMNS)
+    else:
+        student_codes, student_ids = pd.factorize(marks["student_id"], sort=True)
+        session_codes = session_index.get_indexer(marks["session_id"])
+
+        present = session_codes >= 0
+        if verified_only:
+            mask = marks["verification_mask"].to_numpy()
+            present &= (mask & int(ALL_VERIFICATION_FACTORS)) == int(ALL_VERIFICATION_FACTORS)
+
+        matrix = np.zeros((len(student_ids), held), dtype=np.int8)
+        matrix[student_codes[present], session_codes[present]] = 1
+
+        students = (
+            marks.drop_duplicates("student_id")
+            .set_index("student_id")
+            .reindex(student_ids)[["roll_number", "student_name"]]
+            .reset_index()
+        )
+        students.columns = STUDENT_COLUMNS
+
+    attended = matrix.sum(axis=1, dtype=np.int64)
+    percentage = np.round(attended * 100.0 / held, 2) if held else np.zeros(len(attended))
+
+    grid = pd.DataFrame(matrix, columns=list(sessions["label"]))
+    summary = pd.DataFrame({"attended": attended, "held": held, "percentage": percentage})
+    return pd.concat([students.reset_index(drop=True), grid, summary], axis=1)
+
+
+def iter_csv(frame: pd.DataFrame, chunk_size: int = 1000) -> Iterator[str]:
+    """Yield a DataFrame as CSV text in row chunks"""
+    yield frame.head(0).to_csv(index=False)
+    for start in range(0, len(frame), chunk_size):
+        yield frame.iloc[start:start + chunk_size].to_csv(index=False, header=False)
+
+
+def iter_csv_rows(header: Sequence[str], rows: Iterable[Sequence[Any]], flush_every: int = 500) -> Iterator[str]:
+    """Yield CSV text for rows as they arrive, buffering at most flush_every rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= flush_every:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue()
+
+
+def stream_session_attendance_csv(
+    session_id: str,
+    batch_size: int = 500,
+    session_factory: Callable[[], Session] = ReadSessionLocal,
+    archived_session: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """Stream a session's attendance as CSV using its own DB session
+
+    Streaming responses run after request dependencies have been closed,
+    so the generator owns the connection for as long as it is iterated.
+    Pass `archived_session` to read the marks from the Parquet archive.
+    """
+    db = session_factory()
+    try:
+        service = AttendanceExportService(db)
+        if archived_session is not None:
+            rows = service.iter_archived_session_rows(archived_session)
+        else:
+            rows = service.iter_session_attendance_rows(session_id, batch_size=batch_size)
+        yield from iter_csv_rows(SESSION_EXPORT_COLUMNS, rows, flush_every=batch_size)
+    finally:
+        db.close()
+
+
+def export_row(
+    attendance_id: str,
+    student_id: str,
+    roll_number: Optional[str],
+    full_name: Optional[str],
+    email: Optional[str],
+    marked_at,
+    verification_mask: Optional[int]
+) -> tuple:
+    """One row of the session export, in SESSION_EXPORT_COLUMNS order"""
+    mask = int(verification_mask or 0)
+    return (
+        attendance_id,
+        student_id,
+        roll_number or "",
+        full_name or "Unknown",
+        email or "",
+        marked_at.isoformat() if marked_at else "",
+        int(bool(mask & VerificationFactor.QR)),
+        int(bool(mask & VerificationFactor.FACE)),
+        int(bool(mask & VerificationFactor.PROXIMITY)),
+        int((mask & ALL_VERIFICATION_FACTORS) == ALL_VERIFICATION_FACTORS)
+    )
+
+
+def to_parquet_bytes(frame: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to Parquet, raising RuntimeError when no engine is installed"""
+    buffer = io.BytesIO()
+    try:
+        frame.to_parquet(buffer, index=False)
+    except ImportError as e:
+        raise RuntimeError(f"Parquet export is unavailable: {str(e)}")
+    return buffer.getvalue()
+
+
+class AttendanceExportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _get_students(self, student_ids: Sequence[str], chunk_size: int = 500) -> Dict[str, Any]:
+        """Live user rows for a set of student ids, keyed by id"""
+        student_ids = list(student_ids)
+        students = {}
+        for i in range(0, len(student_ids), chunk_size):
+            stmt = (
+                select(User.id, User.roll_number, User.full_name, User.email)
+                .where(User.id.in_(student_ids[i:i + chunk_size]))
+            )
+            for row in self.db.execute(stmt):
+                students[row.id] = row
+        return students
+
+    def get_archived_course_marks(self, course_code: str) -> pd.DataFrame:
+        """Marks of a course's archived sessions, in the same shape as get_course_marks"""
+        marks = ArchiveStore().get_course_marks(course_code)
+        students = self._get_students(marks["student_id"].unique())
+        return pd.DataFrame({
+            "student_id": marks["student_id"],
+            "roll_number": [students[sid].roll_number if sid in students else None for sid in marks["student_id"]],
+            "student_name": [students[sid].full_name if sid in students else None for sid in marks["student_id"]],
+            "session_id": marks["session_id"],
+            "verification_mask": marks["verification_mask"]
+        })
+
+    def get_course_marks(self, course_code: str) -> pd.DataFrame:
+        """Raw (student, session, mask) tuples for every mark in a course's held sessions, live and archived"""
+        stmt = (
+            select(
+                Attendance.student_id,
+                User.roll_number,
+                User.full_name.label("student_name"),
+                Attendance.session_id,
+                Attendance.verification_mask
+            )
+            .join(SessionModel, SessionModel.id == Attendance.session_id)
+            .join(User, User.id == Attendance.student_id)
+            .where(SessionModel.course_code == course_code)
+            .where(SessionModel.status == SessionStatus.COMPLETED)
+        )
+        rows = self.db.execute(stmt).all()
+        marks = pd.DataFrame.from_records(
+            rows,
+            columns=["student_id", "roll_number", "student_name", "session_id", "verification_mask"]
+        )
+        archived = self.get_archived_course_marks(course_code)
+        if archived.empty:
+            return marks
+        return pd.concat([archived, marks], ignore_index=True)
+
+    def get_course_sessions(self, course_code: str) -> pd.DataFrame:
+        """Sessions held for a course, oldest first, with their column labels
+
+        Held means completed, as for /attendance/percentage: a session joins the
+        matrix once it has ended. Archived sessions always started before the
+        live ones, so they come first.
+        """
+        stmt = (
+            select(SessionModel.id, SessionModel.start_time)
+            .where(SessionModel.course_code == course_code)
+            .where(SessionModel.status == SessionStatus.COMPLETED)
+            .order_by(SessionModel.start_time, SessionModel.id)
+        )
+        rows = [(row.id, row.start_time) for row in self.db.execute(stmt)]
+        archived = ArchiveStore().get_course_sessions(course_code)
+        if not archived.empty:
+            archived = archived.sort_values(["start_time", "id"], kind="stable")
+            rows = [
+                (session_id, start_time.to_pydatetime() if not pd.isna(start_time) else None)
+                for session_id, start_time in zip(archived["id"], archived["start_time"])
+            ] + rows
+        return pd.DataFrame({
+            "session_id": [session_id for session_id, _ in rows],
+            "label": [session_column_label(start_time, session_id) for session_id, start_time in rows]
+        })
+
+    def get_course_matrix(self, course_code: str, verified_only: bool = False) -> Optional[pd.DataFrame]:
+        """Students x sessions attendance matrix with per-student percentages
+
+        Returns None when the course has no sessions
+        """
+        sessions = self.get_course_sessions(course_code)
+        if sessions.empty:
+            return None
+        marks = self.get_course_marks(course_code)
+        logger.info(
+            f"Building attendance matrix for {course_code}: "
+            f"{len(marks)} marks across {len(sessions)} sessions"
+        )
+        return pivot_attendance(marks, sessions, verified_only=verified_only)
+
+    def iter_session_attendance_rows(self, session_id: str, batch_size: int = 500) -> Iterator[tuple]:
+        """Yield one export row per mark in a session, fetched batch_size rows at a time"""
+        stmt = (
+            select(
+                Attendance.id,
+                Attendance.student_id,
+                User.roll_number,
+                User.full_name,
+                User.email,
+                Attendance.marked_at,
+                Attendance.verification_mask
+            )
+            .outerjoin(User, User.id == Attendance.student_id)
+            .where(Attendance.session_id == str(session_id))
+            .order_by(Attendance.marked_at)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in self.db.execute(stmt):
+            yield export_row(
+                row.id,
+                row.student_id,
+                row.roll_number,
+                row.full_name,
+                row.email,
+                row.marked_at,
+                row.verification_mask
+            )
+
+    def iter_archived_session_rows(self, session: Dict[str, Any]) -> Iterator[tuple]:
+        """Export rows for an archived session, with student details from the live users table"""
+        marks = ArchiveStore().get_session_marks(session)
+        students = self._get_students(marks["student_id"].unique())
+        for mark in marks.itertuples(index=False):
+            student = students.get(mark.student_id)
+            yield export_row(
+                mark.id,
+                mark.student_id,
+                student.roll_number if student else None,
+                student.full_name if student else None,
+                student.email if student else None,
+                mark.marked_at.to_pydatetime() if not pd.isna(mark.marked_at) else None,
+                mark.verification_mask
+            )
@@ -0,0 +1,211 @@
+# app/services/attendance_stats.py
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+import uuid
+
+from sqlalchemy import extract, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timetable import term_for
+from app.models.attendance import Attendance
+from app.models.rollup import CourseSessionCounter, StudentCourseCounter
+from app.models.session import Session as SessionModel, SessionStatus
+from app.services.archive import ArchiveStore
+
+logger = logging.getLogger(__name__)
+
+
+def attendance_percentage(attended: int, held: int) -> float:
+    """Percentage of held sessions attended, capped at 100
+
+    A mark in a session that has not ended yet is counted before the
+    session is, so attended can briefly run ahead of held.
+    """
+    if held <= 0:
+        return 100.0 if attended else 0.0
+    return round(min(attended, held) * 100.0 / held, 2)
+
+
+def session_term(session: Any) -> str:
+    """Term a session's counts go to, from when it started"""
+    return term_for(session.start_time or session.created_at)
+
+
+class AttendanceStatsService:
+    """Per-course, per-term attended/held counters kept up to date on every write
+
+    Counts are kept separately for each term (see term_for), so a student's
+    percentage covers the current offering of a course only. The increment helpers do not commit; callers fold them into the same
+    transaction as the mark or session change they describe.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _increment(self, model, column, filters: Dict[str, Any], amount: int = 1) -> None:
+        """UPDATE counter = counter + amount, inserting the row the first time"""
+        criteria = [getattr(model, key) == value for key, value in filters.items()]
+        updated = self.db.query(model).filter(*criteria).update(
+            {column: column + amount}, synchronize_session=False
+        )
+        if updated:
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.add(model(**filters, **{column.key: amount}))
+        except IntegrityError:
+            # Another writer created the row first
+            self.db.query(model).filter(*criteria).update(
+                {column: column + amount}, synchronize_session=False
+            )
+
+    def record_mark(self, student_id: Union[str, uuid.UUID], course_code: str, term: str) -> None:
+        """Count one attended session for a student"""
+        self._increment(
+            StudentCourseCounter,
+            StudentCourseCounter.attended,
+            {"student_id": str(student_id), "course_code": course_code, "term": term}
+        )
+
+    def record_session_held(self, course_code: str, term: str, count: int = 1) -> None:
+        """Count held sessions for a course, one unless several ended together"""
+        self._increment(
+            CourseSessionCounter,
+            CourseSessionCounter.held,
+            {"course_code": course_code, "term": term},
+            amount=count
+        )
+
+    def forget_session(self, session: SessionModel) -> None:
+        """Take back what a session added to the counters; call before deleting or cancelling it
+
+        Its marks counted as attended once made, and the session counted as
+        held once it completed, the same statuses rebuild() counts.
+        """
+        if session.status not in (SessionStatus.ACTIVE, SessionStatus.COMPLETED):
+            return
+        term = session_term(session)
+        if session.status == SessionStatus.COMPLETED:
+            self.db.query(CourseSessionCounter).filter(
+                CourseSessionCounter.course_code == session.course_code,
+                CourseSessionCounter.term == term
+            ).update({CourseSessionCounter.held: CourseSessionCounter.held - 1}, synchronize_session=False)
+        marked = self.db.query(Attendance.student_id).filter(Attendance.session_id == session.id)
+        self.db.query(StudentCourseCounter).filter(
+            StudentCourseCounter.course_code == session.course_code,
+            StudentCourseCounter.term == term,
+            StudentCourseCounter.student_id.in_(marked.scalar_subquery())
+        ).update({StudentCourseCounter.attended: StudentCourseCounter.attended - 1}, synchronize_session=False)
+
+    def get_student_summary(
+        self,
+        student_id: Union[str, uuid.UUID],
+        threshold: Optional[float] = None,
+        term: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Attended/held counts and percentages per course for one student, for the current term by default"""
+        threshold = settings.ATTENDANCE_THRESHOLD_PERCENT if threshold is None else threshold
+        term = term or term_for(datetime.utcnow())
+        rows = (
+            self.db.query(
+                StudentCourseCounter.course_code,
+                StudentCourseCounter.attended,
+                func.coalesce(CourseSessionCounter.held, 0)
+            )
+            .outerjoin(CourseSessionCounter, (
+                (CourseSessionCounter.course_code == StudentCourseCounter.course_code)
+                & (CourseSessionCounter.term == StudentCourseCounter.term)
+            ))
+            .filter(StudentCourseCounter.student_id == str(student_id), StudentCourseCounter.term == term)
+            .order_by(StudentCourseCounter.course_code)
+            .all()
+        )
+
+        courses = []
+        for course_code, attended, held in rows:
+            percentage = attendance_percentage(attended, held)
+            courses.append({
+                "course_code": course_code,
+                "attended": attended,
+                "held": held,
+                "percentage": percentage,
+                "below_threshold": held > 0 and percentage < threshold
+            })
+
+        return {
+            "student_id": str(student_id),
+            "term": term,
+            "threshold": threshold,
+            "below_threshold": any(course["below_threshold"] for course in courses),
+            "courses": courses
+        }
+
+    def _archived_counts(self) -> Tuple[Counter, Counter]:
+        """Held sessions and attended marks moved to the Parquet archive, by the same keys as rebuild()"""
+        store = ArchiveStore()
+        if not store.files("sessions"):
+            return Counter(), Counter()
+        # Only completed and cancelled sessions are archived; the completed ones were held
+        sessions = store.read("sessions", filter=store.field("status") == SessionStatus.COMPLETED.value)
+        marks = store.read("attendance", filter=store.field("session_id").isin(list(sessions["id"])))
+        held = Counter({
+            key: int(count) for key, count in sessions.groupby(["course_code", "term"]).size().items()
+        })
+        attended = Counter({
+            key: int(count) for key, count in marks.groupby(["student_id", "course_code", "term"]).size().items()
+        })
+        return held, attended
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every counter from the session and attendance tables and the archive"""
+        started = func.coalesce(SessionModel.start_time, SessionModel.created_at)
+        year, month = extract("year", started), extract("month", started)
+
+        def by_term(rows) -> Counter:
+            # Rows come grouped by month; fold them into terms
+            counts = Counter()
+            for *key, row_year, row_month, count in rows:
+                when = datetime(int(row_year), int(row_month), 1) if row_year is not None else None
+                counts[(*key, term_for(when))] += count
+            return counts
+
+        held = by_term(
+            self.db.query(SessionModel.course_code, year, month, func.count(SessionModel.id))
+            .filter(SessionModel.status == SessionStatus.COMPLETED)
+            .group_by(SessionModel.course_code, year, month)
+            .all()
+        )
+        attended = by_term(
+            self.db.query(Attendance.student_id, SessionModel.course_code, year, month, func.count(Attendance.id))
+            .join(SessionModel, SessionModel.id == Attendance.session_id)
+            .filter(SessionModel.status.in_([SessionStatus.ACTIVE, SessionStatus.COMPLETED]))
+            .group_by(Attendance.student_id, SessionModel.course_code, year, month)
+            .all()
+        )
+
+        archived_held, archived_attended = self._archived_counts()
+        held.update(archived_held)
+        attended.update(archived_attended)
+
+        try:
+            self.db.query(CourseSessionCounter).delete(synchronize_session=False)
+            self.db.query(StudentCourseCounter).delete(synchronize_session=False)
+            self.db.add_all(
+                CourseSessionCounter(course_code=course_code, term=term, held=count)
+                for (course_code, term), count in held.items()
+            )
+            self.db.add_all(
+                StudentCourseCounter(student_id=student_id, course_code=course_code, term=term, attended=count)
+                for (student_id, course_code, term), count in attended.items()
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Rebuilt attendance counters for {len(held)} course terms and {len(attended)} student courses")
+        return {"courses": len(held), "student_courses": len(attended)}
@@ -1,11 +1,16 @@
 # app/services/course.py
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import RenderedJSON, VersionedCache, render_json
 from app.models.course import Course
-from app.schemas.course import CourseCreate, CourseUpdate
+from app.schemas.course import Course as CourseSchema, CourseCreate, CourseUpdate
+
+# Serialized list, rebuilt on the first read after any course write
+course_list_cache = VersionedCache("courses", tables=("courses",))
 
 class CourseService:
     def __init__(self, db: Session):
@@ -23,6 +28,14 @@ class CourseService:
         """Get all courses"""
         return self.db.query(Course).all()
     
+    def get_all_courses_json(self) -> RenderedJSON:
+        """All courses as a serialized list body and its ETag, from the in-process cache"""
+        def render() -> RenderedJSON:
+            courses = self.db.query(Course).order_by(Course.course_code, Course.id).all()
+            return render_json({"courses": [CourseSchema.model_validate(course, from_attributes=True) for course in courses]})
+        
+        return course_list_cache.get("all", render)
+    
     def create_course(self, course_in: CourseCreate) -> Course:
         """Create new course"""
         # Check if course with this code already exists
@@ -68,6 +81,8 @@ class CourseService:
         # Update fields
         for field, value in course_data.items():
             setattr(db_course, field, value)
+        # Microseconds, so two edits in one second still change get_assignments_version
+        db_course.updated_at = datetime.utcnow()
         
         # Save changes
         self.db.commit()
@@ -0,0 +1,179 @@
+# app/services/enrollment.py
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, insert, or_
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.core.config import settings
+from app.models.attendance import Attendance
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.session import Session as SessionModel
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Sorted rosters per course code, rebuilt after any enrollment, course or user write
+roster_cache = VersionedCache("rosters", tables=("enrollments", "courses", "user"))
+
+
+class RosterEntry(NamedTuple):
+    id: str
+    full_name: str
+    email: str
+    roll_number: Optional[str]
+
+
+class Roster(NamedTuple):
+    """A course's enrolled students, sorted by id so absentees are a linear merge"""
+    ids: Tuple[str, ...]
+    students: Tuple[RosterEntry, ...]
+
+
+def _roster_order(entry: RosterEntry) -> Tuple[str, str]:
+    return entry.roll_number or "", entry.full_name
+
+
+def sorted_difference(roster: Sequence[str], attended: Sequence[str]) -> List[int]:
+    """Positions in the sorted roster of ids missing from the sorted attended ids, in one merge pass"""
+    missing = []
+    j = 0
+    for i, student_id in enumerate(roster):
+        while j < len(attended) and attended[j] < student_id:
+            j += 1
+        if j == len(attended) or attended[j] != student_id:
+            missing.append(i)
+    return missing
+
+
+class EnrollmentService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _roster_query(self, course_code: str):
+        return (
+            self.db.query(User.id, User.full_name, User.email, User.roll_number)
+            .join(Enrollment, Enrollment.student_id == User.id)
+            .join(Course, Course.id == Enrollment.course_id)
+            .filter(Course.course_code == course_code)
+        )
+
+    def get_roster(self, course_code: str) -> List[RosterEntry]:
+        """Enrolled students of a course, by roll number then name"""
+        rows = self._roster_query(course_code).order_by(User.roll_number, User.full_name, User.id)
+        return [RosterEntry(*row) for row in rows]
+
+    def get_cached_roster(self, course_code: str) -> Roster:
+        """The course roster as a sorted id array, from the in-process cache"""
+        def build() -> Roster:
+            rows = self._roster_query(course_code).order_by(User.id)
+            students = tuple(RosterEntry(*row) for row in rows)
+            return Roster(tuple(student.id for student in students), students)
+
+        return roster_cache.get(course_code, build)
+
+    def enroll_students(
+        self,
+        course_id: str,
+        student_ids: Iterable[str] = (),
+        roll_numbers: Iterable[str] = (),
+        emails: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """Add students to a course roster in one lookup and one multi-row insert
+
+        Students can be named by id, roll number or email; already enrolled
+        ones are skipped. Raises ValueError if the course does not exist.
+        """
+        if not self.db.query(Course.id).filter(Course.id == course_id).first():
+            raise ValueError(f"Course {course_id} not found")
+
+        wanted = {"id": set(map(str, student_ids)), "roll_number": set(roll_numbers), "email": set(emails)}
+        if not any(wanted.values()):
+            return {"enrolled": 0, "already_enrolled": 0, "not_found": []}
+
+        columns = {"id": User.id, "roll_number": User.roll_number, "email": User.email}
+        rows = (
+            self.db.query(User.id, User.roll_number, User.email)
+            .filter(
+                User.role == UserRole.STUDENT,
+                or_(*[columns[key].in_(values) for key, values in wanted.items() if values])
+            )
+            .all()
+        )
+        found = {key: set() for key in wanted}
+        students = set()
+        for student_id, roll_number, email in rows:
+            students.add(student_id)
+            found["id"].add(student_id)
+            found["roll_number"].add(roll_number)
+            found["email"].add(email)
+        not_found = sorted(value for key, values in wanted.items() for value in values - found[key])
+
+        enrolled = {
+            student_id for (student_id,) in
+            self.db.query(Enrollment.student_id).filter(
+                Enrollment.course_id == course_id, Enrollment.student_id.in_(students)
+            )
+        }
+        new = sorted(students - enrolled)
+        if new:
+            now = datetime.utcnow()
+            self.db.execute(insert(Enrollment), [
+                {"id": str(uuid.uuid4()), "course_id": course_id, "student_id": student_id, "created_at": now}
+                for student_id in new
+            ])
+        self.db.commit()
+        logger.info(f"Enrolled {len(new)} students in course {course_id}")
+        return {"enrolled": len(new), "already_enrolled": len(students) - len(new), "not_found": not_found}
+
+    def unenroll_student(self, course_id: str, student_id: str) -> bool:
+        """Remove a student from a course roster"""
+        deleted = (
+            self.db.query(Enrollment)
+            .filter(Enrollment.course_id == course_id, Enrollment.student_id == str(student_id))
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted > 0
+
+    def get_session_absentees(self, session: SessionModel, use_cache: Optional[bool] = None) -> Dict[str, Any]:
+        """Enrolled students of the session's course who have no mark in it
+
+        By default this is one anti-join: roster minus attendance. With
+        ROSTER_CACHE_ENABLED the roster comes from memory instead and only
+        the session's attended ids are read.
+        """
+        use_cache = settings.ROSTER_CACHE_ENABLED if use_cache is None else use_cache
+        marks = [Attendance.session_id == session.id]
+        if session.start_time is not None:
+            # Lets PostgreSQL skip attendance partitions from before the session
+            marks.append(Attendance.marked_at >= session.start_time)
+
+        if use_cache:
+            roster = self.get_cached_roster(session.course_code)
+            attended = [
+                student_id for (student_id,) in
+                self.db.query(Attendance.student_id).filter(*marks).order_by(Attendance.student_id)
+            ]
+            absentees = sorted(
+                (roster.students[i] for i in sorted_difference(roster.ids, attended)), key=_roster_order
+            )
+        else:
+            attended_exists = exists().where(and_(Attendance.student_id == User.id, *marks))
+            rows = (
+                self._roster_query(session.course_code)
+                .filter(~attended_exists)
+                .order_by(User.roll_number, User.full_name, User.id)
+            )
+            absentees = [RosterEntry(*row) for row in rows]
+
+        return {
+            "session_id": session.id,
+            "course_code": session.course_code,
+            "absent": len(absentees),
+            "absentees": [student._asdict() for student in absentees]
+        }
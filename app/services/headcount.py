@@ -0,0 +1,149 @@
+# app/services/headcount.py
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.attendance import Attendance
+from app.models.room import Room
+from app.models.session import Session as SessionModel
+
+logger = logging.getLogger(__name__)
+
+
+class Headcount(NamedTuple):
+    count: int
+    capacity: Optional[int]
+
+
+class _Entry:
+    __slots__ = ("count", "capacity", "pending", "seeded_at")
+
+    def __init__(self, count: int, capacity: Optional[int], pending: int = 0):
+        self.count = count
+        self.capacity = capacity
+        # Places reserved by marks that are not committed yet, so no COUNT sees them
+        self.pending = pending
+        self.seeded_at = time.monotonic()
+
+
+class HeadcountRegistry:
+    """Marks so far in each active session, kept in process memory
+
+    Entries are seeded from a COUNT when a session starts (or is first
+    seen by this worker) and then changed under a lock on every mark, so
+    reads and capacity checks need no query. Each worker keeps its own
+    copy; re-seeding every HEADCOUNT_RESYNC_SECONDS, and before any mark
+    within HEADCOUNT_CONFIRM_MARGIN of capacity, folds in marks taken by
+    other workers.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def seed(self, session_id: str, count: int, capacity: Optional[int]) -> Headcount:
+        """Replace the headcount with a fresh COUNT, keeping places still reserved in this worker"""
+        with self._lock:
+            entry = self._entries.get(str(session_id))
+            pending = entry.pending if entry else 0
+            self._entries[str(session_id)] = _Entry(count + pending, capacity, pending)
+        return Headcount(count + pending, capacity)
+
+    def get(self, session_id: str) -> Optional[Headcount]:
+        entry = self._entries.get(str(session_id))
+        return Headcount(entry.count, entry.capacity) if entry else None
+
+    def is_stale(self, session_id: str) -> bool:
+        entry = self._entries.get(str(session_id))
+        if entry is None:
+            return True
+        resync = settings.HEADCOUNT_RESYNC_SECONDS
+        return resync > 0 and time.monotonic() - entry.seeded_at > resync
+
+    def near_capacity(self, session_id: str) -> bool:
+        """True when the room has HEADCOUNT_CONFIRM_MARGIN or fewer places left"""
+        entry = self._entries.get(str(session_id))
+        return (
+            entry is not None and entry.capacity is not None
+            and entry.capacity - entry.count <= settings.HEADCOUNT_CONFIRM_MARGIN
+        )
+
+    def reserve(self, session_id: str) -> bool:
+        """Take a place for one mark; False if the room is already full"""
+        with self._lock:
+            entry = self._entries.get(str(session_id))
+            if entry is None:
+                return True
+            if entry.capacity is not None and entry.count >= entry.capacity:
+                return False
+            entry.count += 1
+            entry.pending += 1
+            return True
+
+    def confirm(self, session_id: str) -> None:
+        """The reserved mark is committed; a COUNT sees it from now on"""
+        with self._lock:
+            entry = self._entries.get(str(session_id))
+            if entry is not None and entry.pending > 0:
+                entry.pending -= 1
+
+    def release(self, session_id: str) -> None:
+        """Give back a place taken by a mark that was not recorded"""
+        with self._lock:
+            entry = self._entries.get(str(session_id))
+            if entry is not None:
+                entry.count = max(entry.count - 1, 0)
+                entry.pending = max(entry.pending - 1, 0)
+
+    def drop(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(str(session_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+headcounts = HeadcountRegistry()
+
+
+class HeadcountService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def count_marks(self, session: SessionModel) -> Headcount:
+        """Marks in a session and its room's capacity, in one query"""
+        marks = select(func.count(Attendance.id)).where(Attendance.session_id == session.id)
+        if session.start_time is not None:
+            marks = marks.where(Attendance.marked_at >= session.start_time)
+        capacity = select(Room.capacity).where(Room.room_number == session.room_number)
+        count, room_capacity = self.db.query(marks.scalar_subquery(), capacity.scalar_subquery()).one()
+        return Headcount(count or 0, room_capacity)
+
+    def seed(self, session: SessionModel) -> Headcount:
+        """Start tracking an active session from its current COUNT"""
+        count, capacity = self.count_marks(session)
+        logger.debug(f"Seeded headcount for session {session.id}: {count}/{capacity}")
+        return headcounts.seed(session.id, count, capacity)
+
+    def get_live(self, session: SessionModel) -> Headcount:
+        """Current headcount of an active session, seeding it on first use or when stale"""
+        if headcounts.is_stale(session.id):
+            return self.seed(session)
+        return headcounts.get(session.id) or self.seed(session)
+
+    def get_for_mark(self, session: SessionModel) -> Headcount:
+        """Headcount to check a new mark against
+
+        Close to capacity it is confirmed with a COUNT first, since marks
+        taken by other workers may already have filled the room.
+        """
+        headcount = self.get_live(session)
+        if headcounts.near_capacity(session.id):
+            return self.seed(session)
+        return headcount
@@ -0,0 +1,83 @@
+# app/services/overview.py
+import json
+import logging
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.models.assignment import Assignment
+from app.models.course import Course
+from app.models.room import Room
+from app.models.user import User, UserRole
+from app.schemas.course import Course as CourseSchema
+from app.schemas.room import Room as RoomSchema
+from app.schemas.user import User as UserSchema
+from app.services.assignment import AssignmentService
+
+logger = logging.getLogger(__name__)
+
+# Rebuilt whenever any of these tables is written
+overview_cache = VersionedCache("admin_overview", tables=("user", "courses", "rooms", "assignments"))
+
+
+class OverviewService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_counts(self) -> Dict[str, int]:
+        """Collection sizes for the dashboard header, in four aggregate queries"""
+        users = self.db.query(
+            func.count(User.id),
+            func.sum(case((User.is_active.is_(True), 1), else_=0)),
+            *[func.sum(case((User.role == role, 1), else_=0)) for role in UserRole]
+        ).one()
+        assignments = self.db.query(
+            func.count(Assignment.id),
+            func.sum(case((Assignment.is_active.is_(True), 1), else_=0))
+        ).one()
+
+        counts = {
+            "users": users[0] or 0,
+            "active_users": users[1] or 0,
+            "courses": self.db.query(func.count(Course.id)).scalar() or 0,
+            "rooms": self.db.query(func.count(Room.id)).scalar() or 0,
+            "assignments": assignments[0] or 0,
+            "active_assignments": assignments[1] or 0
+        }
+        for role, count in zip(UserRole, users[2:]):
+            counts[f"{role.value.lower()}_users"] = count or 0
+        return counts
+
+    def build_overview(self, limit: int = 100) -> Dict[str, Any]:
+        """Counts plus the first page of users, courses, rooms and assignments"""
+        users = self.db.query(User).order_by(User.full_name, User.id).limit(limit).all()
+        courses = self.db.query(Course).order_by(Course.course_code).limit(limit).all()
+        rooms = self.db.query(Room).order_by(Room.room_number).limit(limit).all()
+        faculty = (
+            self.db.query(User.id, User.full_name)
+            .filter(User.role == UserRole.FACULTY, User.is_active.is_(True))
+            .order_by(User.full_name)
+            .all()
+        )
+
+        return {
+            "counts": self.get_counts(),
+            "limit": limit,
+            "users": [UserSchema.model_validate(user, from_attributes=True) for user in users],
+            "courses": [CourseSchema.model_validate(course, from_attributes=True) for course in courses],
+            "rooms": [RoomSchema.model_validate(room, from_attributes=True) for room in rooms],
+            "assignments": AssignmentService(self.db).get_assignments_with_details(limit=limit),
+            # Every active faculty member, for the assignment dropdowns
+            "faculty": [{"id": faculty_id, "full_name": name} for faculty_id, name in faculty]
+        }
+
+    def get_overview_json(self, limit: int = 100) -> bytes:
+        """Serialized overview, served from the in-process cache until the next write"""
+        def render() -> bytes:
+            logger.info(f"Building admin overview (limit={limit})")
+            return json.dumps(jsonable_encoder(self.build_overview(limit))).encode()
+
+        return overview_cache.get(limit, render)
@@ -40,13 +40,19 @@ class QRCodeService:
         faculty_id: str, 
         course_code: str, 
         room_number: str, 
-        proximity_uuid: str
+        proximity_uuid: str,
+        expires_at: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Generate QR code for an attendance session
         
-        Returns the QR data and image URL
+        Returns the QR data and image URL. The token lasts QR_CODE_EXPIRY_MINUTES
+        unless expires_at is given.
         """
         try:
+            if expires_at is None:
+                expires_at = datetime.utcnow() + timedelta(minutes=settings.QR_CODE_EXPIRY_MINUTES)
+
+
             # 1. Prepare QR data
             session_data = {
                 "session_id": session_id,
@@ -55,8 +61,7 @@ class QRCodeService:
                 "room_number": room_number or "Not specified",
                 "proximity_uuid": proximity_uuid,  # Same UUID for BLE broadcasting
                 "timestamp": datetime.utcnow().isoformat(),
-                "expires_at": (datetime.utcnow() + 
-                    timedelta(minutes=settings.QR_CODE_EXPIRY_MINUTES)).isoformat()
+                "expires_at": expires_at.isoformat()
             }
             
             # 2. Encrypt the data
@@ -78,6 +83,8 @@ class QRCodeService:
             filename = f"session_{session_id}.png"
             img_path = os.path.join(self.qr_path, filename)
             img.save(img_path)
+            # Any stored payload described the image just replaced
+            self._remove_stored_payload(session_id)
             
             # Add these debug lines:
             print(f"QR code saved to: {img_path}")
@@ -99,6 +106,36 @@ class QRCodeService:
             logger.error(f"Error generating QR code: {str(e)}")
             raise RuntimeError(f"Failed to generate QR code: {str(e)}")
     
+    def pregenerate_session_qr(
+        self,
+        session_id: str,
+        faculty_id: str,
+        course_code: str,
+        room_number: str,
+        proximity_uuid: str,
+        expires_at: datetime
+    ) -> Dict[str, Any]:
+        """Generate a QR code ahead of time and keep its payload for get_pregenerated_qr"""
+        qr_data = self.generate_session_qr(
+            session_id, faculty_id, course_code, room_number, proximity_uuid, expires_at=expires_at
+        )
+        with open(self._payload_path(session_id), "w") as f:
+            json.dump(qr_data, f)
+        return qr_data
+
+    def get_pregenerated_qr(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored QR code for a session while its token is still valid"""
+        try:
+            with open(self._payload_path(session_id)) as f:
+                qr_data = json.load(f)
+            if datetime.utcnow() >= datetime.fromisoformat(qr_data["expires_at"]):
+                return None
+            if not os.path.exists(os.path.join(self.qr_path, f"session_{session_id}.png")):
+                return None
+            return qr_data
+        except (OSError, ValueError, KeyError):
+            return None
+
     def refresh_session_qr(
         self, 
         session_id: str, 
@@ -170,9 +207,28 @@ class QRCodeService:
             if os.path.exists(file_path):
                 os.remove(file_path)
                 logger.info(f"Removed old QR code for session {session_id}")
+            self._remove_stored_payload(session_id)
         except Exception as e:
             logger.warning(f"Failed to remove old QR code: {str(e)}")
 
+    def _payload_path(self, session_id: str) -> str:
+        """Path of the stored payload for a pre-generated QR code"""
+        return os.path.join(self.qr_path, f"session_{session_id}.json")
+
+    def _remove_stored_payload(self, session_id: str) -> None:
+        """Remove the stored payload for a session if it exists"""
+        payload_path = self._payload_path(session_id)
+        if os.path.exists(payload_path):
+            os.remove(payload_path)
+
+    def _stored_expiry(self, session_id: str) -> Optional[datetime]:
+        """Expiry of the stored payload for a session, if there is one"""
+        try:
+            with open(self._payload_path(session_id)) as f:
+                return datetime.fromisoformat(json.load(f)["expires_at"])
+        except (OSError, ValueError, KeyError):
+            return None
+
     def cleanup_expired_qr_codes(self) -> int:
         """Clean up expired QR code files
         
@@ -184,6 +240,17 @@ class QRCodeService:
             for filename in os.listdir(self.qr_path):
                 if filename.startswith("session_") and filename.endswith(".png"):
                     file_path = os.path.join(self.qr_path, filename)
+                    session_id = filename[len("session_"):-len(".png")]
+
+                    # Pre-generated codes last as long as their stored expiry says
+                    stored_expiry = self._stored_expiry(session_id)
+                    if stored_expiry is not None:
+                        if stored_expiry + timedelta(minutes=5) < datetime.utcnow():
+                            os.remove(file_path)
+                            self._remove_stored_payload(session_id)
+                            count += 1
+                            logger.info(f"Removed expired QR code file: {filename}")
+                        continue
                     
                     # Check file age
                     file_time = os.path.getmtime(file_path)
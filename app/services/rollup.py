@@ -0,0 +1,273 @@
+# app/services/rollup.py
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import ReadSessionLocal, SessionLocal
+from app.models.attendance import ALL_VERIFICATION_FACTORS, Attendance, VerificationFactor
+from app.models.rollup import CourseDailyAttendance, StudentMonthlyAttendance, RollupState
+from app.models.session import Session as SessionModel
+from app.services.archive import ArchiveStore
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "attendance_rollups"
+COUNTERS = ("marks", "complete", "qr", "face", "proximity")
+UPSERT_BATCH_ROWS = 500  # Rows per upsert statement, well inside SQLite's bound-parameter limit
+
+
+def _as_date(value) -> date:
+    """SQLite returns DATE() as text, PostgreSQL as a date"""
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class RollupService:
+    """Incremental rollups; `reader` runs the heavy aggregate, `db` only the short write
+
+    Without a reader every query goes through `db`.
+    """
+
+    def __init__(self, db: Session, reader: Optional[Session] = None):
+        self.db = db
+        self.reader = reader or db
+
+    def get_high_water_mark(self, name: str = ROLLUP_NAME) -> Optional[datetime]:
+        """Where a named incremental job got to, read without taking the write lock"""
+        return self.reader.query(RollupState.high_water_mark).filter(RollupState.name == name).scalar()
+
+    def get_state(self, name: str = ROLLUP_NAME) -> RollupState:
+        """High-water mark row for a named incremental job, created on first use"""
+        state = self.db.query(RollupState).filter(RollupState.name == name).first()
+        if not state:
+            state = RollupState(name=name, high_water_mark=None)
+            self.db.add(state)
+            self.db.flush()
+        return state
+
+    def advance(self, start: Optional[datetime], cutoff: datetime, name: str = ROLLUP_NAME) -> bool:
+        """Move the high-water mark from `start` to `cutoff` in the current transaction
+
+        Returns False when another run has already moved it, and the caller
+        must then roll back. The UPDATE holds the state row until commit, so
+        overlapping runs cannot both fold in the same marks.
+        """
+        at_start = RollupState.high_water_mark.is_(None) if start is None else RollupState.high_water_mark == start
+        moved = self.db.query(RollupState).filter(RollupState.name == name, at_start).update(
+            {RollupState.high_water_mark: cutoff, RollupState.updated_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        if moved:
+            return True
+        if start is not None or self.db.query(RollupState.id).filter(RollupState.name == name).first():
+            return False
+        # First run: the unique name stops a second first run at flush
+        self.db.add(RollupState(name=name, high_water_mark=cutoff))
+        try:
+            self.db.flush()
+        except IntegrityError:
+            return False
+        return True
+
+    def _aggregate(self, start: Optional[datetime], end: datetime) -> List[Tuple]:
+        """Per (student, course, day) counts for marks in [start, end)"""
+        day = func.date(Attendance.marked_at)
+        query = (
+            self.reader.query(
+                Attendance.student_id,
+                SessionModel.course_code,
+                day.label("day"),
+                func.count(Attendance.id),
+                func.sum(case((Attendance.is_complete(), 1), else_=0)),
+                func.sum(case((Attendance.has_factor(VerificationFactor.QR), 1), else_=0)),
+                func.sum(case((Attendance.has_factor(VerificationFactor.FACE), 1), else_=0)),
+                func.sum(case((Attendance.has_factor(VerificationFactor.PROXIMITY), 1), else_=0))
+            )
+            .join(SessionModel, SessionModel.id == Attendance.session_id)
+            .filter(Attendance.marked_at < end)
+        )
+        if start is not None:
+            query = query.filter(Attendance.marked_at >= start)
+        return query.group_by(Attendance.student_id, SessionModel.course_code, day).all()
+
+    def _apply(self, model, key_columns: Tuple[str, ...], deltas: Dict[Tuple, List[int]]) -> None:
+        """Add counter deltas onto rollup rows with INSERT ... ON CONFLICT DO UPDATE
+
+        Only the touched rows are written and no existing row is loaded.
+        Other dialects fall back to loading exactly the touched keys.
+        """
+        if not deltas:
+            return
+        dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(self.db.get_bind().dialect.name)
+        if dialect is None:
+            self._apply_loaded(model, key_columns, deltas)
+            return
+
+        table = model.__table__
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                **dict(zip(key_columns, key)),
+                **{name: int(value or 0) for name, value in zip(COUNTERS, counts)},
+                "updated_at": now
+            }
+            for key, counts in deltas.items()
+        ]
+        for i in range(0, len(rows), UPSERT_BATCH_ROWS):
+            upsert = dialect.insert(table).values(rows[i:i + UPSERT_BATCH_ROWS])
+            self.db.execute(upsert.on_conflict_do_update(
+                index_elements=[table.c[column] for column in key_columns],
+                set_={
+                    **{name: table.c[name] + upsert.excluded[name] for name in COUNTERS},
+                    "updated_at": upsert.excluded.updated_at
+                }
+            ))
+
+    def _apply_loaded(self, model, key_columns: Tuple[str, ...], deltas: Dict[Tuple, List[int]]) -> None:
+        """Add counter deltas by loading the touched rows, creating missing ones"""
+        columns = [getattr(model, column) for column in key_columns]
+        existing = {}
+        keys = list(deltas)
+        for i in range(0, len(keys), UPSERT_BATCH_ROWS):
+            rows = self.db.query(model).filter(tuple_(*columns).in_(keys[i:i + UPSERT_BATCH_ROWS])).all()
+            for row in rows:
+                existing[tuple(getattr(row, column) for column in key_columns)] = row
+
+        for key, counts in deltas.items():
+            row = existing.get(key)
+            if row is None:
+                row = model(**dict(zip(key_columns, key)), **{name: 0 for name in COUNTERS})
+                self.db.add(row)
+            for name, value in zip(COUNTERS, counts):
+                setattr(row, name, (getattr(row, name) or 0) + int(value or 0))
+
+    def refresh(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Fold marks newer than the high-water mark into the rollup tables
+
+        Marks younger than ROLLUP_LAG_SECONDS are left for the next run so a
+        mark committed slightly late is never skipped.
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+        start = self.get_high_water_mark()
+        if start is not None and start >= cutoff:
+            return {"processed_groups": 0, "high_water_mark": start}
+
+        course_deltas: Dict[Tuple, List[int]] = defaultdict(lambda: [0] * len(COUNTERS))
+        student_deltas: Dict[Tuple, List[int]] = defaultdict(lambda: [0] * len(COUNTERS))
+        groups = self._aggregate(start, cutoff)
+        for student_id, course_code, day, *counts in groups:
+            day = _as_date(day)
+            month = day.replace(day=1)
+            for i, value in enumerate(counts):
+                course_deltas[(course_code, day)][i] += int(value or 0)
+                student_deltas[(student_id, course_code, month)][i] += int(value or 0)
+
+        # The write transaction starts here, after the aggregate has been read
+        try:
+            if not self.advance(start, cutoff):
+                self.db.rollback()
+                logger.info(f"Rollups from {start} were already refreshed by another run")
+                return {"processed_groups": 0, "high_water_mark": self.get_high_water_mark()}
+            self._apply(CourseDailyAttendance, ("course_code", "day"), course_deltas)
+            self._apply(StudentMonthlyAttendance, ("student_id", "course_code", "month"), student_deltas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Rollups refreshed up to {cutoff.isoformat()} ({len(groups)} groups)")
+        return {"processed_groups": len(groups), "high_water_mark": cutoff}
+
+    def _archived_deltas(self) -> Tuple[Dict[Tuple, List[int]], Dict[Tuple, List[int]]]:
+        """Course/day and student/month counts for marks moved to the Parquet archive"""
+        store = ArchiveStore()
+        if not store.files("attendance"):
+            return {}, {}
+        marks = store.read("attendance")
+        if marks.empty:
+            return {}, {}
+        mask = marks["verification_mask"].fillna(0).astype("int64")
+        all_factors = int(ALL_VERIFICATION_FACTORS)
+        counts = pd.DataFrame({
+            "student_id": marks["student_id"],
+            "course_code": marks["course_code"],
+            "day": marks["marked_at"].dt.date,
+            "month": marks["marked_at"].dt.date.map(lambda day: day.replace(day=1)),
+            "marks": 1,
+            "complete": ((mask & all_factors) == all_factors).astype("int64"),
+            "qr": ((mask & int(VerificationFactor.QR)) > 0).astype("int64"),
+            "face": ((mask & int(VerificationFactor.FACE)) > 0).astype("int64"),
+            "proximity": ((mask & int(VerificationFactor.PROXIMITY)) > 0).astype("int64")
+        })
+        course = counts.groupby(["course_code", "day"])[list(COUNTERS)].sum()
+        student = counts.groupby(["student_id", "course_code", "month"])[list(COUNTERS)].sum()
+        return (
+            {key: [int(value) for value in row] for key, row in zip(course.index, course.to_numpy())},
+            {key: [int(value) for value in row] for key, row in zip(student.index, student.to_numpy())}
+        )
+
+    def rebuild(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Drop every rollup row and rebuild from the attendance table and the archive
+
+        Archived marks no longer exist in the live table, so they are read
+        back from Parquet. Runs as one write transaction so readers never see
+        the tables empty.
+        """
+        course_deltas, student_deltas = self._archived_deltas()
+        self.db.query(CourseDailyAttendance).delete(synchronize_session=False)
+        self.db.query(StudentMonthlyAttendance).delete(synchronize_session=False)
+        self._apply(CourseDailyAttendance, ("course_code", "day"), course_deltas)
+        self._apply(StudentMonthlyAttendance, ("student_id", "course_code", "month"), student_deltas)
+        state = self.get_state()
+        state.high_water_mark = None
+        self.db.flush()
+        return RollupService(self.db).refresh(now=now)
+
+    def get_course_daily(
+        self,
+        course_code: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> List[CourseDailyAttendance]:
+        """Daily rollups for a course, oldest first, within an optional inclusive range"""
+        query = self.db.query(CourseDailyAttendance).filter(CourseDailyAttendance.course_code == course_code)
+        if start:
+            query = query.filter(CourseDailyAttendance.day >= start)
+        if end:
+            query = query.filter(CourseDailyAttendance.day <= end)
+        return query.order_by(CourseDailyAttendance.day).all()
+
+    def get_student_monthly(
+        self,
+        student_id: str,
+        course_code: Optional[str] = None
+    ) -> List[StudentMonthlyAttendance]:
+        """Monthly rollups for a student, optionally for one course"""
+        query = self.db.query(StudentMonthlyAttendance).filter(StudentMonthlyAttendance.student_id == str(student_id))
+        if course_code:
+            query = query.filter(StudentMonthlyAttendance.course_code == course_code)
+        return query.order_by(StudentMonthlyAttendance.course_code, StudentMonthlyAttendance.month).all()
+
+
+def refresh_rollups() -> None:
+    """Entry point for the background job"""
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        RollupService(db, reader=reader).refresh()
+    finally:
+        reader.close()
+        db.close()
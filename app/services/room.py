@@ -1,11 +1,16 @@
 # app/services/room.py
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import RenderedJSON, VersionedCache, render_json
 from app.models.room import Room
-from app.schemas.room import RoomCreate, RoomUpdate
+from app.schemas.room import Room as RoomSchema, RoomCreate, RoomUpdate
+
+# Serialized list, rebuilt on the first read after any room write
+room_list_cache = VersionedCache("rooms", tables=("rooms",))
 
 class RoomService:
     def __init__(self, db: Session):
@@ -23,6 +28,14 @@ class RoomService:
         """Get all rooms"""
         return self.db.query(Room).all()
     
+    def get_all_rooms_json(self) -> RenderedJSON:
+        """All rooms as a serialized list body and its ETag, from the in-process cache"""
+        def render() -> RenderedJSON:
+            rooms = self.db.query(Room).order_by(Room.room_number, Room.id).all()
+            return render_json({"rooms": [RoomSchema.model_validate(room, from_attributes=True) for room in rooms]})
+        
+        return room_list_cache.get("all", render)
+    
     def create_room(self, room_in: RoomCreate) -> Room:
         """Create new room"""
         # Check if room with this number already exists
@@ -68,6 +81,8 @@ class RoomService:
         # Update fields
         for field, value in room_data.items():
             setattr(db_room, field, value)
+        # Microseconds, so two edits in one second still change get_assignments_version
+        db_room.updated_at = datetime.utcnow()
         
         # Save changes
         self.db.commit()
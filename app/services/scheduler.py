@@ -0,0 +1,231 @@
+# app/services/scheduler.py
+import logging
+import secrets
+import uuid
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timetable import MINUTES_PER_DAY
+from app.db.session import ReadSessionLocal, SessionLocal
+from app.models.session import Session as SessionModel, SessionStatus
+from app.services.attendance_stats import AttendanceStatsService, session_term
+from app.services.headcount import headcounts
+from app.services.qr_code import QRCodeService
+from app.services.timetable import SlotEntry, TimetableService, slot_datetime, to_timetable_time
+
+logger = logging.getLogger(__name__)
+
+
+def opens_at(entry: SlotEntry, starts_at: datetime) -> datetime:
+    """When the scheduler opens a slot's session
+
+    Each assignment gets a fixed offset into SCHEDULER_SPREAD_SECONDS, so
+    rooms that all start at 09:00 open over a few minutes instead of at once.
+    """
+    lead_seconds = settings.SCHEDULER_LEAD_MINUTES * 60
+    spread = max(0, min(settings.SCHEDULER_SPREAD_SECONDS, lead_seconds))
+    offset = zlib.crc32(entry.assignment_id.encode()) % (spread + 1)
+    return starts_at - timedelta(seconds=lead_seconds - offset)
+
+
+class SessionScheduler:
+    """Opens sessions shortly before their timetable slot and closes them after it
+
+    Sessions are written SCHEDULER_BATCH_SIZE per transaction. The unique
+    (assignment_id, scheduled_start) index lets several workers run the
+    scheduler without opening a slot twice. Finding due slots only reads,
+    through `reader` when one is given.
+    """
+
+    def __init__(self, db: Session, reader: Optional[Session] = None):
+        self.db = db
+        self.reader = reader or db
+
+    def due_slots(self, now: datetime) -> List[Dict[str, Any]]:
+        """Session rows for slots whose opening time has passed and that have not ended"""
+        index = TimetableService(self.reader).get_index()
+        local_now = to_timetable_time(now)
+        minute = local_now.hour * 60 + local_now.minute
+        due = []
+        # The lead time can reach into tomorrow's first slots
+        for days_ahead in (0, 1):
+            day = local_now.date() + timedelta(days=days_ahead)
+            start = minute - days_ahead * MINUTES_PER_DAY
+            end = minute + settings.SCHEDULER_LEAD_MINUTES + 1 - days_ahead * MINUTES_PER_DAY
+            if end <= 0:
+                continue
+            for entry in index.between(day.weekday(), max(start, 0), end):
+                starts_at, ends_at = slot_datetime(day, entry.start), slot_datetime(day, entry.end)
+                if not opens_at(entry, starts_at) <= now < ends_at:
+                    continue
+                if not entry.course_code:
+                    logger.warning(f"Assignment {entry.assignment_id} has no course; not scheduling it")
+                    continue
+                due.append({
+                    "faculty_id": entry.faculty_id,
+                    "course_code": entry.course_code,
+                    "room_number": entry.room_number,
+                    "assignment_id": entry.assignment_id,
+                    "scheduled_start": starts_at,
+                    "scheduled_end": ends_at
+                })
+        return due
+
+    def _skip_opened(self, due: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop slots that already have a session, or whose faculty is already running that course"""
+        if not due:
+            return due
+        opened = set(
+            self.reader.query(SessionModel.assignment_id, SessionModel.scheduled_start)
+            .filter(
+                SessionModel.assignment_id.in_({row["assignment_id"] for row in due}),
+                SessionModel.scheduled_start >= min(row["scheduled_start"] for row in due)
+            )
+            .all()
+        )
+        running = set(
+            self.reader.query(SessionModel.faculty_id, SessionModel.course_code)
+            .filter(
+                SessionModel.status == SessionStatus.ACTIVE,
+                SessionModel.faculty_id.in_({row["faculty_id"] for row in due})
+            )
+            .all()
+        )
+        return [
+            row for row in due
+            if (row["assignment_id"], row["scheduled_start"]) not in opened
+            and (row["faculty_id"], row["course_code"]) not in running
+        ]
+
+    def _insert(self, rows: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+        """Insert one batch of started sessions, falling back to row by row if another worker raced us"""
+        def build(row: Dict[str, Any]) -> SessionModel:
+            return SessionModel(
+                **row, start_time=now, is_active=True, status=SessionStatus.ACTIVE, created_at=now
+            )
+
+        self.db.add_all([build(row) for row in rows])
+        try:
+            self.db.commit()
+            return rows
+        except IntegrityError:
+            self.db.rollback()
+
+        inserted = []
+        for row in rows:
+            self.db.add(build(row))
+            try:
+                self.db.commit()
+                inserted.append(row)
+            except IntegrityError:
+                self.db.rollback()
+        return inserted
+
+    def _pregenerate_qr(self, rows: List[Dict[str, Any]]) -> None:
+        """Render and store QR codes now so GET /sessions/{id}/qr can serve them
+
+        Tokens stay valid until the session is closed, not QR_CODE_EXPIRY_MINUTES
+        after opening, which would be a few minutes into the class.
+        """
+        if not rows:
+            return
+        try:
+            qr_code_service = QRCodeService()
+            for row in rows:
+                qr_code_service.pregenerate_session_qr(
+                    session_id=row["id"],
+                    faculty_id=row["faculty_id"],
+                    course_code=row["course_code"],
+                    room_number=row["room_number"],
+                    proximity_uuid=row["proximity_uuid"],
+                    expires_at=row["scheduled_end"] + timedelta(minutes=settings.SCHEDULER_END_GRACE_MINUTES)
+                )
+        except RuntimeError as e:
+            logger.warning(f"Could not pre-generate QR codes: {str(e)}")
+
+    def open_due_sessions(self, now: Optional[datetime] = None) -> int:
+        """Create and start sessions for upcoming slots, SCHEDULER_BATCH_SIZE per transaction"""
+        now = now or datetime.utcnow()
+        due = self._skip_opened(self.due_slots(now))
+        for row in due:
+            row["id"] = str(uuid.uuid4())
+            row["proximity_uuid"] = secrets.token_hex(4)
+
+        batch_size = max(1, settings.SCHEDULER_BATCH_SIZE)
+        opened = 0
+        for i in range(0, len(due), batch_size):
+            inserted = self._insert(due[i:i + batch_size], now)
+            self._pregenerate_qr(inserted)
+            opened += len(inserted)
+        return opened
+
+    def finished(self, cutoff: datetime, limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Any]:
+        """Active scheduled sessions whose slot ended by the cutoff, by (scheduled_end, id) after a keyset"""
+        query = self.reader.query(SessionModel.id, SessionModel.scheduled_end).filter(
+            SessionModel.status == SessionStatus.ACTIVE,
+            SessionModel.scheduled_end.isnot(None),
+            SessionModel.scheduled_end <= cutoff
+        )
+        if after is not None:
+            query = query.filter(tuple_(SessionModel.scheduled_end, SessionModel.id) > after)
+        return query.order_by(SessionModel.scheduled_end, SessionModel.id).limit(limit).all()
+
+    def _close(self, session_ids: List[str], now: datetime) -> int:
+        """Complete the sessions that are still active and count them as held
+
+        The status check is part of the UPDATE, so a session another worker
+        or its faculty member ended in the meantime is not counted again.
+        """
+        ended = self.db.execute(
+            update(SessionModel)
+            .where(SessionModel.id.in_(session_ids), SessionModel.status == SessionStatus.ACTIVE)
+            .values(status=SessionStatus.COMPLETED, end_time=now)
+            .returning(SessionModel.id, SessionModel.course_code, SessionModel.start_time, SessionModel.created_at)
+            .execution_options(synchronize_session=False)
+        ).all()
+        stats = AttendanceStatsService(self.db)
+        for (course_code, term), count in Counter((row.course_code, session_term(row)) for row in ended).items():
+            stats.record_session_held(course_code, term, count)
+        self.db.commit()
+        for row in ended:
+            headcounts.drop(row.id)
+        return len(ended)
+
+    def close_finished_sessions(self, now: Optional[datetime] = None) -> int:
+        """End scheduled sessions whose slot finished SCHEDULER_END_GRACE_MINUTES ago"""
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(minutes=settings.SCHEDULER_END_GRACE_MINUTES)
+        batch_size = max(1, settings.SCHEDULER_BATCH_SIZE)
+        closed = 0
+        after = None
+        while True:
+            sessions = self.finished(cutoff, batch_size, after)
+            if not sessions:
+                return closed
+            closed += self._close([session.id for session in sessions], now)
+            after = (sessions[-1].scheduled_end, sessions[-1].id)
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """One scheduler tick: close finished sessions, then open upcoming ones"""
+        now = now or datetime.utcnow()
+        result = {"closed": self.close_finished_sessions(now), "opened": self.open_due_sessions(now)}
+        if result["closed"] or result["opened"]:
+            logger.info(f"Scheduler opened {result['opened']} and closed {result['closed']} sessions")
+        return result
+
+
+def run_scheduler() -> None:
+    """Entry point for the background job"""
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        SessionScheduler(db, reader=reader).run()
+    finally:
+        reader.close()
+        db.close()
@@ -1,11 +1,14 @@
 # app/services/session.py
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 import uuid
 from datetime import datetime
 import secrets
 from app.models.session import Session as SessionModel, SessionStatus
 from app.services.qr_code import QRCodeService
+from app.services.attendance_stats import AttendanceStatsService, session_term
+from app.services.headcount import HeadcountService, headcounts
 from sqlalchemy.orm import Session as DBSession
 from app.models.session import Session, SessionStatus
 import logging
@@ -44,6 +47,28 @@ class SessionService:
         """Get sessions created by a faculty"""
         return self.db.query(SessionModel).filter(SessionModel.faculty_id == faculty_id).all()
     
+    def get_faculty_sessions_version(self, faculty_id: Union[str, uuid.UUID]) -> List[Tuple]:
+        """Count and latest timestamps per status of a faculty member's sessions
+
+        Any create, start, end or delete changes it, so it can stand in for
+        the full list in an ETag.
+        """
+        rows = (
+            self.db.query(
+                SessionModel.status,
+                func.count(SessionModel.id),
+                func.max(SessionModel.created_at),
+                func.max(SessionModel.start_time),
+                func.max(SessionModel.end_time),
+                func.max(SessionModel.updated_at)
+            )
+            .filter(SessionModel.faculty_id == str(faculty_id))
+            .group_by(SessionModel.status)
+            .order_by(SessionModel.status)
+            .all()
+        )
+        return [tuple(row) for row in rows]
+    
     def get_active_sessions(self, faculty_id: Optional[uuid.UUID] = None) -> List[SessionModel]:
         """Get active sessions, optionally filtered by faculty"""
         query = self.db.query(SessionModel).filter(SessionModel.status == SessionStatus.ACTIVE)
@@ -108,22 +133,32 @@ class SessionService:
         session.status = SessionStatus.ACTIVE
         session.start_time = datetime.utcnow()
         self.db.commit()
+        HeadcountService(self.db).seed(session)
         
         print(f"Session {session_id} started successfully, new status: {session.status}")
         return session
     
     def end_session(self, session_id: uuid.UUID) -> Optional[SessionModel]:
-        """End a session (change status to ENDED)"""
+        """End a session (change status to COMPLETED) and count it as held for its course"""
         session = self.get_session(session_id)
         if not session or session.status != SessionStatus.ACTIVE:
             return None
         
-        # Update session
-        session.status = SessionStatus.ENDED
-        session.end_time = datetime.utcnow()
-        
-        self.db.add(session)
+        # Only count the session if this call is the one that ends it; the
+        # scheduler or a second request may have got there first
+        ended = self.db.query(SessionModel).filter(
+            SessionModel.id == session.id,
+            SessionModel.status == SessionStatus.ACTIVE
+        ).update(
+            {SessionModel.status: SessionStatus.COMPLETED, SessionModel.end_time: datetime.utcnow()},
+            synchronize_session=False
+        )
+        if not ended:
+            self.db.rollback()
+            return None
+        AttendanceStatsService(self.db).record_session_held(session.course_code, session_term(session))
         self.db.commit()
+        headcounts.drop(session.id)
         self.db.refresh(session)
         return session
     
@@ -133,8 +168,10 @@ class SessionService:
         if not session:
             return False
         
+        AttendanceStatsService(self.db).forget_session(session)
         self.db.delete(session)
         self.db.commit()
+        headcounts.drop(session_id)
         return True
     
     def get_session_with_qr(self, session_id: uuid.UUID) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,230 @@
+# app/services/timetable.py
+import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.core.config import settings
+from app.core.timetable import WEEKDAYS, format_minutes
+from app.models.assignment import Assignment, AssignmentSlot
+from app.models.course import Course
+from app.models.room import Room
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+ROOM = "room"
+FACULTY = "faculty"
+
+# Rebuilt on the first lookup after any assignment write. Only read endpoints
+# use it; booking checks go to the database, which sees every worker's writes
+timetable_cache = VersionedCache("timetable", tables=("assignments", "assignment_slots", "rooms", "courses"))
+
+
+def to_timetable_time(moment: datetime) -> datetime:
+    """Naive UTC datetime to wall-clock time in TIMETABLE_TIMEZONE"""
+    return moment.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(settings.TIMETABLE_TIMEZONE)).replace(tzinfo=None)
+
+
+def slot_datetime(day: date, minute: int) -> datetime:
+    """Naive UTC datetime of a timetable minute on a TIMETABLE_TIMEZONE date"""
+    local = datetime.combine(day, time()) + timedelta(minutes=minute)
+    return local.replace(tzinfo=ZoneInfo(settings.TIMETABLE_TIMEZONE)).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class SlotEntry(NamedTuple):
+    weekday: int
+    start: int
+    end: int
+    assignment_id: str
+    faculty_id: str
+    room_id: str
+    room_number: Optional[str]
+    course_id: str
+    course_code: Optional[str]
+    course_name: Optional[str]
+
+
+class DaySchedule:
+    """One day of slots for a room or faculty member, sorted by start
+
+    `max_end[i]` is the latest end among the first i + 1 slots, so a single
+    binary search on the starts answers overlap queries even when legacy
+    data already overlaps.
+    """
+
+    def __init__(self, entries: Iterable[SlotEntry]):
+        self.entries = sorted(entries, key=lambda entry: (entry.start, entry.end, entry.assignment_id))
+        self.starts = [entry.start for entry in self.entries]
+        self.max_end = []
+        latest = -1
+        for entry in self.entries:
+            latest = max(latest, entry.end)
+            self.max_end.append(latest)
+
+    def overlapping(self, start: int, end: int, exclude: Optional[str] = None) -> List[SlotEntry]:
+        """Slots overlapping [start, end), found with one bisect plus a walk over the hits"""
+        found = []
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_end[i] > start:
+            entry = self.entries[i]
+            if entry.end > start and entry.assignment_id != exclude:
+                found.append(entry)
+            i -= 1
+        found.reverse()
+        return found
+
+    def at(self, minute: int) -> List[SlotEntry]:
+        """Slots running at a minute of the day"""
+        return self.overlapping(minute, minute + 1)
+
+    def next_after(self, minute: int) -> Optional[SlotEntry]:
+        """First slot starting after a minute of the day"""
+        i = bisect_right(self.starts, minute)
+        return self.entries[i] if i < len(self.entries) else None
+
+
+class TimetableIndex:
+    """In-memory interval index of active assignment slots per room, per faculty and per weekday"""
+
+    def __init__(self, entries: Iterable[SlotEntry]):
+        grouped: Dict[Tuple[str, str, int], List[SlotEntry]] = defaultdict(list)
+        weekdays: Dict[int, List[SlotEntry]] = defaultdict(list)
+        self.room_ids: Dict[str, str] = {}
+        count = 0
+        for entry in entries:
+            grouped[(ROOM, entry.room_id, entry.weekday)].append(entry)
+            grouped[(FACULTY, entry.faculty_id, entry.weekday)].append(entry)
+            weekdays[entry.weekday].append(entry)
+            if entry.room_number:
+                self.room_ids[entry.room_number] = entry.room_id
+            count += 1
+        self.days = {key: DaySchedule(day_entries) for key, day_entries in grouped.items()}
+        self.weekdays = {weekday: DaySchedule(day_entries) for weekday, day_entries in weekdays.items()}
+        self.size = count
+
+    def day(self, kind: str, key: str, weekday: int) -> Optional[DaySchedule]:
+        return self.days.get((kind, str(key), weekday))
+
+    def busy(self, kind: str, key: str, weekday: int) -> List[SlotEntry]:
+        schedule = self.day(kind, key, weekday)
+        return list(schedule.entries) if schedule else []
+
+    def conflicts(
+        self,
+        kind: str,
+        key: str,
+        weekday: int,
+        start: int,
+        end: int,
+        exclude: Optional[str] = None
+    ) -> List[SlotEntry]:
+        schedule = self.day(kind, key, weekday)
+        return schedule.overlapping(start, end, exclude=exclude) if schedule else []
+
+    def current(self, kind: str, key: str, weekday: int, minute: int) -> Tuple[Optional[SlotEntry], Optional[SlotEntry]]:
+        """The slot running at a minute (the latest started, if legacy slots overlap) and the next one that day"""
+        schedule = self.day(kind, key, weekday)
+        if not schedule:
+            return None, None
+        running = schedule.at(minute)
+        return (running[-1] if running else None), schedule.next_after(minute)
+
+    def between(self, weekday: int, start: int, end: int) -> List[SlotEntry]:
+        """Every room's slots overlapping [start, end) on a weekday"""
+        schedule = self.weekdays.get(weekday)
+        return schedule.overlapping(start, end) if schedule else []
+
+    def resolve_room(self, room: str) -> str:
+        """Room id for a room number, or the value itself when it is already an id"""
+        return self.room_ids.get(room, room)
+
+
+def describe_slot(entry: SlotEntry) -> str:
+    return f"{WEEKDAYS[entry.weekday]} {format_minutes(entry.start)}-{format_minutes(entry.end)}"
+
+
+class TimetableService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _entries_query(self):
+        return (
+            self.db.query(
+                AssignmentSlot.weekday,
+                AssignmentSlot.start_minute,
+                AssignmentSlot.end_minute,
+                Assignment.id,
+                Assignment.faculty_id,
+                Assignment.room_id,
+                Room.room_number,
+                Assignment.course_id,
+                Course.course_code,
+                Course.course_name
+            )
+            .join(Assignment, Assignment.id == AssignmentSlot.assignment_id)
+            .outerjoin(Room, Room.id == Assignment.room_id)
+            .outerjoin(Course, Course.id == Assignment.course_id)
+            .filter(Assignment.is_active.is_(True))
+        )
+
+    def _load_entries(self) -> List[SlotEntry]:
+        """Every slot of every active assignment, in one joined query"""
+        return [SlotEntry(*row) for row in self._entries_query().all()]
+
+    def get_index(self) -> TimetableIndex:
+        """The shared index, rebuilt when assignments, rooms or courses change"""
+        def build() -> TimetableIndex:
+            index = TimetableIndex(self._load_entries())
+            logger.info(f"Built timetable index with {index.size} slots")
+            return index
+
+        return timetable_cache.get("index", build)
+
+    def check_conflicts(
+        self,
+        faculty_id: str,
+        room_id: str,
+        slots: Sequence[Tuple[int, int, int]],
+        exclude: Optional[str] = None
+    ) -> None:
+        """Raise ValueError if any slot double-books the room or the faculty member
+
+        Checked against the database in the caller's transaction, not the
+        cached index, so bookings from other workers count. The room and
+        faculty rows are locked first (PostgreSQL; SQLite's writer is already
+        exclusive), so two requests cannot both pass and book the same slot.
+        """
+        if not slots:
+            return
+        self.db.query(Room.id).filter(Room.id == room_id).with_for_update().all()
+        self.db.query(User.id).filter(User.id == faculty_id).with_for_update().all()
+
+        overlapping = or_(*(
+            and_(
+                AssignmentSlot.weekday == weekday,
+                AssignmentSlot.start_minute < end,
+                AssignmentSlot.end_minute > start
+            )
+            for weekday, start, end in slots
+        ))
+        query = self._entries_query().filter(
+            overlapping,
+            or_(Assignment.room_id == room_id, Assignment.faculty_id == faculty_id)
+        )
+        if exclude:
+            query = query.filter(Assignment.id != exclude)
+        clash = query.order_by(AssignmentSlot.weekday, AssignmentSlot.start_minute, Assignment.id).first()
+        if clash:
+            entry = SlotEntry(*clash)
+            label = "Room" if entry.room_id == room_id else "Faculty member"
+            raise ValueError(
+                f"{label} is already booked on {describe_slot(entry)} "
+                f"({entry.course_code or entry.course_id}, assignment {entry.assignment_id})"
+            )
@@ -1,13 +1,43 @@
 # Step 3: Fix app/services/user.py to use synchronous methods
 # app/services/user.py
+import base64
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import case, delete, exists, func, literal_column, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash, verify_password
+from app.db.search import MIN_INDEXED_LENGTH, SEARCH_COLUMNS, has_user_search, search_rowids
+from app.models.assignment import Assignment
+from app.models.attendance import Attendance
+from app.models.enrollment import Enrollment
+from app.models.session import Session as SessionModel
 from app.models.user import User, UserRole
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserBulkSelection, UserCreate, UserUpdate
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards with a backslash so the term matches literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_directory_cursor(full_name: str, user_id: str) -> str:
+    """Opaque keyset cursor for user directory pages"""
+    raw = f"{full_name}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_directory_cursor(cursor: str) -> Tuple[str, str]:
+    """Reverse encode_directory_cursor, raising ValueError on malformed input"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        full_name, user_id = base64.urlsafe_b64decode(padded.encode()).decode().rsplit("|", 1)
+        return full_name, user_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
 
 class UserService:
     def __init__(self, db: Session):
@@ -31,6 +61,56 @@ class UserService:
             
         return query.offset(skip).limit(limit).all()
     
+    def _search_filter(self, term: str):
+        """Name, email or roll number containing `term`, or starting with it if it is too short to index"""
+        if len(term) >= MIN_INDEXED_LENGTH and has_user_search(self.db.connection()):
+            return literal_column('"user".rowid').in_(search_rowids(term))
+        # PostgreSQL answers these from the trigram GIN indexes
+        escaped = escape_like(term)
+        pattern = f"%{escaped}%" if len(term) >= MIN_INDEXED_LENGTH else f"{escaped}%"
+        return or_(*[getattr(User, name).ilike(pattern, escape="\\") for name in SEARCH_COLUMNS])
+    
+    def search_users(
+        self,
+        role=None,
+        q: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of the user directory, ordered by name, and the cursor for the next
+        
+        Raises ValueError if the cursor cannot be decoded
+        """
+        query = self.db.query(User)
+        if role is not None:
+            query = query.filter(User.role == role)
+        if q and q.strip():
+            query = query.filter(self._search_filter(q.strip()))
+        if cursor:
+            after = decode_directory_cursor(cursor)
+            query = query.filter(User.full_name >= after[0], tuple_(User.full_name, User.id) > tuple_(*after))
+        
+        # Fetch one extra user to know whether another page exists
+        users = query.order_by(User.full_name, User.id).limit(limit + 1).all()
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_directory_cursor(users[-1].full_name, users[-1].id)
+        
+        return {"users": users, "next_cursor": next_cursor}
+    
+    def get_users_version(self, role=None) -> Tuple:
+        """Count, active count and latest timestamps of the users get_users would list"""
+        query = self.db.query(
+            func.count(User.id),
+            func.sum(case((User.is_active.is_(True), 1), else_=0)),
+            func.max(User.created_at),
+            func.max(User.updated_at)
+        )
+        if role is not None:
+            query = query.filter(User.role == role)
+        return tuple(query.one())
+    
     # app/services/user.py - Update the create_user method
     def create_user(self, user_in: UserCreate) -> User:
         """Create new user"""
@@ -47,6 +127,8 @@ class UserService:
             is_active=getattr(user_in, 'is_active', True),  # Default to True if not provided
             department=user_in.department,
             roll_number=user_in.roll_number,
+            # Set here rather than by the database, whose clock only has whole seconds on SQLite
+            created_at=datetime.utcnow()
         )
         
         # Add to database
@@ -73,6 +155,8 @@ class UserService:
         # Update fields
         for field, value in user_data.items():
             setattr(db_user, field, value)
+        # Microseconds, so two edits in one second still change get_users_version
+        db_user.updated_at = datetime.utcnow()
         
         # Save changes
         self.db.commit()
@@ -115,6 +199,7 @@ class UserService:
         
         # Activate user
         db_user.is_active = True
+        db_user.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(db_user)
         
@@ -129,7 +214,72 @@ class UserService:
         
         # Deactivate user
         db_user.is_active = False
+        db_user.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(db_user)
         
-        return db_user
\ No newline at end of file
+        return db_user
+    
+    def _bulk_criteria(self, selection: UserBulkSelection, exclude_id: Optional[str] = None) -> List:
+        """WHERE clauses for the users a bulk operation selects
+        
+        Ids and filters are combined with AND. Raises ValueError if nothing
+        narrows the selection, so an empty request cannot touch every user.
+        """
+        criteria = []
+        if selection.ids:
+            criteria.append(User.id.in_([str(user_id) for user_id in selection.ids]))
+        if selection.role is not None:
+            criteria.append(User.role == selection.role)
+        if selection.department:
+            criteria.append(User.department == selection.department)
+        if selection.roll_number_prefix:
+            criteria.append(User.roll_number.like(f"{escape_like(selection.roll_number_prefix)}%", escape="\\"))
+        if not criteria:
+            raise ValueError("Select users by ids or by role, department or roll number prefix")
+        if exclude_id is not None:
+            criteria.append(User.id != str(exclude_id))
+        return criteria
+    
+    def set_users_active(
+        self,
+        selection: UserBulkSelection,
+        is_active: bool,
+        exclude_id: Optional[str] = None
+    ) -> int:
+        """Activate or deactivate every selected user in one UPDATE, returning how many changed"""
+        criteria = self._bulk_criteria(selection, exclude_id)
+        result = self.db.execute(
+            update(User)
+            .where(*criteria, User.is_active.isnot(is_active))
+            .values(is_active=is_active, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+    
+    def delete_users(self, selection: UserBulkSelection, exclude_id: Optional[str] = None) -> Dict[str, int]:
+        """Delete every selected user in one DELETE
+        
+        Users who ran sessions, marked attendance or hold assignments are
+        kept so that history stays intact; they are counted as `kept`.
+        """
+        criteria = self._bulk_criteria(selection, exclude_id)
+        deletable = [
+            *criteria,
+            ~exists().where(SessionModel.faculty_id == User.id),
+            ~exists().where(Attendance.student_id == User.id),
+            ~exists().where(Assignment.faculty_id == User.id)
+        ]
+        # Stands in for ON DELETE CASCADE, which SQLite leaves unenforced
+        self.db.execute(
+            delete(Enrollment)
+            .where(Enrollment.student_id.in_(select(User.id).where(*deletable)))
+            .execution_options(synchronize_session=False)
+        )
+        deleted = self.db.execute(
+            delete(User).where(*deletable).execution_options(synchronize_session=False)
+        ).rowcount
+        kept = self.db.query(func.count(User.id)).filter(*criteria).scalar()
+        self.db.commit()
+        return {"deleted": deleted, "kept": kept}
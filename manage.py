@@ -0,0 +1,285 @@
+# manage.py
+import argparse
+import logging
+import sys
+
+from app.db.session import ReadSessionLocal, SessionLocal
+import app.models  # This will import all models in the correct order
+
+
+def export_matrix(args) -> int:
+    """Write a course attendance matrix to a file or stdout"""
+    from app.services.attendance_export import (
+        AttendanceExportService, STUDENT_COLUMNS, SUMMARY_COLUMNS, iter_csv, to_parquet_bytes
+    )
+
+    db = ReadSessionLocal()
+    try:
+        matrix = AttendanceExportService(db).get_course_matrix(args.course_code, verified_only=args.verified_only)
+    finally:
+        db.close()
+
+    if matrix is None:
+        print(f"No sessions found for course {args.course_code}", file=sys.stderr)
+        return 1
+
+    if args.format == "parquet":
+        if not args.output:
+            print("Parquet output needs --output", file=sys.stderr)
+            return 1
+        with open(args.output, "wb") as f:
+            f.write(to_parquet_bytes(matrix))
+    elif args.output:
+        with open(args.output, "w", newline="") as f:
+            f.writelines(iter_csv(matrix))
+    else:
+        sys.stdout.writelines(iter_csv(matrix))
+
+    sessions = matrix.shape[1] - len(STUDENT_COLUMNS) - len(SUMMARY_COLUMNS)
+    print(f"Exported {len(matrix)} students x {sessions} sessions", file=sys.stderr)
+    return 0
+
+
+def rollup_refresh(args) -> int:
+    """Fold new attendance marks into the rollup tables"""
+    from app.services.rollup import RollupService
+
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        result = RollupService(db, reader=reader).refresh()
+    finally:
+        reader.close()
+        db.close()
+    print(f"Processed {result['processed_groups']} groups up to {result['high_water_mark']}", file=sys.stderr)
+    return 0
+
+
+def rollup_rebuild(args) -> int:
+    """Recompute every rollup row from the raw attendance table"""
+    from app.services.rollup import RollupService
+
+    db = SessionLocal()
+    try:
+        result = RollupService(db).rebuild()
+    finally:
+        db.close()
+    print(f"Rebuilt rollups from {result['processed_groups']} groups up to {result['high_water_mark']}", file=sys.stderr)
+    return 0
+
+
+def counters_rebuild(args) -> int:
+    """Recompute attendance percentage counters from sessions and marks"""
+    from app.services.attendance_stats import AttendanceStatsService
+
+    db = SessionLocal()
+    try:
+        result = AttendanceStatsService(db).rebuild()
+    finally:
+        db.close()
+    print(f"Rebuilt counters for {result['courses']} courses and {result['student_courses']} student courses", file=sys.stderr)
+    return 0
+
+
+def scan_anomalies(args) -> int:
+    """Flag possible proxy attendance in completed sessions"""
+    from app.services.anomaly import AnomalyService
+
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        service = AnomalyService(db, reader=reader)
+        if args.session:
+            print(f"Flagged {service.rescan_session(args.session)} marks", file=sys.stderr)
+        else:
+            result = service.scan()
+            print(f"Scanned {result['sessions']} sessions, flagged {result['flagged']} marks", file=sys.stderr)
+    finally:
+        reader.close()
+        db.close()
+    return 0
+
+
+def archive_sessions(args) -> int:
+    """Move old finished sessions and their marks to the Parquet archive"""
+    from app.services.archive import ArchiveService
+
+    db, reader = SessionLocal(), ReadSessionLocal()
+    try:
+        result = ArchiveService(db, reader=reader).archive_sessions(
+            older_than_days=args.older_than_days, batch_size=args.batch_size
+        )
+    finally:
+        reader.close()
+        db.close()
+    print(f"Archived {result['sessions']} sessions and {result['marks']} marks older than {result['cutoff']}", file=sys.stderr)
+    return 0
+
+
+def import_enrollments(args) -> int:
+    """Enroll the students listed in a CSV with a student_id, roll_number or email column"""
+    import csv
+    from app.services.course import CourseService
+    from app.services.enrollment import EnrollmentService
+
+    with open(args.file, newline="") as f:
+        rows = list(csv.DictReader(f))
+    columns = {"student_id": [], "roll_number": [], "email": []}
+    for row in rows:
+        for column, values in columns.items():
+            if (row.get(column) or "").strip():
+                values.append(row[column].strip())
+
+    db = SessionLocal()
+    try:
+        course = CourseService(db).get_course_by_code(args.course_code)
+        if not course:
+            print(f"Course {args.course_code} not found", file=sys.stderr)
+            return 1
+        result = EnrollmentService(db).enroll_students(
+            course.id, student_ids=columns["student_id"], roll_numbers=columns["roll_number"], emails=columns["email"]
+        )
+    finally:
+        db.close()
+    print(f"Enrolled {result['enrolled']}, already enrolled {result['already_enrolled']}", file=sys.stderr)
+    for value in result["not_found"]:
+        print(f"No student matches {value}", file=sys.stderr)
+    return 0
+
+
+def schedule_sessions(args) -> int:
+    """Run one scheduler tick: close finished timetable sessions and open upcoming ones"""
+    from app.services.scheduler import SessionScheduler
+
+    db = SessionLocal()
+    try:
+        result = SessionScheduler(db).run()
+    finally:
+        db.close()
+    print(f"Opened {result['opened']} and closed {result['closed']} scheduled sessions", file=sys.stderr)
+    return 0
+
+
+def partitions_ensure(args) -> int:
+    """Create the default and upcoming monthly attendance partitions"""
+    from datetime import date
+    from app.db.partitioning import ensure_partitions, is_partitioned
+    from app.db.session import engine
+
+    since = date.fromisoformat(args.since) if args.since else None
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            print("attendance is not a partitioned table", file=sys.stderr)
+            return 1
+        created = ensure_partitions(conn, months_ahead=args.months_ahead, since=since, move_strays=args.move_strays)
+    print(f"Created {len(created)} partitions: {', '.join(created) or '-'}", file=sys.stderr)
+    return 0
+
+
+def partitions_detach(args) -> int:
+    """Detach monthly attendance partitions that end on or before a date"""
+    from datetime import date
+    from app.db.partitioning import detach_partitions, is_partitioned
+    from app.db.session import engine
+
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            print("attendance is not a partitioned table", file=sys.stderr)
+            return 1
+        detached = detach_partitions(conn, date.fromisoformat(args.before))
+    print(f"Detached {len(detached)} partitions: {', '.join(detached) or '-'}", file=sys.stderr)
+    return 0
+
+
+def search_rebuild(args) -> int:
+    """Re-index every user for directory search (SQLite, e.g. after VACUUM)"""
+    from app.db.search import rebuild_user_search
+    from app.db.session import engine
+
+    with engine.begin() as conn:
+        if not rebuild_user_search(conn):
+            print("No SQLite search index to rebuild", file=sys.stderr)
+            return 1
+    print("Rebuilt the user search index", file=sys.stderr)
+    return 0
+
+
+def benchmark_marks(args) -> int:
+    """Compare concurrent mark throughput with SQLite's defaults and with the tuning profile"""
+    from app.db.benchmark import run_mark_benchmark
+
+    # Failed marks are reported in the results; keep their log lines out of the table
+    logging.disable(logging.ERROR)
+    print(f"{'profile':<8} {'workers':>7} {'marked':>7} {'failed':>7} {'seconds':>8} {'marks/s':>8}")
+    for tuned in (False, True):
+        result = run_mark_benchmark(args.path, tuned, workers=args.workers, marks=args.marks)
+        print(
+            f"{result['profile']:<8} {result['workers']:>7} {result['marked']:>7} {result['failed']:>7} "
+            f"{result['seconds']:>8} {result['marks_per_second']:>8}"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="SecureAttend management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    matrix = commands.add_parser("export-matrix", help="Export a course's students x sessions attendance matrix")
+    matrix.add_argument("course_code")
+    matrix.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    matrix.add_argument("--output", "-o", help="File to write (CSV defaults to stdout)")
+    matrix.add_argument("--verified-only", action="store_true", help="Only count marks that passed every factor")
+    matrix.set_defaults(handler=export_matrix)
+
+    refresh = commands.add_parser("rollup-refresh", help="Fold new attendance marks into the rollup tables")
+    refresh.set_defaults(handler=rollup_refresh)
+
+    rebuild = commands.add_parser("rollup-rebuild", help="Rebuild the rollup tables from scratch")
+    rebuild.set_defaults(handler=rollup_rebuild)
+
+    counters = commands.add_parser("counters-rebuild", help="Recompute attendance percentage counters")
+    counters.set_defaults(handler=counters_rebuild)
+
+    anomalies = commands.add_parser("scan-anomalies", help="Flag possible proxy attendance for admin review")
+    anomalies.add_argument("--session", help="Re-scan one session instead of newly completed ones")
+    anomalies.set_defaults(handler=scan_anomalies)
+
+    archive = commands.add_parser("archive-sessions", help="Move old sessions and their attendance to Parquet")
+    archive.add_argument("--older-than-days", type=int, help="Defaults to ARCHIVE_AFTER_DAYS")
+    archive.add_argument("--batch-size", type=int, help="Defaults to ARCHIVE_BATCH_SESSIONS")
+    archive.set_defaults(handler=archive_sessions)
+
+    enroll = commands.add_parser("import-enrollments", help="Enroll students in a course from a CSV file")
+    enroll.add_argument("course_code")
+    enroll.add_argument("file", help="CSV with a student_id, roll_number or email column")
+    enroll.set_defaults(handler=import_enrollments)
+
+    schedule = commands.add_parser("schedule-sessions", help="Open and close sessions from the timetable once")
+    schedule.set_defaults(handler=schedule_sessions)
+
+    ensure = commands.add_parser("partitions-ensure", help="Create upcoming monthly attendance partitions (PostgreSQL)")
+    ensure.add_argument("--months-ahead", type=int, help="Defaults to ATTENDANCE_PARTITION_MONTHS_AHEAD")
+    ensure.add_argument("--since", help="YYYY-MM-DD; also create partitions for months from this date")
+    ensure.add_argument(
+        "--move-strays", action="store_true",
+        help="Move marks out of the default partition; locks attendance while it runs"
+    )
+    ensure.set_defaults(handler=partitions_ensure)
+
+    detach = commands.add_parser("partitions-detach", help="Detach old monthly attendance partitions (PostgreSQL)")
+    detach.add_argument("--before", required=True, help="YYYY-MM-DD; partitions ending on or before it are detached")
+    detach.set_defaults(handler=partitions_detach)
+
+    search = commands.add_parser("search-rebuild", help="Re-index users for directory search (SQLite, e.g. after VACUUM)")
+    search.set_defaults(handler=search_rebuild)
+
+    bench = commands.add_parser("benchmark-marks", help="Concurrent mark throughput with and without SQLite tuning")
+    bench.add_argument("--workers", type=int, default=8, help="Threads marking at once")
+    bench.add_argument("--marks", type=int, default=2000, help="Marks in total")
+    bench.add_argument("--path", default="benchmark_marks.db", help="Scratch SQLite file, removed afterwards")
+    bench.set_defaults(handler=benchmark_marks)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    sys.exit(args.handler(args))
@@ -0,0 +1,88 @@
+# tests/api/test_admin_overview.py
+import pytest
+import uuid
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.room import Room
+from app.models.assignment import Assignment
+
+
+@pytest.fixture
+def dashboard_data(db: Session):
+    """Users, courses, rooms and an assignment linking them"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="overview_faculty@test.com",
+        full_name="Overview Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"overview_student{i}@test.com",
+            full_name=f"Overview Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"OV{i:03d}",
+            is_active=i != 0
+        ) for i in range(3)
+    ]
+    courses = [Course(id=str(uuid.uuid4()), course_code=f"OV{i}01", course_name=f"Overview {i}") for i in range(2)]
+    room = Room(id=str(uuid.uuid4()), room_number="OV-R1", capacity=30)
+    assignment = Assignment(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_id=courses[0].id,
+        room_id=room.id,
+        day_of_week="Monday",
+        time_slot="09:00-10:00",
+        is_active=True
+    )
+    db.add_all([faculty, *students, *courses, room, assignment])
+    db.commit()
+    return {"faculty": faculty, "assignment": assignment}
+
+
+@pytest.mark.asyncio
+async def test_admin_overview_contents(client, dashboard_data):
+    """One response carries counts, first pages and the faculty dropdown"""
+    response = await client.get("/api/v1/admin/overview")
+    
+    assert response.status_code == 200, "Should return 200 OK"
+    data = response.json()
+    assert data["counts"] == {
+        "users": 4, "active_users": 3, "admin_users": 0, "faculty_users": 1, "student_users": 3,
+        "courses": 2, "rooms": 1, "assignments": 1, "active_assignments": 1
+    }, "Counts should cover every collection"
+    assert len(data["users"]) == 4 and len(data["courses"]) == 2 and len(data["rooms"]) == 1
+    assert data["faculty"] == [{"id": dashboard_data["faculty"].id, "full_name": "Overview Faculty"}]
+    
+    assignment = data["assignments"][0]
+    assert assignment["faculty_name"] == "Overview Faculty", "Assignments should be enriched"
+    assert assignment["course_code"] == "OV001"
+    assert assignment["room_number"] == "OV-R1"
+    
+    response = await client.get("/api/v1/admin/overview?limit=1")
+    assert len(response.json()["users"]) == 1, "limit should cap each page"
+
+
+@pytest.mark.asyncio
+async def test_admin_overview_cached_until_write(client, dashboard_data, captured_queries):
+    """Repeat loads skip the database; a write through the API invalidates them"""
+    first = await client.get("/api/v1/admin/overview")
+    
+    with captured_queries() as queries:
+        second = await client.get("/api/v1/admin/overview")
+    assert second.json() == first.json()
+    assert queries == [], "A cached overview should not touch the database"
+    
+    response = await client.post("/api/v1/rooms/", json={"room_number": "OV-R2", "capacity": 10})
+    assert response.status_code in (200, 201)
+    
+    third = (await client.get("/api/v1/admin/overview")).json()
+    assert third["counts"]["rooms"] == 2, "Creating a room should invalidate the cache"
+    assert [room["room_number"] for room in third["rooms"]] == ["OV-R1", "OV-R2"]
@@ -0,0 +1,162 @@
+# tests/api/test_assignments_api.py
+import pytest
+import uuid
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.room import Room
+from app.models.assignment import Assignment, AssignmentSlot
+
+
+@pytest.fixture
+def add_assignments(db: Session):
+    """Return a helper that adds n assignments, each with its own faculty, course and room"""
+    def _add(n, faculty=None):
+        assignments = []
+        for i in range(n):
+            teacher = faculty or User(
+                id=str(uuid.uuid4()),
+                email=f"assign_faculty_{uuid.uuid4().hex[:8]}@test.com",
+                full_name=f"Faculty {i}",
+                hashed_password="hashed_password",
+                role=UserRole.FACULTY,
+                is_active=True
+            )
+            course = Course(id=str(uuid.uuid4()), course_code=f"AS{uuid.uuid4().hex[:6]}", course_name=f"Course {i}")
+            room = Room(id=str(uuid.uuid4()), room_number=f"AS-{uuid.uuid4().hex[:6]}", capacity=30)
+            assignment = Assignment(
+                id=str(uuid.uuid4()),
+                faculty_id=teacher.id,
+                course_id=course.id,
+                room_id=room.id,
+                day_of_week="Monday",
+                time_slot="09:00-10:00",
+                is_active=True,
+                slots=[AssignmentSlot(weekday=0, start_minute=540, end_minute=600)]
+            )
+            db.add_all([teacher, course, room, assignment])
+            assignments.append(assignment)
+        db.commit()
+        return assignments
+
+    return _add
+
+
+@pytest.mark.asyncio
+async def test_assignment_list_query_count_is_fixed(client, add_assignments, captured_queries):
+    """Listing costs the same number of queries for 1 or 10 assignments"""
+    add_assignments(1)
+    with captured_queries() as small:
+        response = await client.get("/api/v1/assignments/")
+    assert len(response.json()["assignments"]) == 1
+
+    add_assignments(9)
+    with captured_queries() as large:
+        response = await client.get("/api/v1/assignments/")
+    assignments = response.json()["assignments"]
+    assert len(assignments) == 10
+    assert len(large) == len(small) == 2, "One ETag version query plus one joined query for the enrichment"
+    assert all(a["faculty_name"] and a["course_code"] and a["room_number"] for a in assignments)
+
+
+@pytest.mark.asyncio
+async def test_single_and_faculty_assignments_are_enriched(client, db, add_assignments, captured_queries):
+    """Single, per-faculty, create and update responses share the enriched shape"""
+    first = add_assignments(1)[0]
+    faculty = db.query(User).filter(User.id == first.faculty_id).one()
+    add_assignments(2, faculty=faculty)
+    first_id, faculty_id, faculty_name = first.id, faculty.id, faculty.full_name
+
+    with captured_queries() as queries:
+        response = await client.get(f"/api/v1/assignments/faculty/{faculty_id}")
+    assert [a["faculty_name"] for a in response.json()["assignments"]] == [faculty_name] * 3
+    assert len(queries) == 1
+
+    with captured_queries() as queries:
+        response = await client.get(f"/api/v1/assignments/{first_id}")
+    assert response.json()["course_name"] == "Course 0"
+    assert len(queries) == 1
+
+    response = await client.put(f"/api/v1/assignments/{first_id}", json={"time_slot": "10:00-11:00"})
+    assert response.status_code == 200
+    assert response.json()["time_slot"] == "10:00-11:00"
+    assert response.json()["faculty_name"] == faculty_name
+
+    response = await client.get(f"/api/v1/assignments/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_free_busy_and_double_booking_over_http(client, add_assignments, captured_queries):
+    """Bookings made through the API show up in free/busy, which is served without queries"""
+    existing = add_assignments(1)[0]
+    payload = {
+        "faculty_id": existing.faculty_id,
+        "course_id": existing.course_id,
+        "room_id": existing.room_id,
+        "day_of_week": "Tuesday,Thursday",
+        "time_slot": "10:00 AM - 11:30 AM"
+    }
+    room_id = existing.room_id
+    response = await client.post("/api/v1/assignments/", json=payload)
+    assert response.status_code == 201
+
+    response = await client.post("/api/v1/assignments/", json={**payload, "day_of_week": "Thursday", "time_slot": "11:00-12:00"})
+    assert response.status_code == 400
+    assert "already booked" in response.json()["detail"]
+
+    response = await client.post("/api/v1/assignments/", json={**payload, "time_slot": "sometime"})
+    assert response.status_code == 400
+
+    await client.get(f"/api/v1/assignments/free-busy?room={room_id}&day=Tuesday")
+    with captured_queries() as queries:
+        response = await client.get(f"/api/v1/assignments/free-busy?room={room_id}&day=tue&start=11:00&end=12:00")
+    data = response.json()
+    assert queries == [], "A warm timetable index should answer without the database"
+    assert data["day"] == "Tuesday"
+    assert [(slot["start"], slot["end"]) for slot in data["busy"]] == [("10:00", "11:30")]
+    assert data["free"] is False
+
+    response = await client.get(f"/api/v1/assignments/free-busy?faculty={existing.faculty_id}&day=Tuesday&start=11:30&end=12:30")
+    assert response.json()["free"] is True
+
+    response = await client.get("/api/v1/assignments/free-busy?day=Tuesday")
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_current_class_lookup(client, add_assignments, captured_queries):
+    """The class in a room or taught by a faculty member at a time, from the warm index"""
+    first, second = add_assignments(2)
+    payload = {
+        "faculty_id": first.faculty_id,
+        "course_id": second.course_id,
+        "room_id": first.room_id,
+        "day_of_week": "Monday",
+        "time_slot": "11:00-12:00"
+    }
+    faculty_id, course_id, room_id = first.faculty_id, first.course_id, first.room_id
+    response = await client.post("/api/v1/assignments/", json=payload)
+    assert response.status_code == 201
+    room_number = response.json()["room_number"]
+
+    # 2026-10-19 is a Monday
+    await client.get(f"/api/v1/assignments/current?room={room_id}&at=2026-10-19T09:30:00")
+    with captured_queries() as queries:
+        response = await client.get(f"/api/v1/assignments/current?room={room_number}&at=2026-10-19T09:30:00")
+    assert queries == [], "A warm timetable index should answer without the database"
+    data = response.json()
+    assert (data["day"], data["time"]) == ("Monday", "09:30")
+    assert (data["current"]["course_id"], data["current"]["start"], data["current"]["room_id"]) == (course_id, "09:00", room_id)
+    assert (data["next"]["course_id"], data["next"]["start"]) == (second.course_id, "11:00")
+
+    response = await client.get(f"/api/v1/assignments/current?faculty={faculty_id}&at=2026-10-19T10:30:00Z")
+    data = response.json()
+    assert data["current"] is None
+    assert data["next"]["start"] == "11:00"
+
+    response = await client.get(f"/api/v1/assignments/current?faculty={faculty_id}&at=2026-10-20T10:30:00")
+    assert response.json()["current"] is None and response.json()["next"] is None
+
+    response = await client.get("/api/v1/assignments/current")
+    assert response.status_code == 400
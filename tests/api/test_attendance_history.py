@@ -7,7 +7,13 @@ from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.models.session import Session as SessionModel, SessionStatus
 from app.models.attendance import Attendance
+from app.models.assignment import Assignment
+from app.models.course import Course
+from app.models.room import Room
+from app.api.endpoints.attendance import _attachment
 from app.services.attendance import AttendanceService
+from app.services.attendance_stats import AttendanceStatsService
+from app.services.session import SessionService
 
 
 # Test data setup
@@ -192,11 +198,12 @@ async def test_get_attendance_history_api(client, test_users, test_attendances,
     # Assertions
     assert response.status_code == 200, "Should return 200 OK"
     data = response.json()
-    assert isinstance(data, list), "Should return a list"
-    assert len(data) > 0, "Should return at least one attendance record"
+    assert isinstance(data["attendances"], list), "Should return a page of records"
+    assert len(data["attendances"]) > 0, "Should return at least one attendance record"
+    assert data["next_cursor"] is None, "A single record fits on one page"
     
     # Check data structure
-    record = data[0]
+    record = data["attendances"][0]
     assert "course_code" in record, "Should include course code"
     assert "verification" in record, "Should include verification info"
 
@@ -223,6 +230,12 @@ async def test_get_faculty_sessions_api(client, test_users, test_session, test_a
     assert "attendances_count" in session, "Should include attendance count"
     assert "recent_attendances" in session, "Should include recent attendances"
 
+    response = await client.get(f"/api/v1/attendance/faculty/sessions?cursor={session['cursor']}", headers=headers)
+    assert response.status_code == 200
+    assert session["session_id"] not in [item["session_id"] for item in response.json()]
+    response = await client.get("/api/v1/attendance/faculty/sessions?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
 
 @pytest.mark.asyncio
 async def test_get_session_attendance_full_api(client, test_users, test_session, test_attendances, token_headers):
@@ -243,4 +256,65 @@ async def test_get_session_attendance_full_api(client, test_users, test_session,
     # Check data structure
     attendance = data[0]
     assert "student_name" in attendance, "Should include student name"
-    assert "verification" in attendance, "Should include verification info"
\ No newline at end of file
+    assert "verification" in attendance, "Should include verification info"
+
+@pytest.mark.asyncio
+async def test_export_session_attendance_csv_api(client, test_users, test_session, test_attendances, token_headers):
+    """The CSV export streams one row per mark"""
+    faculty = test_users["faculty"]
+    headers = token_headers(faculty)
+    
+    response = await client.get(f"/api/v1/attendance/session/{test_session.id}/export.csv", headers=headers)
+    
+    assert response.status_code == 200, "Should return 200 OK"
+    assert response.headers["content-type"].startswith("text/csv"), "Should be CSV"
+    lines = response.text.strip().splitlines()
+    assert lines[0].startswith("attendance_id,student_id"), "Should start with a header row"
+    assert len(lines) == len(test_attendances) + 1, "Should include every attendance record"
+
+
+@pytest.mark.asyncio
+async def test_attendance_percentage_api(client, db: Session, test_users, test_session, test_attendances, token_headers):
+    """Students get per-course counters; other students' counters are forbidden"""
+    student, other = test_users["students"][:2]
+    AttendanceStatsService(db).rebuild()  # The fixture inserts marks directly
+    SessionService(db).end_session(test_session.id)
+    
+    response = await client.get("/api/v1/attendance/percentage", headers=token_headers(student))
+    
+    assert response.status_code == 200, "Should return 200 OK"
+    data = response.json()
+    assert data["below_threshold"] is False, "Full attendance should not be flagged"
+    assert data["courses"] == [{
+        "course_code": "CS101", "attended": 1, "held": 1, "percentage": 100.0, "below_threshold": False
+    }], "Should report the CS101 counters"
+    
+    response = await client.get(f"/api/v1/attendance/student/{other.id}/percentage", headers=token_headers(student))
+    assert response.status_code == 403, "Students may only read their own percentage"
+
+
+@pytest.mark.asyncio
+async def test_course_matrix_export_is_limited_to_assigned_faculty(client, db, test_users, test_session, test_attendances, token_headers):
+    faculty = test_users["faculty"]
+    headers = token_headers(faculty)
+    response = await client.get("/api/v1/attendance/course/CS101/matrix", headers=headers)
+    assert response.status_code == 403
+
+    course = Course(id=str(uuid.uuid4()), course_code="CS101", course_name="Programming")
+    room = Room(id=str(uuid.uuid4()), room_number="MX-R1", capacity=30)
+    db.add_all([course, room, Assignment(id=str(uuid.uuid4()), faculty_id=faculty.id, course_id=course.id, room_id=room.id)])
+    db.commit()
+    SessionService(db).end_session(test_session.id)  # Only completed sessions are held
+    response = await client.get("/api/v1/attendance/course/CS101/matrix", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        "attachment; filename=\"CS101_attendance.csv\"; filename*=UTF-8''CS101_attendance.csv"
+    )
+
+
+def test_attachment_names_cannot_break_the_header():
+    header = _attachment('CS"1;\r\nX-Evil: 1.csv')["Content-Disposition"]
+    assert "\r" not in header and "\n" not in header
+    assert header == (
+        "attachment; filename=\"CS_1___X-Evil__1.csv\"; filename*=UTF-8''CS%221%3B%0D%0AX-Evil%3A%201.csv"
+    )
@@ -0,0 +1,132 @@
+# tests/api/test_conditional_get.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance
+from app.schemas.user import UserUpdate
+from app.services.session import SessionService
+from app.services.user import UserService
+
+
+@pytest.fixture
+def polled_data(db: Session):
+    """Two faculty members with two sessions each, and a student with a mark in the first"""
+    faculty = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"etag_faculty{i}@test.com",
+            full_name=f"ETag Faculty {i}",
+            hashed_password="hashed_password",
+            role=UserRole.FACULTY,
+            is_active=True
+        ) for i in range(2)
+    ]
+    student = User(
+        id=str(uuid.uuid4()),
+        email="etag_student@test.com",
+        full_name="ETag Student",
+        hashed_password="hashed_password",
+        role=UserRole.STUDENT,
+        roll_number="ET001",
+        is_active=True
+    )
+    started = datetime(2026, 10, 19, 9, 0)
+    sessions = [
+        SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=teacher.id,
+            course_code="ET101",
+            room_number="ET-R1",
+            status=SessionStatus.ACTIVE,
+            start_time=started + timedelta(hours=i),
+            created_at=started + timedelta(hours=i)
+        )
+        for teacher in faculty for i in range(2)
+    ]
+    mark = Attendance(
+        id=str(uuid.uuid4()), session_id=sessions[0].id, student_id=student.id, marked_at=started + timedelta(minutes=5)
+    )
+    db.add_all([*faculty, student, *sessions, mark])
+    db.commit()
+    return {"faculty": faculty, "student": student, "sessions": [session.id for session in sessions]}
+
+
+@pytest.mark.asyncio
+async def test_my_sessions_answer_304_before_loading(client, db, polled_data, token_headers, captured_queries):
+    """A poll with the current ETag costs the auth lookup and the version query only"""
+    headers = token_headers(polled_data["faculty"][0])
+    response = await client.get("/api/v1/sessions/my", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    with captured_queries() as queries:
+        response = await client.get("/api/v1/sessions/my", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert len(queries) == 2
+
+    # Same counts and times for another faculty member still give a different tag
+    other = await client.get("/api/v1/sessions/my", headers=token_headers(polled_data["faculty"][1]))
+    assert other.headers["etag"] != etag
+    # As does a different query string
+    active = await client.get("/api/v1/sessions/my?active_only=true", headers={**headers, "If-None-Match": etag})
+    assert active.status_code == 200
+
+    SessionService(db).end_session(polled_data["sessions"][0])
+    response = await client.get("/api/v1/sessions/my", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_attendance_history_changes_tag_with_new_marks_and_ended_sessions(client, db, polled_data, token_headers):
+    headers = token_headers(polled_data["student"])
+    etag = (await client.get("/api/v1/attendance/history", headers=headers)).headers["etag"]
+    response = await client.get("/api/v1/attendance/history", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    # Ending the session changes the session_status shown in the history
+    SessionService(db).end_session(polled_data["sessions"][0])
+    response = await client.get("/api/v1/attendance/history", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["attendances"][0]["session_status"] == "COMPLETED"
+    etag = response.headers["etag"]
+
+    db.add(Attendance(
+        id=str(uuid.uuid4()), session_id=polled_data["sessions"][1], student_id=polled_data["student"].id,
+        marked_at=datetime(2026, 10, 19, 10, 5)
+    ))
+    db.commit()
+    response = await client.get("/api/v1/attendance/history", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["attendances"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_user_and_assignment_lists_are_conditional(client, db, polled_data):
+    etag = (await client.get("/api/v1/users/?role=FACULTY")).headers["etag"]
+    assert (await client.get("/api/v1/users/?role=FACULTY", headers={"If-None-Match": etag})).status_code == 304
+
+    polled_data["faculty"][0].is_active = False
+    db.commit()
+    assert (await client.get("/api/v1/users/?role=FACULTY", headers={"If-None-Match": etag})).status_code == 200
+
+    etag = (await client.get("/api/v1/assignments/")).headers["etag"]
+    assert (await client.get("/api/v1/assignments/", headers={"If-None-Match": etag})).status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_edits_within_one_second_still_change_the_tag(client, db, polled_data):
+    faculty = polled_data["faculty"][0]
+    etags = [(await client.get("/api/v1/users/?role=FACULTY")).headers["etag"]]
+    for name in ("Renamed Once", "Renamed Twice"):
+        UserService(db).update_user(faculty.id, UserUpdate(full_name=name))
+        etags.append((await client.get("/api/v1/users/?role=FACULTY")).headers["etag"])
+    UserService(db).deactivate_user(faculty.id)
+    UserService(db).activate_user(faculty.id)
+    etags.append((await client.get("/api/v1/users/?role=FACULTY")).headers["etag"])
+    assert len(set(etags)) == len(etags)
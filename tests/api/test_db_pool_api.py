@@ -0,0 +1,61 @@
+# tests/api/test_db_pool_api.py
+import pytest
+import uuid
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.db.session import postgres_engine_options
+from app.main import handle_pool_timeout
+from app.models.user import User, UserRole
+
+
+def _user(db, role):
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"pool_{role.value.lower()}@test.com",
+        full_name=f"Pool {role.value.title()}",
+        hashed_password="hashed_password",
+        role=role,
+        is_active=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_show_the_requests_own_connection(client, db, token_headers):
+    admin = _user(db, UserRole.ADMIN)
+    response = await client.get("/api/v1/admin/db/pool", headers=token_headers(admin))
+    assert response.status_code == 200
+    pools = response.json()["pools"]
+    assert [pool["name"] for pool in pools] == ["writer", "reader"]
+    writer, reader = pools
+    assert writer["size"] == 1
+    # The admin lookup for this GET holds a reader connection while the stats are read
+    assert reader["pool"] == "QueuePool" and reader["checked_out"] >= 1
+    assert reader["overflow"] >= 0
+
+    student = _user(db, UserRole.STUDENT)
+    response = await client.get("/api/v1/admin/db/pool", headers=token_headers(student))
+    assert response.status_code == 403
+
+
+def test_postgres_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "POSTGRES_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "POSTGRES_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(settings, "POSTGRES_STATEMENT_TIMEOUT_MS", 15000)
+    options = postgres_engine_options()
+    assert options["pool_size"] == 20 and options["max_overflow"] == 5
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=15000"}
+
+    monkeypatch.setattr(settings, "POSTGRES_STATEMENT_TIMEOUT_MS", 0)
+    assert "connect_args" not in postgres_engine_options()
+
+
+def test_pool_timeout_answers_503():
+    response = handle_pool_timeout(None, PoolTimeoutError("QueuePool limit reached"))
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,95 @@
+# tests/api/test_reference_data_api.py
+import pytest
+import uuid
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.course import Course
+from app.models.room import Room
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def reference_data(db: Session):
+    db.add_all([
+        *[Course(id=str(uuid.uuid4()), course_code=f"RD{i}01", course_name=f"Reference {i}") for i in range(3)],
+        *[Room(id=str(uuid.uuid4()), room_number=f"RD-R{i}", capacity=30) for i in range(2)],
+    ])
+    db.commit()
+
+
+@pytest.mark.asyncio
+async def test_course_list_is_cached_and_conditional(client, reference_data, captured_queries):
+    """A repeat poll with the ETag gets 304 without any query; a write changes the ETag"""
+    response = await client.get("/api/v1/courses/")
+    assert response.status_code == 200
+    assert [course["course_code"] for course in response.json()["courses"]] == ["RD001", "RD101", "RD201"]
+    etag = response.headers["etag"]
+
+    with captured_queries() as queries:
+        cached = await client.get("/api/v1/courses/")
+        not_modified = await client.get("/api/v1/courses/", headers={"If-None-Match": etag})
+    assert queries == [], "A warm cache should answer without the database"
+    assert cached.headers["etag"] == etag
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    response = await client.post("/api/v1/courses/", json={"course_code": "RD301", "course_name": "Reference 3"})
+    assert response.status_code == 201
+    response = await client.get("/api/v1/courses/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["courses"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_room_list_is_cached_and_conditional(client, reference_data, captured_queries):
+    response = await client.get("/api/v1/rooms/")
+    etag = response.headers["etag"]
+    assert [room["room_number"] for room in response.json()["rooms"]] == ["RD-R0", "RD-R1"]
+
+    with captured_queries() as queries:
+        response = await client.get("/api/v1/rooms/", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert queries == []
+    assert response.status_code == 304
+
+    room_id = (await client.get("/api/v1/rooms/")).json()["rooms"][0]["id"]
+    response = await client.delete(f"/api/v1/rooms/{room_id}")
+    assert response.status_code == 204
+    response = await client.get("/api/v1/rooms/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [room["room_number"] for room in response.json()["rooms"]] == ["RD-R1"]
+
+
+@pytest.mark.asyncio
+async def test_enrollment_routes_require_admin_or_assigned_faculty(client, db, token_headers):
+    users = {
+        role: User(
+            id=str(uuid.uuid4()), email=f"enroll_{role.value.lower()}@test.com", full_name=role.value,
+            hashed_password="hashed_password", role=role, roll_number="EN001" if role == UserRole.STUDENT else None,
+            is_active=True
+        ) for role in (UserRole.ADMIN, UserRole.FACULTY, UserRole.STUDENT)
+    }
+    course = Course(id=str(uuid.uuid4()), course_code="EN101", course_name="Enrollment")
+    room = Room(id=str(uuid.uuid4()), room_number="EN-R1", capacity=30)
+    db.add_all([*users.values(), course, room])
+    db.commit()
+    roster = f"/api/v1/courses/{course.id}/enrollments"
+    admin, faculty, student = (token_headers(users[role]) for role in (UserRole.ADMIN, UserRole.FACULTY, UserRole.STUDENT))
+
+    assert (await client.get(roster)).status_code == 401
+    assert (await client.get(roster, headers=student)).status_code == 403
+    assert (await client.get(roster, headers=faculty)).status_code == 403
+    assert (await client.post(roster, json={"roll_numbers": ["EN001"]}, headers=faculty)).status_code == 403
+    response = await client.post(roster, json={"roll_numbers": ["EN001"]}, headers=admin)
+    assert response.status_code == 200 and response.json()["enrolled"] == 1
+
+    db.add(Assignment(id=str(uuid.uuid4()), faculty_id=users[UserRole.FACULTY].id, course_id=course.id, room_id=room.id))
+    db.commit()
+    response = await client.get(roster, headers=faculty)
+    assert response.status_code == 200
+    assert [row["roll_number"] for row in response.json()["students"]] == ["EN001"]
+
+    removal = f"{roster}/{users[UserRole.STUDENT].id}"
+    assert (await client.delete(removal, headers=faculty)).status_code == 403
+    assert (await client.delete(removal, headers=admin)).status_code == 204
@@ -0,0 +1,97 @@
+# tests/api/test_user_bulk_api.py
+import pytest
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core.cache import table_versions
+from app.models.attendance import Attendance
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def cohort(db):
+    """An admin, and 30 students over two departments where the first one has marked attendance"""
+    admin = User(
+        id=str(uuid.uuid4()),
+        email="bulk_admin@test.com",
+        full_name="Bulk Admin",
+        hashed_password="hashed_password",
+        role=UserRole.ADMIN,
+        is_active=True
+    )
+    students = [
+        {
+            "id": str(uuid.uuid4()),
+            "email": f"bulk{i}@test.com",
+            "full_name": f"Bulk Student {i}",
+            "hashed_password": "hashed_password",
+            "role": UserRole.STUDENT,
+            "department": "CSE" if i < 20 else "ECE",
+            "roll_number": f"21CS{i:03d}" if i < 20 else f"21EC{i:03d}",
+            "is_active": True
+        }
+        for i in range(30)
+    ]
+    session = SessionModel(
+        id=str(uuid.uuid4()), faculty_id=admin.id, course_code="BK101", status=SessionStatus.COMPLETED
+    )
+    course = Course(id=str(uuid.uuid4()), course_code="BK101", course_name="Bulk")
+    db.add_all([admin, session, course])
+    db.execute(insert(User), students)
+    db.add(Attendance(
+        id=str(uuid.uuid4()), session_id=session.id, student_id=students[0]["id"], marked_at=datetime(2026, 10, 19, 9, 5)
+    ))
+    db.add_all([
+        Enrollment(id=str(uuid.uuid4()), course_id=course.id, student_id=student["id"]) for student in students
+    ])
+    db.commit()
+    return {"admin": admin, "students": [student["id"] for student in students]}
+
+
+@pytest.mark.asyncio
+async def test_bulk_deactivate_and_activate_by_filter_and_ids(client, db, cohort, token_headers, captured_queries):
+    headers = token_headers(cohort["admin"])
+    version = table_versions("user")
+
+    with captured_queries() as queries:
+        response = await client.post(
+            "/api/v1/users/bulk/deactivate", json={"role": "STUDENT", "roll_number_prefix": "21CS"}, headers=headers
+        )
+    assert response.json() == {"updated": 20, "deleted": 0, "kept": 0}
+    updates = [sql for sql, _ in queries if sql.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1 and len(queries) == 2, "The auth lookup and a single UPDATE"
+    assert table_versions("user") != version, "The write should invalidate user caches"
+    assert db.query(User).filter(User.is_active.is_(False)).count() == 20
+
+    # Users already in the wanted state are not counted
+    response = await client.post(
+        "/api/v1/users/bulk/activate", json={"ids": cohort["students"][18:22]}, headers=headers
+    )
+    assert response.json()["updated"] == 2
+
+    # The caller cannot deactivate themselves
+    response = await client.post("/api/v1/users/bulk/deactivate", json={"role": "ADMIN"}, headers=headers)
+    assert response.json()["updated"] == 0
+
+    response = await client.post("/api/v1/users/bulk/deactivate", json={}, headers=headers)
+    assert response.status_code == 400
+    student = db.query(User).filter(User.id == cohort["students"][25]).one()
+    response = await client.post("/api/v1/users/bulk/deactivate", json={"role": "STUDENT"}, headers=token_headers(student))
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_keeps_users_with_history(client, db, cohort, token_headers):
+    headers = token_headers(cohort["admin"])
+    response = await client.post("/api/v1/users/bulk/delete", json={"department": "CSE"}, headers=headers)
+    assert response.json() == {"updated": 0, "deleted": 19, "kept": 1}
+
+    remaining = {user_id for (user_id,) in db.query(User.id).filter(User.role == UserRole.STUDENT)}
+    assert remaining == {cohort["students"][0], *cohort["students"][20:]}
+    # Enrollments of deleted students go with them
+    assert db.query(Enrollment).count() == 11
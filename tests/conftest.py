@@ -12,6 +12,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 os.environ["TESTING"] = "1"
 os.environ["QR_CODE_STORAGE_PATH"] = "static/qr_codes/test"
 os.environ["QR_CODE_EXPIRY_MINUTES"] = "10"
+# Keep tests away from the development database
+os.environ["SQLITE_DB_PATH"] = "test_secureattend.db"
+# Run with SQLite reads split from the single writer connection, as deployed
+os.environ["SQLITE_READ_POOL_SIZE"] = "4"
+# A test that holds the writer fails fast instead of waiting out the default
+os.environ["SQLITE_WRITE_QUEUE_TIMEOUT_SECONDS"] = "5"
+# One process, so caches need not poll the shared table versions; test_cache turns it on
+os.environ["CACHE_VERSION_CHECK_SECONDS"] = "-1"
 
 # Create test directory
 os.makedirs("static/qr_codes/test", exist_ok=True)
@@ -48,6 +56,94 @@ def qr_service(mock_settings):
     service = QRCodeService()
     return service
 
+# Create a fresh schema for the test database
+@pytest.fixture(scope="session", autouse=True)
+def test_database():
+    """Create all tables in the test database and drop the file afterwards"""
+    from app.core.config import settings
+    from app.db.base import Base
+    from app.db.session import engine, read_engine
+    
+    if os.path.exists(settings.SQLITE_DB_PATH):
+        os.remove(settings.SQLITE_DB_PATH)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+    read_engine.dispose()
+    if os.path.exists(settings.SQLITE_DB_PATH):
+        os.remove(settings.SQLITE_DB_PATH)
+
+@pytest.fixture
+def db():
+    """Database session for tests, emptying every table afterwards"""
+    from app.db.base import Base
+    from app.db.session import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+@pytest.fixture
+def captured_queries(test_database):
+    """Record the SQL statements executed inside a `with captured_queries() as queries:` block"""
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    from app.db.session import read_engine
+
+    @contextmanager
+    def _capture():
+        queries = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            # The writer's BEGIN IMMEDIATE is transaction control, and the shared
+            # cache version bump rides along with any commit to a cached table
+            if statement != "BEGIN IMMEDIATE" and not statement.startswith("INSERT INTO table_versions"):
+                queries.append((statement, parameters))
+
+        # Reads may run on the separate SQLite reader engine
+        engines = {test_database, read_engine}
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield queries
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", _record)
+
+    return _capture
+
+@pytest.fixture
+def client(db):
+    """Async HTTP client bound to the application
+
+    Each request gets its own session, as in production. The test's session
+    ends its transaction first so it never holds the single SQLite writer
+    connection while a request waits for it.
+    """
+    import httpx
+    from app.main import app
+
+    async def _release_writer(request):
+        db.commit()
+
+    return httpx.AsyncClient(app=app, base_url="http://test", event_hooks={"request": [_release_writer]})
+
+@pytest.fixture
+def token_headers():
+    """Build Authorization headers for a user"""
+    from app.core.security import create_access_token
+    
+    def _headers(user):
+        token = create_access_token(subject=str(user.id))
+        return {"Authorization": f"Bearer {token}"}
+    
+    return _headers
+
 # Clean up test environment after tests
 @pytest.fixture(scope="session", autouse=True)
 def cleanup_test_files():
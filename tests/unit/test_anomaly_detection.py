@@ -0,0 +1,120 @@
+# tests/unit/test_anomaly_detection.py
+import pytest
+import uuid
+import numpy as np
+from datetime import datetime, timedelta
+
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance
+from app.models.anomaly import AnomalyReason, AnomalyStatus, AttendanceAnomaly
+from app.services.anomaly import AnomalyService, group_robust_z, score_marks
+
+START = datetime(2026, 9, 1, 9, 0)
+
+
+def test_group_robust_z_is_per_group():
+    values = np.array([1.0, 2.0, 3.0, 100.0, 10.0, 10.0, 10.0])
+    codes = np.array([0, 0, 0, 0, 1, 1, 1])
+    z = group_robust_z(values, codes, 2)
+    assert z[3] > 10, "The outlier stands out from its own group"
+    assert np.all(z[4:] == 0), "A group with no spread scores zero"
+
+
+def test_score_marks_flags_bursts_clones_and_late_marks():
+    # One session: a mark every ~30s, a cloned pair 0.2s apart, one mark two hours in
+    rng = np.random.default_rng(7)
+    seconds = np.cumsum(rng.uniform(20, 40, 30))
+    seconds = np.sort(np.concatenate([seconds, [seconds[10] + 0.2, 7200.0]]))
+    masks = np.full(len(seconds), 7)
+    codes = np.zeros(len(seconds), dtype=np.int64)
+
+    result = score_marks(codes, seconds, np.array([0.0]), masks, burst_seconds=0.25, z_threshold=3.5)
+    reasons = result["reasons"]
+
+    burst = np.nonzero(reasons & AnomalyReason.BURST)[0]
+    assert len(burst) == 2 and seconds[burst[1]] - seconds[burst[0]] == pytest.approx(0.2)
+    assert np.all(reasons[burst] & AnomalyReason.IDENTICAL_FACTORS)
+    assert np.nonzero(reasons & AnomalyReason.LATE)[0].tolist() == [len(seconds) - 1]
+    assert np.count_nonzero(reasons) == 3, "Regular marks are not flagged"
+    assert result["score"][burst].min() > result["score"][np.nonzero(reasons == 0)[0]].max()
+
+
+@pytest.mark.parametrize("marks,seconds", [(60, 120.0), (300, 300.0)])
+def test_score_marks_leaves_dense_honest_classes_alone(marks, seconds):
+    # Students queue past the QR code: steady arrivals with some jitter, many under two seconds apart
+    rng = np.random.default_rng(11)
+    pace = seconds / marks
+    arrivals = np.sort(np.arange(marks) * pace + rng.uniform(-0.3, 0.3, marks) * pace)
+    masks = rng.choice([3, 7], marks)
+    codes = np.zeros(marks, dtype=np.int64)
+
+    result = score_marks(codes, arrivals, np.array([0.0]), masks, burst_seconds=0.25, z_threshold=3.5)
+    assert not result["reasons"].any()
+
+
+def test_score_marks_keeps_sessions_apart():
+    # The last mark of one session and the first of the next are not a burst
+    seconds = np.array([0.0, 30.0, 60.0, 60.5, 90.0])
+    codes = np.array([0, 0, 0, 1, 1])
+    result = score_marks(codes, seconds, np.array([0.0, 60.0]), np.full(5, 7), burst_seconds=0.25, z_threshold=3.5)
+    assert not result["reasons"].any()
+
+
+@pytest.fixture
+def scanned_session(db):
+    """A completed session with one cloned burst among regular marks"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="anomaly_faculty@test.com",
+        full_name="Anomaly Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    session = SessionModel(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_code="CS101",
+        room_number="R101",
+        status=SessionStatus.COMPLETED,
+        start_time=START,
+        end_time=START + timedelta(hours=1)
+    )
+    db.add_all([faculty, session])
+    offsets = [30.0 * i for i in range(1, 12)] + [30.0 * 5 + 0.3]
+    for i, offset in enumerate(offsets):
+        db.add(Attendance(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            student_id=str(uuid.uuid4()),
+            marked_at=START + timedelta(seconds=offset),
+            verification_factors={"qr": True, "face": i % 2 == 0, "proximity": True}
+        ))
+    db.commit()
+    return session
+
+
+def test_scan_flags_once_and_is_incremental(db, scanned_session):
+    service = AnomalyService(db)
+    result = service.scan(now=START + timedelta(hours=2))
+    assert result == {"sessions": 1, "flagged": 2, "high_water_mark": result["high_water_mark"]}
+
+    anomalies = service.get_anomalies()
+    assert len(anomalies) == 2
+    assert all(anomaly.reason_names[0] == "burst" for anomaly in anomalies)
+    assert all(anomaly.details["gap_seconds"] == pytest.approx(0.3) for anomaly in anomalies)
+
+    # Nothing new has completed, so the next run does no work
+    assert service.scan(now=START + timedelta(hours=3))["sessions"] == 0
+
+
+def test_rescan_keeps_reviewed_items(db, scanned_session):
+    service = AnomalyService(db)
+    service.scan(now=START + timedelta(hours=2))
+    dismissed = service.get_anomalies()[0]
+    service.review(dismissed.id, AnomalyStatus.DISMISSED, str(uuid.uuid4()))
+
+    assert service.rescan_session(scanned_session.id) == 1
+    assert db.query(AttendanceAnomaly).count() == 2
+    assert [anomaly.id for anomaly in service.get_anomalies(status=AnomalyStatus.DISMISSED)] == [dismissed.id]
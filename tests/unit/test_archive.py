@@ -0,0 +1,195 @@
+# tests/unit/test_archive.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.anomaly import AttendanceAnomaly
+from app.models.attendance import Attendance
+from app.models.rollup import (
+    CourseDailyAttendance, CourseSessionCounter, StudentCourseCounter, StudentMonthlyAttendance
+)
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User, UserRole
+from app.services.archive import ArchiveService, ArchiveStore, term_for
+from app.services.attendance import AttendanceService
+from app.services.attendance_export import AttendanceExportService, stream_session_attendance_csv
+from app.services.attendance_stats import AttendanceStatsService
+from app.services.rollup import RollupService
+
+NOW = datetime(2026, 10, 1, 9, 0)
+
+
+@pytest.fixture(autouse=True)
+def archive_path(tmp_path, monkeypatch):
+    """Point the archive at a temporary directory"""
+    monkeypatch.setattr(settings, "ARCHIVE_PATH", str(tmp_path / "archive"))
+    return tmp_path / "archive"
+
+
+@pytest.fixture
+def students(db):
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"archive_student{i}@test.com",
+            full_name=f"Archive Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"AR{i:03d}",
+            is_active=True
+        ) for i in range(2)
+    ]
+    db.add_all(students)
+    db.commit()
+    return students
+
+
+@pytest.fixture
+def add_session(db, students):
+    """Return a helper that adds a session with a mark from every student"""
+    def _add(start_time, course_code="CS101", status=SessionStatus.COMPLETED):
+        session = SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=str(uuid.uuid4()),
+            course_code=course_code,
+            room_number="R101",
+            status=status,
+            start_time=start_time
+        )
+        db.add(session)
+        for i, student in enumerate(students):
+            db.add(Attendance(
+                id=str(uuid.uuid4()),
+                session_id=session.id,
+                student_id=student.id,
+                marked_at=start_time + timedelta(minutes=i),
+                verification_factors={"qr": True, "face": i == 0, "proximity": True}
+            ))
+        db.commit()
+        # Archiving deletes the row, so hand back the id rather than the instance
+        return session.id
+
+    return _add
+
+
+def test_term_for():
+    assert term_for(datetime(2025, 2, 1)) == "2025-spring"
+    assert term_for(datetime(2025, 9, 1)) == "2025-autumn"
+
+
+def test_archive_moves_old_finished_sessions_to_partitions(db, add_session, archive_path):
+    old_spring = add_session(datetime(2025, 3, 3, 9, 0))
+    old_autumn = add_session(datetime(2025, 8, 4, 9, 0), course_code="MA201")
+    still_active = add_session(datetime(2025, 3, 4, 9, 0), status=SessionStatus.ACTIVE)
+    recent = add_session(NOW - timedelta(days=10))
+    db.add(AttendanceAnomaly(
+        attendance_id=str(uuid.uuid4()), session_id=old_spring, student_id=str(uuid.uuid4()), reasons=1, score=4.0
+    ))
+    db.commit()
+
+    result = ArchiveService(db).archive_sessions(older_than_days=180, batch_size=1, now=NOW)
+
+    assert result["sessions"] == 2
+    assert result["marks"] == 4
+    remaining = {session_id for (session_id,) in db.query(SessionModel.id)}
+    assert remaining == {still_active, recent}
+    assert db.query(Attendance).filter(Attendance.session_id.in_([old_spring, old_autumn])).count() == 0
+    assert db.query(AttendanceAnomaly).count() == 0
+
+    assert (archive_path / "term=2025-spring" / "course=CS101" / "attendance.parquet").exists()
+    assert (archive_path / "term=2025-autumn" / "course=MA201" / "sessions.parquet").exists()
+    archived = ArchiveStore().get_session(old_spring)
+    assert archived["status"] == "COMPLETED"
+    assert archived["start_time"] == datetime(2025, 3, 3, 9, 0)
+
+
+def test_archiving_is_idempotent_per_partition(db, add_session):
+    first = add_session(datetime(2025, 3, 3, 9, 0))
+    ArchiveService(db).archive_sessions(older_than_days=180, now=NOW)
+    second = add_session(datetime(2025, 3, 10, 9, 0))
+    ArchiveService(db).archive_sessions(older_than_days=180, now=NOW)
+
+    sessions = ArchiveStore().read("sessions")
+    assert sorted(sessions["id"]) == sorted([first, second])
+    assert len(ArchiveStore().read("attendance")) == 4
+
+
+def test_rebuilds_keep_archived_totals(db, students, add_session):
+    add_session(datetime(2025, 3, 3, 9, 0))
+    add_session(datetime(2025, 3, 4, 9, 0), status=SessionStatus.CANCELLED)
+    add_session(NOW - timedelta(days=1))
+    stats, rollups = AttendanceStatsService(db), RollupService(db)
+    stats.rebuild()
+    rollups.rebuild(now=NOW)
+
+    def totals():
+        return (
+            sorted((row.course_code, row.term, row.held) for row in db.query(CourseSessionCounter)),
+            sorted((row.student_id, row.term, row.attended) for row in db.query(StudentCourseCounter)),
+            sorted((row.day, row.marks, row.complete, row.face) for row in db.query(CourseDailyAttendance)),
+            sorted((row.student_id, row.month, row.marks, row.qr) for row in db.query(StudentMonthlyAttendance))
+        )
+
+    before = totals()
+    assert before[0] == [("CS101", "2025-spring", 1), ("CS101", "2026-autumn", 1)]
+    assert ArchiveService(db).archive_sessions(older_than_days=180, now=NOW)["sessions"] == 2
+
+    stats.rebuild()
+    rollups.rebuild(now=NOW)
+    assert totals() == before
+
+
+def test_history_pages_continue_into_the_archive(db, students, add_session):
+    archived = [add_session(datetime(2025, 3, day, 9, 0)) for day in (3, 4)]
+    ArchiveService(db).archive_sessions(older_than_days=180, now=NOW)
+    live = add_session(NOW - timedelta(days=1))
+
+    service = AttendanceService(db)
+    first = service.get_student_attendance_history_page(students[0].id, limit=2)
+    assert [record["session_id"] for record in first["attendances"]] == [live, archived[1]]
+    assert first["attendances"][1]["session_status"] == "COMPLETED"
+    assert first["attendances"][1]["verification"]["face"] is True
+
+    second = service.get_student_attendance_history_page(students[0].id, limit=2, cursor=first["next_cursor"])
+    assert [record["session_id"] for record in second["attendances"]] == [archived[0]]
+    assert second["next_cursor"] is None
+
+
+def test_full_live_history_pages_skip_the_archive(db, students, add_session, monkeypatch):
+    add_session(datetime(2025, 3, 3, 9, 0))
+    ArchiveService(db).archive_sessions(older_than_days=180, now=NOW)
+    live = [add_session(NOW - timedelta(days=day)) for day in (1, 2, 3)]
+
+    requested = []
+    get_student_history = ArchiveStore.get_student_history
+
+    def spy(self, student_id, limit=None, after=None):
+        requested.append(limit)
+        return get_student_history(self, student_id, limit=limit, after=after)
+
+    monkeypatch.setattr(ArchiveStore, "get_student_history", spy)
+    service = AttendanceService(db)
+    first = service.get_student_attendance_history_page(students[0].id, limit=2)
+    assert [record["session_id"] for record in first["attendances"]] == live[:2]
+    assert requested == []
+
+    second = service.get_student_attendance_history_page(students[0].id, limit=2, cursor=first["next_cursor"])
+    assert [record["session_id"] for record in second["attendances"]][0] == live[2]
+    assert second["next_cursor"] is None
+    assert requested == [2]
+
+
+def test_course_matrix_and_session_csv_include_archived_sessions(db, students, add_session):
+    old = add_session(datetime(2025, 3, 3, 9, 0))
+    ArchiveService(db).archive_sessions(older_than_days=180, now=NOW)
+    add_session(NOW - timedelta(days=1))
+
+    matrix = AttendanceExportService(db).get_course_matrix("CS101")
+    assert list(matrix["held"]) == [2, 2]
+    assert set(matrix["roll_number"]) == {student.roll_number for student in students}
+
+    csv_text = "".join(stream_session_attendance_csv(old, archived_session=ArchiveStore().get_session(old)))
+    lines = csv_text.strip().splitlines()
+    assert len(lines) == 3
+    assert "AR000" in lines[1]
@@ -0,0 +1,208 @@
+# tests/unit/test_attendance_export.py
+import io
+import time
+import pytest
+import uuid
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance
+from app.services.attendance_export import (
+    AttendanceExportService, SESSION_EXPORT_COLUMNS, pivot_attendance, iter_csv, iter_csv_rows,
+    stream_session_attendance_csv
+)
+
+
+def _sessions(count):
+    return pd.DataFrame({
+        "session_id": [f"s{i}" for i in range(count)],
+        "label": [f"session {i}" for i in range(count)]
+    })
+
+
+def test_pivot_marks_and_percentages():
+    """Cells, attended counts and percentages line up per student"""
+    marks = pd.DataFrame({
+        "student_id": ["b", "a", "a", "b", "a"],
+        "roll_number": ["R2", "R1", "R1", "R2", "R1"],
+        "student_name": ["Bea", "Al", "Al", "Bea", "Al"],
+        "session_id": ["s0", "s0", "s1", "s3", "s3"],
+        "verification_mask": [7, 7, 3, 7, 7]
+    })
+
+    matrix = pivot_attendance(marks, _sessions(4))
+
+    assert list(matrix["student_id"]) == ["a", "b"]
+    assert matrix[["session 0", "session 1", "session 2", "session 3"]].values.tolist() == [
+        [1, 1, 0, 1],
+        [1, 0, 0, 1]
+    ]
+    assert list(matrix["attended"]) == [3, 2]
+    assert list(matrix["held"]) == [4, 4]
+    assert list(matrix["percentage"]) == [75.0, 50.0]
+
+    verified = pivot_attendance(marks, _sessions(4), verified_only=True)
+    assert list(verified["attended"]) == [2, 2], "Partially verified marks are excluded"
+
+
+def test_pivot_large_course_is_fast():
+    """A 500 x 120 course pivots well under a second"""
+    rng = np.random.default_rng(7)
+    students = np.repeat(np.arange(500), 120)
+    sessions = np.tile(np.arange(120), 500)
+    keep = rng.random(students.size) < 0.8
+    marks = pd.DataFrame({
+        "student_id": [f"st{i:04d}" for i in students[keep]],
+        "roll_number": [f"R{i:04d}" for i in students[keep]],
+        "student_name": [f"Student {i}" for i in students[keep]],
+        "session_id": [f"s{i}" for i in sessions[keep]],
+        "verification_mask": np.full(keep.sum(), 7)
+    })
+
+    started = time.perf_counter()
+    matrix = pivot_attendance(marks, _sessions(120))
+    elapsed = time.perf_counter() - started
+
+    assert matrix.shape == (500, 3 + 120 + 3)
+    assert int(matrix["attended"].sum()) == int(keep.sum())
+    assert elapsed < 1.0, f"Pivot took {elapsed:.3f}s"
+
+
+def test_iter_csv_streams_all_rows():
+    """Chunked CSV output parses back to the same frame"""
+    frame = pd.DataFrame({"a": range(25), "b": [str(i) for i in range(25)]})
+
+    chunks = list(iter_csv(frame, chunk_size=10))
+
+    assert len(chunks) == 4, "Header plus three row chunks"
+    parsed = pd.read_csv(io.StringIO("".join(chunks)), dtype={"b": str})
+    pd.testing.assert_frame_equal(parsed, frame)
+
+
+def test_course_matrix_from_database(db):
+    """The service pulls marks for one course only and keeps absent sessions"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="export_faculty@test.com",
+        full_name="Export Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    student = User(
+        id=str(uuid.uuid4()),
+        email="export_student@test.com",
+        full_name="Export Student",
+        hashed_password="hashed_password",
+        role=UserRole.STUDENT,
+        roll_number="E001",
+        is_active=True
+    )
+    db.add_all([faculty, student])
+    start = datetime(2026, 2, 2, 9, 0)
+    sessions = []
+    for i, course_code in enumerate(["CS101", "CS101", "MA201"]):
+        session = SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=faculty.id,
+            course_code=course_code,
+            room_number="R101",
+            status=SessionStatus.COMPLETED,
+            start_time=start + timedelta(days=i)
+        )
+        sessions.append(session)
+        db.add(session)
+    # Sessions that have not ended are not held yet
+    for i, status in enumerate([SessionStatus.ACTIVE, SessionStatus.CREATED]):
+        session = SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=faculty.id,
+            course_code="CS101",
+            room_number="R101",
+            status=status,
+            start_time=start + timedelta(days=3 + i)
+        )
+        sessions.append(session)
+        db.add(session)
+    for session in (sessions[0], sessions[2], sessions[3]):
+        db.add(Attendance(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            student_id=student.id,
+            marked_at=session.start_time,
+            verification_factors={"qr": True, "face": True, "proximity": True}
+        ))
+    db.commit()
+
+    export_service = AttendanceExportService(db)
+    matrix = export_service.get_course_matrix("CS101")
+
+    assert len(matrix) == 1
+    row = matrix.iloc[0]
+    assert row["roll_number"] == "E001"
+    assert row["attended"] == 1
+    assert row["held"] == 2
+    assert row["percentage"] == 50.0
+    assert export_service.get_course_matrix("NOPE999") is None
+
+
+def test_iter_csv_rows_flushes_in_batches():
+    """Rows are written out every flush_every rows rather than all at once"""
+    rows = ((i, f"name {i}") for i in range(7))
+
+    chunks = list(iter_csv_rows(["id", "name"], rows, flush_every=3))
+
+    assert len(chunks) == 3, "Two full batches and the remainder"
+    parsed = pd.read_csv(io.StringIO("".join(chunks)))
+    assert list(parsed["id"]) == list(range(7))
+
+
+def test_stream_session_attendance_csv(db):
+    """Streaming export yields every mark of the session with factor flags"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="stream_faculty@test.com",
+        full_name="Stream Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    session = SessionModel(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_code="CS101",
+        status=SessionStatus.ACTIVE,
+        start_time=datetime(2026, 3, 2, 9, 0)
+    )
+    db.add_all([faculty, session])
+    for i in range(12):
+        student = User(
+            id=str(uuid.uuid4()),
+            email=f"stream_student{i}@test.com",
+            full_name=f"Stream Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"ST{i:03d}",
+            is_active=True
+        )
+        db.add(student)
+        db.add(Attendance(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            student_id=student.id,
+            marked_at=session.start_time + timedelta(seconds=i),
+            verification_factors={"qr": True, "face": i % 2 == 0, "proximity": True}
+        ))
+    db.commit()
+
+    chunks = list(stream_session_attendance_csv(session.id, batch_size=5))
+
+    assert len(chunks) == 3
+    parsed = pd.read_csv(io.StringIO("".join(chunks)))
+    assert list(parsed.columns) == SESSION_EXPORT_COLUMNS
+    assert list(parsed["roll_number"]) == [f"ST{i:03d}" for i in range(12)]
+    assert int(parsed["face"].sum()) == 6
+    assert int(parsed["complete"].sum()) == 6
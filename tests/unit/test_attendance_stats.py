@@ -0,0 +1,152 @@
+# tests/unit/test_attendance_stats.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.timetable import term_for
+from app.models.user import User, UserRole
+from app.models.session import SessionStatus
+from app.models.rollup import CourseSessionCounter, StudentCourseCounter
+from app.services.attendance import AttendanceService
+from app.services.attendance_stats import AttendanceStatsService, attendance_percentage
+from app.services.session import SessionService
+
+
+@pytest.fixture
+def faculty(db):
+    """Create a faculty member"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="stats_faculty@test.com",
+        full_name="Stats Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    db.add(faculty)
+    db.commit()
+    return faculty
+
+
+@pytest.fixture
+def students(db):
+    """Create two students"""
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"stats_student{i}@test.com",
+            full_name=f"Stats Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"ST{i:03d}",
+            is_active=True
+        ) for i in range(2)
+    ]
+    db.add_all(students)
+    db.commit()
+    return students
+
+
+@pytest.fixture
+def run_session(db, faculty):
+    """Return a helper that runs a session through the services, marking the given students"""
+    def _run(course_code, present):
+        session_service = SessionService(db)
+        session = session_service.create_session(faculty.id, course_code, "R101")
+        session_service.start_session(session.id)
+        for student in present:
+            AttendanceService(db).create_attendance(student.id, session.id, {"qr": True, "face": True, "proximity": True})
+        return session_service.end_session(session.id)
+
+    return _run
+
+
+def test_percentage_rounding_and_cap():
+    assert attendance_percentage(3, 4) == 75.0
+    assert attendance_percentage(2, 3) == 66.67
+    assert attendance_percentage(2, 1) == 100.0
+    assert attendance_percentage(0, 0) == 0.0
+
+
+def test_counters_follow_marks_and_session_end(db, students, run_session):
+    for i in range(4):
+        ended = run_session("CS101", students if i < 3 else students[:1])
+        assert ended.status == SessionStatus.COMPLETED
+    run_session("MA201", students[1:])
+
+    held = {row.course_code: row.held for row in db.query(CourseSessionCounter).all()}
+    assert held == {"CS101": 4, "MA201": 1}
+
+    summary = AttendanceStatsService(db).get_student_summary(students[1].id)
+    courses = {course["course_code"]: course for course in summary["courses"]}
+    assert courses["CS101"] == {
+        "course_code": "CS101", "attended": 3, "held": 4, "percentage": 75.0, "below_threshold": False
+    }
+    assert courses["MA201"]["percentage"] == 100.0
+    assert summary["below_threshold"] is False
+
+    flagged = AttendanceStatsService(db).get_student_summary(students[1].id, threshold=80)
+    assert flagged["below_threshold"] is True
+    assert [course["course_code"] for course in flagged["courses"] if course["below_threshold"]] == ["CS101"]
+
+
+def test_summary_is_a_single_query(db, students, run_session, captured_queries):
+    run_session("CS101", students)
+    run_session("MA201", students)
+    student_id = students[0].id
+
+    with captured_queries() as queries:
+        AttendanceStatsService(db).get_student_summary(student_id)
+    assert len(queries) == 1
+
+
+def test_deleted_sessions_leave_the_counters(db, students, run_session):
+    kept = run_session("CS101", students[:1])
+    deleted = run_session("CS101", students)
+    assert SessionService(db).delete_session(deleted.id)
+
+    service = AttendanceStatsService(db)
+    summaries = [service.get_student_summary(student.id) for student in students]
+    assert [course["attended"] for course in summaries[0]["courses"]] == [1]
+    assert [course["attended"] for course in summaries[1]["courses"]] == [0]
+    assert summaries[0]["courses"][0]["held"] == 1
+    assert kept.status == SessionStatus.COMPLETED
+
+    service.rebuild()
+    assert [service.get_student_summary(student.id) for student in students][0] == summaries[0]
+
+
+def test_rebuild_matches_incremental_counters(db, students, run_session):
+    run_session("CS101", students)
+    run_session("CS101", students[:1])
+    run_session("MA201", students)
+    service = AttendanceStatsService(db)
+    before = [service.get_student_summary(student.id) for student in students]
+
+    db.query(StudentCourseCounter).delete()
+    db.commit()
+    service.rebuild()
+
+    assert [service.get_student_summary(student.id) for student in students] == before
+
+
+def test_counters_are_kept_per_term(db, students, run_session):
+    run_session("CS101", students)
+    last_year = run_session("CS101", students[:1])
+    last_year.start_time = last_year.created_at = datetime.utcnow() - timedelta(days=365)
+    db.commit()
+    service = AttendanceStatsService(db)
+    service.rebuild()
+
+    current = [service.get_student_summary(student.id) for student in students]
+    assert current[0]["term"] == term_for(datetime.utcnow())
+    assert [(course["attended"], course["held"]) for course in current[1]["courses"]] == [(1, 1)]
+    old_term = term_for(last_year.start_time)
+    assert [(course["attended"], course["held"]) for course in service.get_student_summary(
+        students[0].id, term=old_term)["courses"]] == [(1, 1)]
+    assert service.get_student_summary(students[1].id, term=old_term)["courses"] == []
+
+    # Deleting last year's session only takes back last year's counts
+    assert SessionService(db).delete_session(last_year.id)
+    assert [service.get_student_summary(student.id) for student in students] == current
+    assert service.get_student_summary(students[0].id, term=old_term)["courses"][0]["held"] == 0
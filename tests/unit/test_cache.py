@@ -0,0 +1,103 @@
+# tests/unit/test_cache.py
+import uuid
+
+from sqlalchemy import text
+
+from app.core.cache import VersionedCache, table_versions
+from app.core.config import settings
+from app.db.session import engine
+from app.models.course import Course
+from app.models.room import Room
+from app.models.table_version import TableVersion
+
+
+def _course(code):
+    return Course(id=str(uuid.uuid4()), course_code=code, course_name=f"Course {code}")
+
+
+def test_commit_bumps_only_written_tables(db):
+    before = table_versions("courses", "rooms")
+    db.add(_course("CC101"))
+    db.flush()
+    assert table_versions("courses", "rooms") == before, "Nothing is published before commit"
+
+    db.commit()
+    courses, rooms = table_versions("courses", "rooms")
+    assert courses > before[0]
+    assert rooms == before[1]
+
+
+def test_rollback_discards_pending_writes(db):
+    before = table_versions("courses")
+    db.add(_course("CC102"))
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert table_versions("courses") == before
+
+
+def test_bulk_update_and_delete_bump(db):
+    db.add(Room(id=str(uuid.uuid4()), room_number="CR1", capacity=10))
+    db.commit()
+
+    before = table_versions("rooms")
+    db.query(Room).filter(Room.room_number == "CR1").update({Room.capacity: 20})
+    db.commit()
+    after_update = table_versions("rooms")
+    assert after_update > before
+
+    db.query(Room).filter(Room.room_number == "CR1").delete()
+    db.commit()
+    assert table_versions("rooms") > after_update
+
+
+def test_versioned_cache_recomputes_after_write(db):
+    cache = VersionedCache("test_courses", tables=("courses",))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return db.query(Course).count()
+
+    assert cache.get("all", compute) == 0
+    assert cache.get("all", compute) == 0
+    assert len(calls) == 1, "Second read is served from the cache"
+
+    db.add(_course("CC103"))
+    db.commit()
+    assert cache.get("all", compute) == 1
+    assert len(calls) == 2
+
+
+def test_writes_in_other_workers_invalidate_through_shared_versions(db, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_VERSION_CHECK_SECONDS", 0)
+    cache = VersionedCache("test_shared_courses", tables=("courses",))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return db.query(Course).count()
+
+    db.add(_course("CC104"))
+    db.commit()
+    # The shared counter moved in the same transaction as the write
+    shared = db.query(TableVersion.version).filter(TableVersion.name == "courses").scalar()
+    assert shared >= 1
+
+    assert cache.get("all", compute) == 1
+    assert cache.get("all", compute) == 1
+    assert len(calls) == 1
+
+    # Another worker commits a course: its transaction bumps only the shared counter
+    db.commit()
+    local = table_versions("courses")
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO courses (id, course_code, course_name) VALUES (:id, 'CC105', 'Course CC105')"),
+            {"id": str(uuid.uuid4())}
+        )
+        conn.execute(text("UPDATE table_versions SET version = version + 1 WHERE name = 'courses'"))
+    assert table_versions("courses") == local
+
+    assert cache.get("all", compute) == 2
+    assert len(calls) == 2
@@ -0,0 +1,94 @@
+# tests/unit/test_db_routing.py
+import pytest
+import threading
+import time
+
+from fastapi import APIRouter
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.db.session import create_engines, uses_reader
+
+
+@pytest.fixture
+def split_engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_READ_POOL_SIZE", 2)
+    monkeypatch.setattr(settings, "SQLITE_WRITE_QUEUE_TIMEOUT_SECONDS", 5.0)
+    writer, reader = create_engines(f"sqlite:///{tmp_path / 'split.db'}")
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE marks (worker INTEGER, n INTEGER)"))
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def test_reader_pool_is_read_only_and_not_blocked_by_the_writer(split_engines):
+    writer, reader = split_engines
+    assert writer is not reader
+    assert writer.pool.size() == 1
+
+    with reader.connect() as conn:
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(text("INSERT INTO marks VALUES (0, 0)"))
+
+    # An open write transaction does not stop readers under WAL
+    with writer.begin() as conn:
+        conn.execute(text("INSERT INTO marks VALUES (0, 1)"))
+        with reader.connect() as read:
+            assert read.execute(text("SELECT COUNT(*) FROM marks")).scalar() == 0
+    with reader.connect() as read:
+        assert read.execute(text("SELECT COUNT(*) FROM marks")).scalar() == 1
+
+
+def test_writes_queue_for_the_single_writer_connection(split_engines):
+    writer, _ = split_engines
+    errors, active, overlaps = [], [], []
+
+    def write(worker: int) -> None:
+        try:
+            for n in range(5):
+                with writer.begin() as conn:
+                    active.append(worker)
+                    overlaps.append(len(active))
+                    # Read then write: with deferred transactions this is where "database is locked" comes from
+                    conn.execute(text("SELECT COUNT(*) FROM marks")).scalar()
+                    time.sleep(0.002)
+                    conn.execute(text("INSERT INTO marks VALUES (:worker, :n)"), {"worker": worker, "n": n})
+                    active.remove(worker)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert max(overlaps) == 1, "Only one write transaction should run at a time"
+    with writer.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM marks")).scalar() == 30
+
+
+def _request(router: APIRouter, path: str, method: str) -> Request:
+    route = next(route for route in router.routes if route.path == path and method in route.methods)
+    return Request({"type": "http", "method": method, "path": path, "headers": [], "route": route})
+
+
+def test_get_db_routes_reads_to_the_reader():
+    router = APIRouter()
+
+    @router.get("/items")
+    def list_items():
+        return []
+
+    @router.post("/items")
+    def create_item():
+        return {}
+
+    assert uses_reader(_request(router, "/items", "GET")) is True
+    assert uses_reader(_request(router, "/items", "POST")) is False
+    # Outside a matched route (e.g. a background task) the writer is the safe choice
+    assert uses_reader(Request({"type": "http", "method": "GET", "path": "/", "headers": []})) is False
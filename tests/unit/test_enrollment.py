@@ -0,0 +1,112 @@
+# tests/unit/test_enrollment.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.models.attendance import Attendance
+from app.models.course import Course
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User, UserRole
+from app.services.enrollment import EnrollmentService, sorted_difference
+
+
+@pytest.fixture
+def roster_data(db):
+    """A 300-student course with one session that 200 of them marked"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="roster_faculty@test.com",
+        full_name="Roster Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    course = Course(id=str(uuid.uuid4()), course_code="RO101", course_name="Rosters")
+    session = SessionModel(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_code="RO101",
+        status=SessionStatus.ACTIVE,
+        start_time=datetime(2026, 10, 19, 9, 0)
+    )
+    db.add_all([faculty, course, session])
+    students = [
+        {
+            "id": str(uuid.uuid4()),
+            "email": f"roster{i}@test.com",
+            "full_name": f"Roster Student {i}",
+            "hashed_password": "hashed_password",
+            "role": UserRole.STUDENT,
+            "roll_number": f"RO{i:04d}",
+            "is_active": True
+        }
+        for i in range(300)
+    ]
+    db.execute(insert(User), students)
+    db.execute(insert(Attendance), [
+        {
+            "id": str(uuid.uuid4()),
+            "session_id": session.id,
+            "student_id": student["id"],
+            "marked_at": session.start_time + timedelta(seconds=i),
+            "verification_mask": 0
+        }
+        for i, student in enumerate(students[:200])
+    ])
+    db.commit()
+    return {"course": course.id, "session": session.id, "students": students}
+
+
+def test_bulk_import_skips_enrolled_and_reports_unknown(db, roster_data, captured_queries):
+    service = EnrollmentService(db)
+    course_id, students = roster_data["course"], roster_data["students"]
+
+    with captured_queries() as queries:
+        result = service.enroll_students(course_id, roll_numbers=[s["roll_number"] for s in students[:250]])
+    assert result == {"enrolled": 250, "already_enrolled": 0, "not_found": []}
+    assert len(queries) == 4, "Course check, student lookup, enrolled lookup and one multi-row insert"
+
+    result = service.enroll_students(
+        course_id,
+        student_ids=[s["id"] for s in students[240:]],
+        emails=["roster0@test.com", "roster_faculty@test.com", "nobody@test.com"]
+    )
+    assert result == {"enrolled": 50, "already_enrolled": 11, "not_found": ["nobody@test.com", "roster_faculty@test.com"]}
+    assert len(service.get_roster("RO101")) == 300
+
+    with pytest.raises(ValueError):
+        service.enroll_students(str(uuid.uuid4()), roll_numbers=["RO0001"])
+
+    assert service.unenroll_student(course_id, students[0]["id"]) is True
+    assert service.unenroll_student(course_id, students[0]["id"]) is False
+
+
+def test_absentees_from_anti_join_and_cached_roster_agree(db, roster_data, captured_queries):
+    service = EnrollmentService(db)
+    students = roster_data["students"]
+    service.enroll_students(roster_data["course"], student_ids=[s["id"] for s in students])
+    session = db.query(SessionModel).filter(SessionModel.id == roster_data["session"]).one()
+
+    with captured_queries() as queries:
+        joined = service.get_session_absentees(session, use_cache=False)
+    assert len(queries) == 1, "Absentees should come from a single anti-join"
+    assert joined["absent"] == 100
+    assert [s["roll_number"] for s in joined["absentees"]] == [s["roll_number"] for s in students[200:]]
+
+    service.get_session_absentees(session, use_cache=True)
+    with captured_queries() as queries:
+        cached = service.get_session_absentees(session, use_cache=True)
+    assert len(queries) == 1, "A warm roster only needs the session's attended ids"
+    assert cached == joined
+
+    # New enrollments invalidate the cached roster
+    service.unenroll_student(roster_data["course"], students[299]["id"])
+    assert service.get_session_absentees(session, use_cache=True)["absent"] == 99
+
+
+def test_sorted_difference():
+    assert sorted_difference(["a", "b", "c", "d"], ["b", "d", "e"]) == [0, 2]
+    assert sorted_difference(["a", "b"], []) == [0, 1]
+    assert sorted_difference([], ["a"]) == []
@@ -0,0 +1,132 @@
+# tests/unit/test_faculty_session_summary.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance
+from app.services.attendance import AttendanceService, decode_history_cursor
+
+
+@pytest.fixture
+def faculty(db):
+    """Create a faculty member"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="summary_faculty@test.com",
+        full_name="Summary Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    db.add(faculty)
+    db.commit()
+    return faculty
+
+
+@pytest.fixture
+def students(db):
+    """Create a handful of students"""
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"summary_student{i}@test.com",
+            full_name=f"Summary Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"SS{i:03d}",
+            is_active=True
+        ) for i in range(7)
+    ]
+    db.add_all(students)
+    db.commit()
+    return students
+
+
+@pytest.fixture
+def add_sessions(db, faculty, students):
+    """Return a helper that adds sessions with one mark per student"""
+    created = []
+
+    def _add(count):
+        base = datetime.utcnow() - timedelta(days=len(created) + count)
+        for i in range(count):
+            session = SessionModel(
+                id=str(uuid.uuid4()),
+                faculty_id=faculty.id,
+                course_code="CS101",
+                room_number="R101",
+                status=SessionStatus.COMPLETED,
+                start_time=base + timedelta(days=i),
+                created_at=base + timedelta(days=i)
+            )
+            db.add(session)
+            for j, student in enumerate(students):
+                db.add(Attendance(
+                    id=str(uuid.uuid4()),
+                    session_id=session.id,
+                    student_id=student.id,
+                    marked_at=session.start_time + timedelta(minutes=j),
+                    verification_factors={"qr": True, "face": True, "proximity": True}
+                ))
+            created.append(session)
+        db.commit()
+        return created
+
+    return _add
+
+
+def test_summary_contents(db, faculty, students, add_sessions):
+    """Counts are complete and recent marks are the latest five"""
+    add_sessions(2)
+    attendance_service = AttendanceService(db)
+
+    sessions = attendance_service.get_faculty_session_attendance(faculty.id)
+
+    assert len(sessions) == 2
+    for session in sessions:
+        assert session["attendances_count"] == len(students)
+        recent = session["recent_attendances"]
+        assert len(recent) == 5, "Only the latest five marks are previewed"
+        marked = [record["marked_at"] for record in recent]
+        assert marked == sorted(marked, reverse=True), "Recent marks should be newest first"
+        assert recent[0]["student_name"] == "Summary Student 6"
+        assert recent[0]["verification_methods"] == ["qr", "face", "proximity"]
+
+
+def test_summary_pagination(db, faculty, add_sessions):
+    """limit/cursor walk through sessions newest first without overlap or gaps"""
+    sessions = add_sessions(5)
+    # Sessions created in the same instant must not be skipped at a page boundary
+    for session in sessions[1:4]:
+        session.created_at = sessions[0].created_at
+    db.commit()
+    attendance_service = AttendanceService(db)
+
+    first_page = attendance_service.get_faculty_session_attendance(faculty.id, limit=3)
+    after = decode_history_cursor(first_page[-1]["cursor"])
+    second_page = attendance_service.get_faculty_session_attendance(faculty.id, limit=3, after=after)
+
+    assert len(first_page) == 3
+    assert len(second_page) == 2
+    seen = [session["session_id"] for session in first_page + second_page]
+    assert sorted(seen) == sorted(session.id for session in sessions)
+
+
+def test_summary_query_count_is_constant(db, faculty, add_sessions, captured_queries):
+    """The number of queries does not grow with the number of sessions"""
+    attendance_service = AttendanceService(db)
+    faculty_id = faculty.id
+
+    add_sessions(2)
+    db.expire_all()
+    with captured_queries() as few:
+        assert len(attendance_service.get_faculty_session_attendance(faculty_id)) == 2
+
+    add_sessions(20)
+    db.expire_all()
+    with captured_queries() as many:
+        assert len(attendance_service.get_faculty_session_attendance(faculty_id)) == 22
+
+    assert len(many) == len(few) == 3
@@ -0,0 +1,154 @@
+# tests/unit/test_headcount.py
+import pytest
+import uuid
+from datetime import datetime
+
+from app.core.config import settings
+from app.models.room import Room
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User, UserRole
+from app.services import attendance as attendance_module
+from app.services.attendance import AttendanceService
+from app.services.headcount import HeadcountService, headcounts
+from app.services.session import SessionService
+
+
+@pytest.fixture
+def small_room_session(db, monkeypatch):
+    """A new session in a three-seat room, four students, and QR codes that always verify"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="headcount_faculty@test.com",
+        full_name="Headcount Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"headcount{i}@test.com",
+            full_name=f"Headcount Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"HC{i:03d}",
+            is_active=True
+        )
+        for i in range(4)
+    ]
+    room = Room(id=str(uuid.uuid4()), room_number="HC-R1", capacity=3)
+    session = SessionModel(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_code="HC101",
+        room_number="HC-R1",
+        status=SessionStatus.CREATED,
+        created_at=datetime(2026, 10, 19, 9, 0)
+    )
+    db.add_all([faculty, *students, room, session])
+    db.commit()
+
+    session_id = session.id
+    monkeypatch.setattr(
+        attendance_module.QRCodeService, "verify_qr_data",
+        lambda self, data: {"valid": True, "data": {"session_id": session_id}}
+    )
+    yield {"session": session_id, "students": [student.id for student in students]}
+    headcounts.clear()
+
+
+def test_marks_beyond_capacity_are_rejected_from_memory(db, small_room_session, captured_queries):
+    session_id, students = small_room_session["session"], small_room_session["students"]
+    SessionService(db).start_session(session_id)
+    assert headcounts.get(session_id) == (0, 3)
+
+    service = AttendanceService(db)
+    for student_id in students[:3]:
+        assert service.mark_attendance_with_qr(student_id, "qr", {"qr_code": True})["success"]
+    assert headcounts.get(session_id) == (3, 3)
+
+    with captured_queries() as queries:
+        result = service.mark_attendance_with_qr(students[3], "qr", {"qr_code": True})
+    assert result == {"success": False, "error": "Room capacity reached (3 marks)"}
+    assert len(queries) == 3, "Session and duplicate lookups, and one COUNT to confirm the room is full"
+
+    # A duplicate is still reported as such, not as a full room
+    result = service.mark_attendance_with_qr(students[0], "qr", {"qr_code": True})
+    assert result["error"] == "Attendance already marked for this session"
+
+    session = SessionService(db).get_session(session_id)
+    with captured_queries() as queries:
+        assert HeadcountService(db).get_live(session) == (3, 3)
+    assert len(queries) == 0
+
+    SessionService(db).end_session(session_id)
+    assert headcounts.get(session_id) is None
+    assert HeadcountService(db).count_marks(session) == (3, 3)
+
+
+def test_headcount_reseeds_when_stale(db, small_room_session, monkeypatch):
+    session_id, students = small_room_session["session"], small_room_session["students"]
+    SessionService(db).start_session(session_id)
+    AttendanceService(db).mark_attendance_with_qr(students[0], "qr", {"qr_code": True})
+
+    # Marks taken by another worker only show up after a re-seed
+    headcounts.seed(session_id, 0, 3)
+    session = SessionService(db).get_session(session_id)
+    assert HeadcountService(db).get_live(session).count == 0
+    monkeypatch.setattr(settings, "HEADCOUNT_RESYNC_SECONDS", 60)
+    headcounts._entries[session_id].seeded_at -= 61
+    assert HeadcountService(db).get_live(session).count == 1
+
+    # Sessions started before this worker came up are seeded on first mark
+    headcounts.clear()
+    assert AttendanceService(db).mark_attendance_with_qr(students[1], "qr", {"qr_code": True})["success"]
+    assert headcounts.get(session_id) == (2, 3)
+
+
+def test_marks_near_capacity_confirm_with_count(db, small_room_session, monkeypatch, captured_queries):
+    session_id, students = small_room_session["session"], small_room_session["students"]
+    SessionService(db).start_session(session_id)
+    monkeypatch.setattr(settings, "HEADCOUNT_CONFIRM_MARGIN", 1)
+    service = AttendanceService(db)
+    for student_id in students[:3]:
+        assert service.mark_attendance_with_qr(student_id, "qr", {"qr_code": True})["success"]
+
+    # Another worker took the last seat; this worker still thinks one is free
+    headcounts.seed(session_id, 2, 3)
+    result = service.mark_attendance_with_qr(students[3], "qr", {"qr_code": True})
+    assert result == {"success": False, "error": "Room capacity reached (3 marks)"}
+    assert headcounts.get(session_id) == (3, 3)
+
+    # Far from capacity the check stays in memory
+    monkeypatch.setattr(settings, "HEADCOUNT_CONFIRM_MARGIN", 0)
+    headcounts.seed(session_id, 0, 3)
+    session = SessionService(db).get_session(session_id)
+    with captured_queries() as queries:
+        assert HeadcountService(db).get_for_mark(session) == (0, 3)
+    assert len(queries) == 0
+
+
+def test_reseed_keeps_uncommitted_reservations():
+    headcounts.seed("s1", 1, 3)
+    assert headcounts.reserve("s1") is True
+    # A COUNT taken before that mark commits does not see it
+    assert headcounts.seed("s1", 1, 3) == (2, 3)
+    headcounts.confirm("s1")
+    assert headcounts.seed("s1", 2, 3) == (2, 3)
+    assert headcounts.reserve("s1") is True
+    headcounts.release("s1")
+    assert headcounts.seed("s1", 2, 3) == (2, 3)
+    headcounts.clear()
+
+
+def test_reserve_and_release():
+    headcounts.seed("s1", 1, 2)
+    assert headcounts.reserve("s1") is True
+    assert headcounts.reserve("s1") is False
+    headcounts.release("s1")
+    assert headcounts.get("s1") == (1, 2)
+    # Untracked sessions and rooms without a capacity never block a mark
+    assert headcounts.reserve("unknown") is True
+    headcounts.seed("s2", 40, None)
+    assert headcounts.reserve("s2") is True
+    headcounts.clear()
@@ -0,0 +1,87 @@
+# tests/unit/test_history_pagination.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance
+from app.services.attendance import AttendanceService, decode_history_cursor
+
+
+@pytest.fixture
+def student_history(db):
+    """Create a student with seven marks, two of which share a timestamp"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="history_faculty@test.com",
+        full_name="History Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    student = User(
+        id=str(uuid.uuid4()),
+        email="history_student@test.com",
+        full_name="History Student",
+        hashed_password="hashed_password",
+        role=UserRole.STUDENT,
+        roll_number="H001",
+        is_active=True
+    )
+    db.add_all([faculty, student])
+
+    base = datetime(2026, 1, 5, 9, 0)
+    times = [base + timedelta(days=i) for i in range(6)] + [base + timedelta(days=5)]
+    for marked_at in times:
+        session = SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=faculty.id,
+            course_code="CS101",
+            room_number="R101",
+            status=SessionStatus.COMPLETED,
+            start_time=marked_at
+        )
+        db.add(session)
+        db.add(Attendance(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            student_id=student.id,
+            marked_at=marked_at,
+            verification_factors={"qr": True, "face": True, "proximity": True}
+        ))
+    db.commit()
+    return student
+
+
+def test_pages_cover_history_once(db, student_history):
+    """Following next_cursor returns every record exactly once, newest first"""
+    attendance_service = AttendanceService(db)
+
+    pages = []
+    cursor = None
+    while True:
+        page = attendance_service.get_student_attendance_history_page(student_history.id, limit=3, cursor=cursor)
+        pages.append(page["attendances"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    records = [record for page in pages for record in page]
+    assert len({record["id"] for record in records}) == 7, "No record should repeat across pages"
+    keys = [(record["marked_at"], record["id"]) for record in records]
+    assert keys == sorted(keys, reverse=True), "Records should be ordered by (marked_at, id) descending"
+
+
+def test_cursor_is_opaque_and_validated(db, student_history):
+    """The cursor round-trips and garbage is rejected"""
+    attendance_service = AttendanceService(db)
+
+    page = attendance_service.get_student_attendance_history_page(student_history.id, limit=2)
+    marked_at, attendance_id = decode_history_cursor(page["next_cursor"])
+    assert attendance_id == page["attendances"][-1]["id"]
+    assert marked_at.isoformat() == page["attendances"][-1]["marked_at"]
+
+    with pytest.raises(ValueError):
+        attendance_service.get_student_attendance_history_page(student_history.id, cursor="not-a-cursor")
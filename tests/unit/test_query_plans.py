@@ -0,0 +1,161 @@
+# tests/unit/test_query_plans.py
+import re
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.db.base import Base
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.room import Room
+from app.models.assignment import Assignment
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance, VerificationFactor
+from app.services.anomaly import AnomalyService
+from app.services.assignment import AssignmentService
+from app.services.attendance import AttendanceService
+from app.services.attendance_stats import AttendanceStatsService
+from app.services.course import CourseService
+from app.services.room import RoomService
+from app.services.session import SessionService
+from app.services.timetable import TimetableService
+from app.services.user import UserService
+
+TABLES = set(Base.metadata.tables)
+SCAN_PATTERN = re.compile(r"^SCAN (\S+)")
+
+
+@pytest.fixture
+def seeded(db):
+    """Create a small but complete data set for every service query"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="plan_faculty@test.com",
+        full_name="Plan Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"plan_student{i}@test.com",
+            full_name=f"Plan Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"P{i:03d}",
+            is_active=True
+        ) for i in range(3)
+    ]
+    course = Course(id=str(uuid.uuid4()), course_code="CS101", course_name="Intro")
+    room = Room(id=str(uuid.uuid4()), room_number="R101", capacity=40)
+    assignment = Assignment(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_id=course.id,
+        room_id=room.id,
+        day_of_week="Monday",
+        time_slot="09:00-10:00"
+    )
+    sessions = [
+        SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=faculty.id,
+            course_code="CS101",
+            room_number="R101",
+            status=SessionStatus.ACTIVE if i == 0 else SessionStatus.COMPLETED,
+            start_time=datetime.utcnow() - timedelta(days=i)
+        ) for i in range(2)
+    ]
+    db.add_all([faculty, *students, course, room, assignment, *sessions])
+    for session in sessions:
+        for student in students:
+            db.add(Attendance(
+                id=str(uuid.uuid4()),
+                session_id=session.id,
+                student_id=student.id,
+                marked_at=session.start_time + timedelta(minutes=5),
+                verification_factors={"qr": True, "face": True, "proximity": False}
+            ))
+    db.commit()
+    return {
+        "faculty": faculty,
+        "student": students[0],
+        "course": course,
+        "room": room,
+        "assignment": assignment,
+        "session": sessions[0]
+    }
+
+
+# (name, call) pairs covering every filtered service query
+SERVICE_QUERIES = [
+    ("session.get_session", lambda db, d: SessionService(db).get_session(d["session"].id)),
+    ("session.get_faculty_sessions", lambda db, d: SessionService(db).get_faculty_sessions(d["faculty"].id)),
+    ("session.get_active_sessions", lambda db, d: SessionService(db).get_active_sessions()),
+    ("session.get_active_sessions_for_faculty",
+     lambda db, d: SessionService(db).get_active_sessions(d["faculty"].id)),
+    ("attendance.get_session_attendances_with_details",
+     lambda db, d: AttendanceService(db).get_session_attendances_with_details(d["session"].id)),
+    ("attendance.get_session_attendances_with_details_failed",
+     lambda db, d: AttendanceService(db).get_session_attendances_with_details(
+         d["session"].id, failed_factor=VerificationFactor.PROXIMITY)),
+    ("attendance.get_session_verification_summary",
+     lambda db, d: AttendanceService(db).get_session_verification_summary(d["session"].id)),
+    ("attendance.get_student_attendance_for_session",
+     lambda db, d: AttendanceService(db).get_student_attendance_for_session(d["student"].id, d["session"].id)),
+    ("attendance.get_student_attendance_history",
+     lambda db, d: AttendanceService(db).get_student_attendance_history(d["student"].id)),
+    ("attendance.get_student_attendance_history_after",
+     lambda db, d: AttendanceService(db).get_student_attendance_history(
+         d["student"].id, limit=10, after=(datetime.utcnow(), "ffffffff"))),
+    ("attendance.get_faculty_session_attendance",
+     lambda db, d: AttendanceService(db).get_faculty_session_attendance(d["faculty"].id)),
+    ("attendance_stats.get_student_summary",
+     lambda db, d: AttendanceStatsService(db).get_student_summary(d["student"].id)),
+    ("anomaly.get_anomalies", lambda db, d: AnomalyService(db).get_anomalies()),
+    ("anomaly.scan_sessions", lambda db, d: AnomalyService(db).scan_sessions([d["session"].id])),
+    ("user.get_user", lambda db, d: UserService(db).get_user(d["student"].id)),
+    ("user.get_user_by_email", lambda db, d: UserService(db).get_user_by_email(d["student"].email)),
+    ("user.get_users_by_role", lambda db, d: UserService(db).get_users(UserRole.STUDENT)),
+    ("user.search_users", lambda db, d: UserService(db).search_users(UserRole.STUDENT, q="student")),
+    ("user.search_users_prefix", lambda db, d: UserService(db).search_users(UserRole.STUDENT, q="P0")),
+    ("user.search_users_after",
+     lambda db, d: UserService(db).search_users(
+         cursor=UserService(db).search_users(UserRole.STUDENT, limit=1)["next_cursor"], limit=1)),
+    ("course.get_course", lambda db, d: CourseService(db).get_course(d["course"].id)),
+    ("course.get_course_by_code", lambda db, d: CourseService(db).get_course_by_code("CS101")),
+    ("room.get_room", lambda db, d: RoomService(db).get_room(d["room"].id)),
+    ("room.get_room_by_number", lambda db, d: RoomService(db).get_room_by_number("R101")),
+    ("assignment.get_assignment", lambda db, d: AssignmentService(db).get_assignment(d["assignment"].id)),
+    ("assignment.get_faculty_assignments",
+     lambda db, d: AssignmentService(db).get_faculty_assignments(d["faculty"].id)),
+    ("timetable.check_conflicts",
+     lambda db, d: TimetableService(db).check_conflicts(d["faculty"].id, d["room"].id, [(1, 540, 600), (3, 540, 600)])),
+]
+
+
+def _full_scans(db, statement, parameters):
+    """Return the tables SQLite would read end to end for a statement"""
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in rows:
+        match = SCAN_PATTERN.match(row[-1])
+        if match and match.group(1).strip('"') in TABLES:
+            scans.append(row[-1])
+    return scans
+
+
+@pytest.mark.parametrize("name,call", SERVICE_QUERIES, ids=[name for name, _ in SERVICE_QUERIES])
+def test_service_query_uses_index(db, seeded, captured_queries, name, call):
+    """Every filtered service query must be answered through an index"""
+    db.expire_all()
+    with captured_queries() as queries:
+        call(db, seeded)
+
+    selects = [(sql, params) for sql, params in queries if sql.lstrip().upper().startswith(("SELECT", "WITH"))]
+    assert selects, f"{name} should issue at least one query"
+
+    for sql, params in selects:
+        scans = _full_scans(db, sql, params)
+        assert not scans, f"{name} falls back to a full table scan: {scans}\n{sql}"
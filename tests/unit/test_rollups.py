@@ -0,0 +1,224 @@
+# tests/unit/test_rollups.py
+import pytest
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import ReadSessionLocal, SessionLocal, engine, read_engine
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import Attendance
+from app.models.rollup import CourseDailyAttendance, StudentMonthlyAttendance
+from app.services.rollup import RollupService
+
+BASE = datetime(2026, 3, 30, 9, 0)
+
+
+@pytest.fixture
+def students(db):
+    """Create a few students"""
+    students = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"rollup_student{i}@test.com",
+            full_name=f"Rollup Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"RU{i:03d}",
+            is_active=True
+        ) for i in range(3)
+    ]
+    db.add_all(students)
+    db.commit()
+    return students
+
+
+@pytest.fixture
+def add_session(db, students):
+    """Return a helper that adds a session on a given day with marks for some students"""
+    def _add(start_time, course_code="CS101", present=None, factors=None):
+        session = SessionModel(
+            id=str(uuid.uuid4()),
+            faculty_id=str(uuid.uuid4()),
+            course_code=course_code,
+            room_number="R101",
+            status=SessionStatus.COMPLETED,
+            start_time=start_time
+        )
+        db.add(session)
+        for i, student in enumerate(present if present is not None else students):
+            db.add(Attendance(
+                id=str(uuid.uuid4()),
+                session_id=session.id,
+                student_id=student.id,
+                marked_at=start_time + timedelta(minutes=i),
+                verification_factors=factors or {"qr": True, "face": True, "proximity": True}
+            ))
+        db.commit()
+        return session
+
+    return _add
+
+
+def _snapshot(db):
+    course = {
+        (row.course_code, row.day): (row.marks, row.complete, row.qr, row.face, row.proximity)
+        for row in db.query(CourseDailyAttendance).all()
+    }
+    student = {
+        (row.student_id, row.course_code, row.month): (row.marks, row.complete, row.qr, row.face, row.proximity)
+        for row in db.query(StudentMonthlyAttendance).all()
+    }
+    return course, student
+
+
+def test_refresh_builds_course_and_student_rollups(db, students, add_session):
+    add_session(BASE)
+    add_session(BASE + timedelta(days=2), present=students[:2], factors={"qr": True, "face": False, "proximity": True})
+    add_session(BASE + timedelta(hours=3), course_code="MA201", present=students[:1])
+
+    result = RollupService(db).refresh(now=BASE + timedelta(days=5))
+    assert result["processed_groups"] > 0
+
+    course, student = _snapshot(db)
+    assert course[("CS101", date(2026, 3, 30))] == (3, 3, 3, 3, 3)
+    assert course[("CS101", date(2026, 4, 1))] == (2, 0, 2, 0, 2)
+    assert course[("MA201", date(2026, 3, 30))] == (1, 1, 1, 1, 1)
+
+    # The two CS101 days fall in different months
+    assert student[(students[0].id, "CS101", date(2026, 3, 1))] == (1, 1, 1, 1, 1)
+    assert student[(students[0].id, "CS101", date(2026, 4, 1))] == (1, 0, 1, 0, 1)
+    assert (students[2].id, "CS101", date(2026, 4, 1)) not in student
+
+
+def test_refresh_is_incremental(db, students, add_session, captured_queries):
+    add_session(BASE)
+    service = RollupService(db)
+    service.refresh(now=BASE + timedelta(hours=2))
+
+    # A second run with nothing new leaves the counters untouched
+    service.refresh(now=BASE + timedelta(hours=3))
+    course, _ = _snapshot(db)
+    assert course[("CS101", date(2026, 3, 30))] == (3, 3, 3, 3, 3)
+
+    add_session(BASE + timedelta(hours=4), present=students[:2])
+    with captured_queries() as queries:
+        service.refresh(now=BASE + timedelta(hours=6))
+    # Deltas are upserted; existing rollup rows are never loaded
+    assert not [
+        statement for statement, _ in queries
+        if statement.lstrip().startswith("SELECT") and "_attendance." in statement
+    ]
+
+    course, student = _snapshot(db)
+    assert course[("CS101", date(2026, 3, 30))] == (5, 5, 5, 5, 5)
+    assert student[(students[0].id, "CS101", date(2026, 3, 1))][0] == 2
+    assert student[(students[2].id, "CS101", date(2026, 3, 1))][0] == 1
+
+
+def test_refresh_waits_for_lag_window(db, students, add_session):
+    add_session(BASE)
+    now = BASE + timedelta(seconds=settings.ROLLUP_LAG_SECONDS // 2)
+    RollupService(db).refresh(now=now)
+
+    course, _ = _snapshot(db)
+    assert course == {}
+
+    RollupService(db).refresh(now=BASE + timedelta(hours=1))
+    course, _ = _snapshot(db)
+    assert course[("CS101", date(2026, 3, 30))][0] == 3
+
+
+def test_rebuild_matches_incremental(db, students, add_session):
+    service = RollupService(db)
+    for day in range(4):
+        add_session(BASE + timedelta(days=day), present=students[:day % 3 + 1])
+        service.refresh(now=BASE + timedelta(days=day, hours=2))
+    incremental = _snapshot(db)
+
+    service.rebuild(now=BASE + timedelta(days=4))
+    assert _snapshot(db) == incremental
+
+
+def test_refresh_aggregates_on_the_reader(db, students, add_session):
+    """The job only takes the single SQLite writer to apply what it computed"""
+    add_session(BASE)
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(("writer" if conn.engine is engine else "reader", statement))
+
+    reader = ReadSessionLocal()
+    for listened in (engine, read_engine):
+        event.listen(listened, "before_cursor_execute", _record)
+    try:
+        RollupService(db, reader=reader).refresh(now=BASE + timedelta(hours=2))
+    finally:
+        for listened in (engine, read_engine):
+            event.remove(listened, "before_cursor_execute", _record)
+        reader.close()
+
+    assert engine is not read_engine
+    aggregate = [where for where, statement in statements if "GROUP BY" in statement]
+    assert aggregate == ["reader"]
+    writes = [statement for where, statement in statements if where == "writer"]
+    assert writes[0] == "BEGIN IMMEDIATE" and not any("GROUP BY" in statement for statement in writes)
+    assert _snapshot(db)[0][("CS101", date(2026, 3, 30))] == (3, 3, 3, 3, 3)
+
+
+@pytest.mark.parametrize("first_run", [True, False])
+def test_overlapping_refreshes_fold_marks_in_once(db, students, add_session, monkeypatch, first_run):
+    if not first_run:
+        add_session(BASE - timedelta(days=1))
+        RollupService(db).refresh(now=BASE - timedelta(hours=20))
+    add_session(BASE)
+    db.commit()
+
+    # Both runs read the same high-water mark and aggregate before either writes
+    both_read = threading.Barrier(2, timeout=10)
+    aggregate = RollupService._aggregate
+
+    def _aggregate(self, start, end):
+        groups = aggregate(self, start, end)
+        both_read.wait()
+        return groups
+
+    monkeypatch.setattr(RollupService, "_aggregate", _aggregate)
+    results, errors = [], []
+
+    def refresh():
+        session, reader = SessionLocal(), ReadSessionLocal()
+        try:
+            results.append(RollupService(session, reader=reader).refresh(now=BASE + timedelta(hours=2)))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            reader.close()
+            session.close()
+
+    threads = [threading.Thread(target=refresh) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(result["processed_groups"] for result in results) == [0, 3]
+    db.expire_all()
+    assert _snapshot(db)[0][("CS101", date(2026, 3, 30))] == (3, 3, 3, 3, 3)
+
+
+def test_read_methods_filter_and_order(db, students, add_session):
+    for day in range(3):
+        add_session(BASE + timedelta(days=day))
+    service = RollupService(db)
+    service.refresh(now=BASE + timedelta(days=4))
+
+    days = service.get_course_daily("CS101", start=date(2026, 3, 31))
+    assert [row.day for row in days] == [date(2026, 3, 31), date(2026, 4, 1)]
+
+    months = service.get_student_monthly(students[0].id, course_code="CS101")
+    assert [(row.month, row.marks) for row in months] == [(date(2026, 3, 1), 2), (date(2026, 4, 1), 1)]
@@ -0,0 +1,159 @@
+# tests/unit/test_scheduler.py
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.course import Course
+from app.models.room import Room
+from app.models.rollup import CourseSessionCounter
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.user import User, UserRole
+from app.schemas.assignment import AssignmentCreate
+from app.services.assignment import AssignmentService
+from app.services.qr_code import QRCodeService
+from app.services.scheduler import SessionScheduler, opens_at
+from app.services.session import SessionService
+from app.services.timetable import SlotEntry, slot_datetime, to_timetable_time
+
+MONDAY = datetime(2026, 10, 19)
+
+
+@pytest.fixture(autouse=True)
+def scheduler_settings(monkeypatch, mock_settings):
+    monkeypatch.setattr(settings, "TIMETABLE_TIMEZONE", "UTC")
+    monkeypatch.setattr(settings, "SCHEDULER_LEAD_MINUTES", 10)
+    monkeypatch.setattr(settings, "SCHEDULER_SPREAD_SECONDS", 0)
+    monkeypatch.setattr(settings, "SCHEDULER_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "SCHEDULER_END_GRACE_MINUTES", 5)
+
+
+@pytest.fixture
+def timetable(db):
+    """Three rooms with a Monday 09:00-10:00 class each"""
+    faculty = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"scheduler_faculty{i}@test.com",
+            full_name=f"Scheduler Faculty {i}",
+            hashed_password="hashed_password",
+            role=UserRole.FACULTY,
+            is_active=True
+        ) for i in range(3)
+    ]
+    course = Course(id=str(uuid.uuid4()), course_code="SCH101", course_name="Scheduling")
+    rooms = [Room(id=str(uuid.uuid4()), room_number=f"SCH-R{i}", capacity=30) for i in range(3)]
+    db.add_all([*faculty, course, *rooms])
+    db.commit()
+    service = AssignmentService(db)
+    return [
+        service.create_assignment(AssignmentCreate(
+            faculty_id=faculty[i].id, course_id=course.id, room_id=rooms[i].id,
+            day_of_week="Monday", time_slot="09:00-10:00"
+        )).id
+        for i in range(3)
+    ]
+
+
+def test_sessions_open_before_the_slot_and_close_after_it(db, timetable):
+    scheduler = SessionScheduler(db)
+
+    assert scheduler.run(MONDAY.replace(hour=8, minute=45)) == {"closed": 0, "opened": 0}
+    assert scheduler.run(MONDAY.replace(hour=8, minute=51)) == {"closed": 0, "opened": 3}
+    # Later ticks and a restarted worker don't open the slot again
+    assert scheduler.run(MONDAY.replace(hour=8, minute=55)) == {"closed": 0, "opened": 0}
+
+    sessions = db.query(SessionModel).filter(SessionModel.assignment_id.in_(timetable)).all()
+    assert len(sessions) == 3
+    for session in sessions:
+        assert session.status == SessionStatus.ACTIVE
+        assert session.course_code == "SCH101"
+        assert session.scheduled_start == MONDAY.replace(hour=9)
+        assert session.scheduled_end == MONDAY.replace(hour=10)
+        assert os.path.exists(os.path.join(settings.QR_CODE_STORAGE_PATH, f"session_{session.id}.png"))
+
+    assert scheduler.run(MONDAY.replace(hour=10, minute=4)) == {"closed": 0, "opened": 0}
+    assert scheduler.run(MONDAY.replace(hour=10, minute=6)) == {"closed": 3, "opened": 0}
+    db.expire_all()
+    assert {session.status for session in sessions} == {SessionStatus.COMPLETED}
+    assert db.query(CourseSessionCounter.held).filter(CourseSessionCounter.course_code == "SCH101").scalar() == 3
+
+
+@pytest.mark.asyncio
+async def test_qr_endpoint_serves_the_pregenerated_code(client, db, timetable, token_headers, monkeypatch):
+    # A year ahead, so the token is still valid when the request is made
+    monday = MONDAY + timedelta(weeks=52)
+    SessionScheduler(db).run(monday.replace(hour=8, minute=51))
+    session = db.query(SessionModel).filter(SessionModel.assignment_id == timetable[0]).one()
+    faculty = db.query(User).filter(User.id == session.faculty_id).one()
+
+    def render_again(*args, **kwargs):
+        raise AssertionError("the pre-generated QR code should be served")
+
+    monkeypatch.setattr(QRCodeService, "generate_session_qr", render_again)
+    response = await client.get(f"/api/v1/sessions/{session.id}/qr", headers=token_headers(faculty))
+    assert response.status_code == 200
+    qr_data = response.json()
+    assert qr_data["image_url"] == f"/static/qr_codes/session_{session.id}.png"
+    # Valid until the session is closed, not QR_CODE_EXPIRY_MINUTES after opening
+    assert datetime.fromisoformat(qr_data["expires_at"]) == monday.replace(hour=10, minute=5)
+    verified = QRCodeService().verify_qr_data(qr_data["encrypted_data"])
+    assert verified["valid"] and verified["data"]["session_id"] == session.id
+
+
+def test_faculty_already_running_the_course_is_left_alone(db, timetable):
+    scheduler = SessionScheduler(db)
+    faculty_id = AssignmentService(db).get_assignment(timetable[0]).faculty_id
+    db.add(SessionModel(
+        faculty_id=faculty_id, course_code="SCH101", status=SessionStatus.ACTIVE, start_time=MONDAY.replace(hour=8)
+    ))
+    db.commit()
+
+    assert scheduler.run(MONDAY.replace(hour=9, minute=30))["opened"] == 2
+
+
+def test_racing_workers_open_each_slot_once(db, timetable):
+    scheduler = SessionScheduler(db)
+    now = MONDAY.replace(hour=8, minute=55)
+    due = scheduler.due_slots(now)
+    assert len(due) == 3
+
+    first = dict(due[0], id=str(uuid.uuid4()), proximity_uuid="aaaa")
+    assert scheduler._insert([first], now) == [first]
+    # Another worker read the timetable before that commit and tries the same slot
+    rows = [dict(row, id=str(uuid.uuid4()), proximity_uuid="bbbb") for row in due[:2]]
+    assert scheduler._insert(rows, now) == [rows[1]]
+    assert db.query(SessionModel).filter(SessionModel.assignment_id.in_(timetable)).count() == 2
+
+
+def test_sessions_ended_elsewhere_are_not_counted_again(db, timetable):
+    scheduler = SessionScheduler(db)
+    scheduler.run(MONDAY.replace(hour=8, minute=55))
+    now = MONDAY.replace(hour=10, minute=6)
+    finished = [session.id for session in scheduler.finished(now - timedelta(minutes=5), limit=10)]
+    assert len(finished) == 3
+
+    # One faculty member ends their class by hand after this worker read the list
+    assert SessionService(db).end_session(finished[0]) is not None
+    assert SessionService(db).end_session(finished[0]) is None
+    assert scheduler._close(finished, now) == 2
+    # A second worker holding the same stale list closes nothing
+    assert scheduler._close(finished, now) == 0
+    assert db.query(CourseSessionCounter.held).filter(CourseSessionCounter.course_code == "SCH101").scalar() == 3
+
+
+def test_openings_are_spread_and_follow_the_timetable_zone(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_SPREAD_SECONDS", 300)
+    starts_at = MONDAY.replace(hour=9)
+    openings = {
+        opens_at(SlotEntry(0, 540, 600, str(uuid.uuid4()), "f", "r", "R", "c", "C", "Course"), starts_at)
+        for _ in range(20)
+    }
+    assert len(openings) > 1
+    assert all(starts_at - timedelta(minutes=10) <= moment <= starts_at - timedelta(minutes=5) for moment in openings)
+
+    monkeypatch.setattr(settings, "TIMETABLE_TIMEZONE", "Asia/Kolkata")
+    assert slot_datetime(MONDAY.date(), 540) == MONDAY.replace(hour=3, minute=30)
+    assert to_timetable_time(MONDAY.replace(hour=3, minute=30)) == MONDAY.replace(hour=9)
@@ -0,0 +1,43 @@
+# tests/unit/test_sqlite_tuning.py
+from app.db.benchmark import run_mark_benchmark
+from app.db.session import create_db_engine
+
+
+def _pragmas(engine):
+    with engine.connect() as conn:
+        return {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store")
+        }
+
+
+def test_tuning_profile_is_applied_per_connection(tmp_path, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 2500)
+
+    tuned = create_db_engine(f"sqlite:///{tmp_path / 'tuned.db'}", sqlite_tuning=True)
+    assert _pragmas(tuned) == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 2500,
+        "cache_size": -65536,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": 2  # MEMORY
+    }
+    tuned.dispose()
+
+    plain = create_db_engine(f"sqlite:///{tmp_path / 'plain.db'}", sqlite_tuning=False)
+    pragmas = _pragmas(plain)
+    assert pragmas["journal_mode"] == "delete"
+    assert pragmas["synchronous"] == 2  # FULL
+    plain.dispose()
+
+
+def test_mark_benchmark_runs_both_profiles(tmp_path):
+    path = str(tmp_path / "bench.db")
+    for tuned in (False, True):
+        result = run_mark_benchmark(path, tuned, workers=4, marks=80)
+        assert result["profile"] == ("tuned" if tuned else "default")
+        assert result["marked"] + result["failed"] == 80
+        assert result["marks_per_second"] > 0
+    assert not list(tmp_path.iterdir()), "The scratch database should be removed"
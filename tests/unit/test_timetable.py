@@ -0,0 +1,132 @@
+# tests/unit/test_timetable.py
+import pytest
+import uuid
+
+from sqlalchemy import text
+
+from app.core.timetable import parse_days, parse_schedule, parse_time_slot
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.room import Room
+from app.schemas.assignment import AssignmentCreate, AssignmentUpdate
+from app.services.assignment import AssignmentService
+from app.db.session import engine
+from app.services.timetable import DaySchedule, SlotEntry, TimetableService
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10:00 AM - 11:30 AM", (600, 690)),
+    ("09:00-10:00", (540, 600)),
+    ("10-11 AM", (600, 660)),
+    ("11 AM - 1 PM", (660, 780)),
+    ("14:00 to 15:30", (840, 930)),
+])
+def test_parse_time_slot(text, expected):
+    assert parse_time_slot(text) == expected
+
+
+def test_parse_schedule_rejects_bad_input():
+    assert parse_days("wed, Monday,Wednesday") == [0, 2]
+    assert parse_schedule("Monday", None) == []
+    with pytest.raises(ValueError):
+        parse_days("Funday")
+    with pytest.raises(ValueError):
+        parse_time_slot("11:00-10:00")
+
+
+def _entry(start, end, assignment_id):
+    return SlotEntry(0, start, end, assignment_id, "f", "r", "R1", "c", "C1", "Course")
+
+
+def test_day_schedule_finds_every_overlap_even_in_legacy_overlaps():
+    schedule = DaySchedule([_entry(480, 720, "long"), _entry(540, 600, "a"), _entry(600, 660, "b"), _entry(780, 840, "c")])
+
+    assert [e.assignment_id for e in schedule.overlapping(610, 620)] == ["long", "b"]
+    assert [e.assignment_id for e in schedule.overlapping(720, 780)] == []
+    assert [e.assignment_id for e in schedule.overlapping(700, 800)] == ["long", "c"]
+    assert [e.assignment_id for e in schedule.overlapping(500, 560, exclude="long")] == ["a"]
+
+    assert [e.assignment_id for e in schedule.at(600)] == ["long", "b"]
+    assert schedule.at(720) == []
+    assert schedule.next_after(600).assignment_id == "c"
+    assert schedule.next_after(840) is None
+
+
+@pytest.fixture
+def timetable_data(db):
+    faculty = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"timetable_faculty{i}@test.com",
+            full_name=f"Timetable Faculty {i}",
+            hashed_password="hashed_password",
+            role=UserRole.FACULTY,
+            is_active=True
+        ) for i in range(2)
+    ]
+    course = Course(id=str(uuid.uuid4()), course_code="TT101", course_name="Timetabling")
+    rooms = [Room(id=str(uuid.uuid4()), room_number=f"TT-R{i}", capacity=30) for i in range(2)]
+    db.add_all([*faculty, course, *rooms])
+    db.commit()
+    return {"faculty": [f.id for f in faculty], "course": course.id, "rooms": [r.id for r in rooms]}
+
+
+def test_double_bookings_are_rejected(db, timetable_data):
+    service = AssignmentService(db)
+    faculty, rooms, course = timetable_data["faculty"], timetable_data["rooms"], timetable_data["course"]
+
+    booked = service.create_assignment(AssignmentCreate(
+        faculty_id=faculty[0], course_id=course, room_id=rooms[0], day_of_week="Monday,Wednesday", time_slot="10:00-11:00"
+    ))
+    assert sorted((slot.weekday, slot.start_minute) for slot in booked.slots) == [(0, 600), (2, 600)]
+
+    with pytest.raises(ValueError, match="Room is already booked on Wednesday 10:00-11:00"):
+        service.create_assignment(AssignmentCreate(
+            faculty_id=faculty[1], course_id=course, room_id=rooms[0], day_of_week="Wednesday", time_slot="10:30-11:30"
+        ))
+    with pytest.raises(ValueError, match="Faculty member is already booked"):
+        service.create_assignment(AssignmentCreate(
+            faculty_id=faculty[0], course_id=course, room_id=rooms[1], day_of_week="Monday", time_slot="09:30-10:15"
+        ))
+
+    # Back-to-back slots and moving an assignment within its own slot are fine
+    other = service.create_assignment(AssignmentCreate(
+        faculty_id=faculty[1], course_id=course, room_id=rooms[0], day_of_week="Wednesday", time_slot="11:00-12:00"
+    ))
+    service.update_assignment(booked.id, AssignmentUpdate(time_slot="09:30-10:30"))
+    with pytest.raises(ValueError):
+        service.update_assignment(other.id, AssignmentUpdate(time_slot="10:00-11:00"))
+
+    # Inactive assignments free their slots
+    service.update_assignment(booked.id, AssignmentUpdate(is_active=False))
+    service.update_assignment(other.id, AssignmentUpdate(time_slot="10:00-11:00"))
+
+
+def test_bookings_from_another_worker_are_seen(db, timetable_data):
+    """The check reads the database, so a booking the local index has not seen still counts"""
+    service = AssignmentService(db)
+    faculty, rooms, course = timetable_data["faculty"], timetable_data["rooms"], timetable_data["course"]
+    TimetableService(db).get_index()
+    db.commit()
+
+    # Another process books the room; this worker's write tracking never hears of it
+    assignment_id = str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO assignments (id, faculty_id, course_id, room_id, day_of_week, time_slot, is_active) "
+                "VALUES (:id, :faculty, :course, :room, 'Friday', '14:00-15:00', 1)"
+            ),
+            {"id": assignment_id, "faculty": faculty[1], "course": course, "room": rooms[0]}
+        )
+        conn.execute(
+            text("INSERT INTO assignment_slots (id, assignment_id, weekday, start_minute, end_minute) "
+                 "VALUES (:slot, :id, 4, 840, 900)"),
+            {"slot": str(uuid.uuid4()), "id": assignment_id}
+        )
+
+    assert TimetableService(db).get_index().conflicts("room", rooms[0], 4, 840, 900) == []
+    with pytest.raises(ValueError, match=f"Room is already booked on Friday 14:00-15:00 .*{assignment_id}"):
+        service.create_assignment(AssignmentCreate(
+            faculty_id=faculty[0], course_id=course, room_id=rooms[0], day_of_week="Friday", time_slot="14:30-15:30"
+        ))
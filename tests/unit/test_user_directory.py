@@ -0,0 +1,133 @@
+# tests/unit/test_user_directory.py
+import pytest
+import time
+import uuid
+
+from sqlalchemy import insert, text
+
+from app.db.search import sync_user_search, user_search_in_sync
+from app.models.user import User, UserRole
+from app.services.user import UserService
+
+
+@pytest.fixture
+def directory(db):
+    """A directory of 50,000 students and a few faculty members"""
+    students = [
+        {
+            "id": str(uuid.uuid4()),
+            "email": f"student{i:05d}@campus.edu",
+            "full_name": f"Student {i:05d}",
+            "hashed_password": "hashed_password",
+            "role": UserRole.STUDENT,
+            "roll_number": f"CS{i:05d}",
+            "is_active": True
+        }
+        for i in range(50000)
+    ]
+    faculty = [
+        {
+            "id": str(uuid.uuid4()),
+            "email": email,
+            "full_name": name,
+            "hashed_password": "hashed_password",
+            "role": UserRole.FACULTY,
+            "roll_number": None,
+            "is_active": True
+        }
+        for name, email in [("Ada O'Brien", "ada@campus.edu"), ("Grace 100% Hopper", "hopper@campus.edu")]
+    ]
+    db.execute(insert(User.__table__), students + faculty)
+    db.commit()
+    return students
+
+
+def test_keyset_pages_cover_the_role_in_name_order(db):
+    # Shared names make the id the tie-breaker
+    db.add_all([
+        User(
+            id=str(uuid.uuid4()),
+            email=f"page{i}@campus.edu",
+            full_name=f"Page Student {i % 5}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT if i < 10 else UserRole.FACULTY,
+            is_active=True
+        )
+        for i in range(12)
+    ])
+    db.commit()
+    expected = [
+        (user.full_name, user.id) for user in
+        db.query(User).filter(User.role == UserRole.STUDENT).order_by(User.full_name, User.id)
+    ]
+
+    service = UserService(db)
+    seen, cursor = [], None
+    for _ in range(4):
+        page = service.search_users(UserRole.STUDENT, q="page", limit=4, cursor=cursor)
+        seen += [(user.full_name, user.id) for user in page["users"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+    assert len(seen) == 10
+
+    with pytest.raises(ValueError):
+        service.search_users(cursor="not-a-cursor")
+
+
+def test_search_matches_substrings_of_name_email_and_roll_number(db, directory):
+    service = UserService(db)
+
+    start = time.perf_counter()
+    by_roll = service.search_users(q="cs4999")["users"]
+    elapsed = time.perf_counter() - start
+    assert [user.roll_number for user in by_roll] == [f"CS4999{i}" for i in range(10)]
+    assert elapsed < 0.5, f"Indexed search over 50k users took {elapsed:.3f}s"
+
+    assert [user.full_name for user in service.search_users(q="o'bri")["users"]] == ["Ada O'Brien"]
+    assert [user.email for user in service.search_users(q="HOPPER@")["users"]] == ["hopper@campus.edu"]
+    # LIKE wildcards in the term are literal
+    assert [user.full_name for user in service.search_users(q="0%")["users"]] == []
+    assert [user.full_name for user in service.search_users(q="100%")["users"]] == ["Grace 100% Hopper"]
+
+    # Two characters are too short for trigrams and only match as a prefix
+    assert [user.full_name for user in service.search_users(q="ad")["users"]] == ["Ada O'Brien"]
+    assert service.search_users(q="da")["users"] == []
+
+    # The index follows renames and deletes
+    student = db.query(User).filter(User.roll_number == "CS00001").one()
+    student.full_name = "Zed Quinlan"
+    db.commit()
+    assert [user.roll_number for user in service.search_users(q="quinlan")["users"]] == ["CS00001"]
+    db.delete(student)
+    db.commit()
+    assert service.search_users(q="quinlan")["users"] == []
+
+
+def test_search_index_is_repaired_after_rowids_move(db):
+    db.add_all([
+        User(
+            id=str(uuid.uuid4()),
+            email=f"moved{i}@campus.edu",
+            full_name=f"Moved Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            is_active=True
+        )
+        for i in range(3)
+    ])
+    db.commit()
+    # Stands in for VACUUM renumbering the rows under the index
+    db.execute(text('UPDATE "user" SET rowid = rowid + 1000'))
+    db.commit()
+    service = UserService(db)
+    assert service.search_users(q="moved student")["users"] == []
+
+    conn = db.connection()
+    assert not user_search_in_sync(conn)
+    assert sync_user_search(conn)
+    db.commit()
+    assert len(service.search_users(q="moved student")["users"]) == 3
+    assert user_search_in_sync(db.connection())
+    assert not sync_user_search(db.connection())
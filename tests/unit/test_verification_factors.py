@@ -0,0 +1,109 @@
+# tests/unit/test_verification_factors.py
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.models.user import User, UserRole
+from app.models.session import Session as SessionModel, SessionStatus
+from app.models.attendance import (
+    Attendance, VerificationFactor, pack_verification_factors, unpack_verification_factors
+)
+from app.services.attendance import AttendanceService
+
+
+@pytest.fixture
+def marked_session(db):
+    """Create a session with one mark per combination of failed factors"""
+    faculty = User(
+        id=str(uuid.uuid4()),
+        email="factors_faculty@test.com",
+        full_name="Factors Faculty",
+        hashed_password="hashed_password",
+        role=UserRole.FACULTY,
+        is_active=True
+    )
+    session = SessionModel(
+        id=str(uuid.uuid4()),
+        faculty_id=faculty.id,
+        course_code="CS101",
+        room_number="R101",
+        status=SessionStatus.ACTIVE,
+        start_time=datetime.utcnow() - timedelta(hours=1)
+    )
+    db.add(faculty)
+    db.add(session)
+
+    factor_sets = [
+        {"qr": True, "face": True, "proximity": True},
+        {"qr": True, "face": False, "proximity": True},
+        {"qr": True, "face": False, "proximity": False},
+        {"qr": True, "face": True, "proximity": False, "device": "pixel-7"},
+    ]
+    for i, factors in enumerate(factor_sets):
+        student = User(
+            id=str(uuid.uuid4()),
+            email=f"factors_student{i}@test.com",
+            full_name=f"Factors Student {i}",
+            hashed_password="hashed_password",
+            role=UserRole.STUDENT,
+            roll_number=f"F{i:03d}",
+            is_active=True
+        )
+        db.add(student)
+        db.add(Attendance(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            student_id=student.id,
+            marked_at=datetime.utcnow() - timedelta(minutes=i),
+            verification_factors=factors
+        ))
+    db.commit()
+    return session
+
+
+def test_pack_unpack_round_trip():
+    """Known factors become bits, anything else is kept as metadata"""
+    mask, extra = pack_verification_factors({"qr": True, "face": False, "proximity": True, "device": "x"})
+
+    assert mask == VerificationFactor.QR | VerificationFactor.PROXIMITY
+    assert extra == {"device": "x"}
+    assert unpack_verification_factors(mask, extra) == {
+        "qr": True, "face": False, "proximity": True, "device": "x"
+    }
+    assert pack_verification_factors(None) == (0, None)
+
+
+def test_model_exposes_factors_dict(db, marked_session):
+    """The model keeps the dict interface used by schemas and endpoints"""
+    attendance = db.query(Attendance).filter(
+        Attendance.session_id == marked_session.id,
+        Attendance.is_complete()
+    ).one()
+
+    assert attendance.verification_factors == {"qr": True, "face": True, "proximity": True}
+    assert attendance.verification_complete is True
+
+
+def test_filter_by_failed_factor(db, marked_session):
+    """Failed-factor filtering happens in SQL"""
+    attendance_service = AttendanceService(db)
+
+    failed_face = attendance_service.get_session_attendances_with_details(
+        marked_session.id, failed_factor=VerificationFactor.FACE
+    )
+
+    assert len(failed_face) == 2, "Two marks failed face verification"
+    assert all(record["verification"]["face"] is False for record in failed_face)
+
+
+def test_session_verification_summary(db, marked_session):
+    """Per-factor counts come from a single aggregate"""
+    attendance_service = AttendanceService(db)
+
+    summary = attendance_service.get_session_verification_summary(marked_session.id)
+
+    assert summary["total"] == 4
+    assert summary["complete"] == 1
+    assert summary["factors"]["qr"] == {"passed": 4, "failed": 0}
+    assert summary["factors"]["face"] == {"passed": 2, "failed": 2}
+    assert summary["factors"]["proximity"] == {"passed": 2, "failed": 2}